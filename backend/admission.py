@@ -0,0 +1,216 @@
+import os
+import math
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class UpstreamBusy(Exception):
+    """Raised when a request is not admitted to an upstream.
+
+    status is 429 when the upstream's rate limit would delay the request
+    past its deadline, and 503 when the wait queue is full, the wait timed
+    out or the upstream is unavailable. retry_after is whole seconds.
+    """
+
+    def __init__(self, upstream, reason, retry_after, status=503):
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.status = status
+        super().__init__(f"{upstream}: {reason}, retry after {self.retry_after}s")
+
+    @staticmethod
+    def find(error):
+        """Return the UpstreamBusy behind error (wrapped or chained), or None"""
+        seen = set()
+        while error is not None and id(error) not in seen:
+            if isinstance(error, UpstreamBusy):
+                return error
+            seen.add(id(error))
+            error = getattr(error, 'error', None) or error.__cause__ or error.__context__
+        return None
+
+
+class TokenBucket:
+    """Request rate limiter; a rate of 0 means unlimited.
+
+    Tokens are reserved ahead of time, so the balance can go negative and
+    the returned wait spaces out requests at the configured rate.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self, now):
+        """Take a token and return how long to wait before using it"""
+        if not self.rate:
+            return 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def refund(self):
+        if self.rate:
+            self.tokens += 1
+
+
+class _Waiter:
+    def __init__(self, loop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+
+class AdmissionController:
+    """Bounded concurrency, a token bucket and a bounded wait queue for one upstream.
+
+    Up to concurrency requests run at once; the next queue_size wait in
+    FIFO order for at most queue_timeout seconds, and anything beyond is
+    rejected at once with UpstreamBusy instead of piling onto a saturated
+    provider. Callers may come from any event loop. Settings are read from
+    <PREFIX>_CONCURRENCY, _RATE_LIMIT (requests per second, 0 = none),
+    _RATE_BURST, _QUEUE_SIZE and _QUEUE_TIMEOUT.
+    """
+
+    def __init__(self, name, prefix, concurrency=None, rate=None, burst=None, queue_size=None,
+                 queue_timeout=None, default_concurrency=8, window=500):
+        self.name = name
+        self.concurrency = concurrency or int(os.getenv(f'{prefix}_CONCURRENCY', str(default_concurrency)))
+        rate = rate if rate is not None else float(os.getenv(f'{prefix}_RATE_LIMIT', '0'))
+        burst = burst or float(os.getenv(f'{prefix}_RATE_BURST', str(max(1, self.concurrency))))
+        self.queue_size = queue_size if queue_size is not None else int(os.getenv(f'{prefix}_QUEUE_SIZE', '100'))
+        self.queue_timeout = queue_timeout or float(os.getenv(f'{prefix}_QUEUE_TIMEOUT', '15'))
+        self.bucket = TokenBucket(rate, burst)
+
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self.active = 0
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = {'queue_full': 0, 'timeout': 0, 'rate_limited': 0}
+        self.wait_times = deque(maxlen=window)
+        self.service_time = None
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the upstream's slots for the duration of the block"""
+        await self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    async def acquire(self):
+        """Wait for a slot and a rate token, or raise UpstreamBusy"""
+        start = time.monotonic()
+        deadline = start + self.queue_timeout
+        waiter = None
+        with self._lock:
+            if self.active < self.concurrency and not self._waiters:
+                self.active += 1
+            elif len(self._waiters) >= self.queue_size:
+                self.rejected['queue_full'] += 1
+                raise UpstreamBusy(self.name, 'queue full', self._drain_estimate())
+            else:
+                waiter = _Waiter(asyncio.get_running_loop())
+                self._waiters.append(waiter)
+                self.queued += 1
+                self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+
+        if waiter is not None:
+            await self._wait(waiter, deadline)
+
+        # Slot held: pace to the rate limit unless that overruns the deadline
+        now = time.monotonic()
+        with self._lock:
+            delay = self.bucket.reserve(now)
+            limited = delay > deadline - now
+            if limited:
+                self.bucket.refund()
+                self.rejected['rate_limited'] += 1
+        if limited:
+            self.release()
+            raise UpstreamBusy(self.name, 'rate limited', delay, status=429)
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                self.release()
+                raise
+
+        with self._lock:
+            self.admitted += 1
+            self.wait_times.append(time.monotonic() - start)
+
+    async def _wait(self, waiter, deadline):
+        try:
+            await asyncio.wait_for(waiter.future, max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    self.rejected['timeout'] += 1
+                    raise UpstreamBusy(self.name, 'queue timeout', self._drain_estimate())
+            # The slot was handed over just as the deadline passed; keep it
+        except BaseException:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise
+            # Cancelled after being handed a slot: pass it on
+            self.release()
+            raise
+
+    def release(self, service_time=None):
+        """Free a slot, handing it straight to the oldest waiter"""
+        with self._lock:
+            if service_time is not None:
+                self.service_time = service_time if self.service_time is None else \
+                    0.2 * service_time + 0.8 * self.service_time
+            waiter = self._waiters.popleft() if self._waiters else None
+            if waiter is None:
+                self.active -= 1
+                return
+            waiter.granted = True
+        try:
+            waiter.loop.call_soon_threadsafe(self._wake, waiter.future)
+        except RuntimeError:
+            # The waiter's loop is closed; nobody will use the slot
+            self.release()
+
+    @staticmethod
+    def _wake(future):
+        if not future.done():
+            future.set_result(None)
+
+    def _drain_estimate(self):
+        """Seconds until the current queue has likely cleared (lock held)"""
+        service_time = self.service_time or 1.0
+        return (len(self._waiters) + 1) / self.concurrency * service_time
+
+    def stats(self):
+        with self._lock:
+            waits = sorted(self.wait_times)
+            return {
+                'concurrency': self.concurrency,
+                'rate_limit': self.bucket.rate,
+                'active': self.active,
+                'queue_depth': len(self._waiters),
+                'max_queue_depth': self.max_queue_depth,
+                'queue_size': self.queue_size,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'rejected': dict(self.rejected),
+                'avg_wait_ms': round(sum(waits) / len(waits) * 1000, 1) if waits else None,
+                'p95_wait_ms': round(waits[min(len(waits) - 1, int(0.95 * len(waits)))] * 1000, 1) if waits else None,
+                'max_wait_ms': round(waits[-1] * 1000, 1) if waits else None
+            }
@@ -1,28 +1,267 @@
+import io
 import os
 import json
+import time
 import asyncio
-from flask import Flask, request, jsonify, send_file
+import hashlib
+from collections import Counter
+from flask import Flask, Request, request, jsonify, send_file, Response
 from flask_cors import CORS
 from dotenv import load_dotenv
-import tempfile
 import threading
+from werkzeug.exceptions import RequestEntityTooLarge, RequestedRangeNotSatisfiable
+from werkzeug.wsgi import ClosingIterator
 from resume_parser import ResumeParser
 from llm_query import LLMQuery
-from tts import TTSGenerator
+from tts import TTSGenerator, TTSWarmup
+from config_watcher import ConfigWatcher, load_config
+from background_loop import get_background_loop
+from pipeline import Pipeline
+from cache_store import ResumeCache
+from batch import BatchAnalyzer
+from jobs import JobStore, JobQueue, validate_callback_url
+from skill_extractor import SkillExtractor
+from skill_matcher import SkillMatcher, skills_text
+from prompt_budget import PromptBudget
+from session_store import SessionStore
+from chat_engine import ChatEngine
+from static_files import compress_response
+from admission import UpstreamBusy
+from metrics import get_metrics
 
 load_dotenv()
 
+class UploadRequest(Request):
+    """Request whose body limit (as in Flask 3.1) and file buffering a view may set before reading the body"""
+    _max_content_length = None
+    # Keep uploaded files in BytesIO instead of spilling those over 500 KB to temporary files
+    files_in_memory = False
+    
+    @property
+    def max_content_length(self):
+        if self._max_content_length is not None:
+            return self._max_content_length
+        return super().max_content_length
+    
+    @max_content_length.setter
+    def max_content_length(self, value):
+        self._max_content_length = value
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.files_in_memory:
+            return io.BytesIO()
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 CORS(app)
 
+# Uploads are parsed in memory, so cap their size (multipart overhead allowed)
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv('MAX_BATCH_UPLOAD_BYTES', str(100 * 1024 * 1024)))
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES + 64 * 1024
+# Only the batch route takes more; the ASGI bridge buffers bodies up to these limits
+app.config['ROUTE_MAX_CONTENT_LENGTH'] = {'/api/batch-analyze': MAX_BATCH_UPLOAD_BYTES + 64 * 1024}
+
+# Browser cache lifetime for generated audio
+AUDIO_MAX_AGE = int(os.getenv('AUDIO_MAX_AGE', str(365 * 24 * 3600)))
+
 # Initialize components
 resume_parser = ResumeParser()
 llm_query = LLMQuery()
 tts_generator = TTSGenerator()
+resume_cache = ResumeCache()
+session_store = SessionStore()
+background_loop = get_background_loop()
+metrics = get_metrics()
 
 # Load configuration
-with open('config/prompts.json', 'r') as f:
-    config = json.load(f)
+CONFIG_PATH = 'config/prompts.json'
+config = load_config(CONFIG_PATH)
+config_watcher = ConfigWatcher(CONFIG_PATH, config)
+
+# Local skill extraction; the LLM is an optional per-request enrichment
+skill_extractor = SkillExtractor(config)
+config_watcher.add_listener(skill_extractor.rebuild)
+EXTRACTION_MODES = ('local', 'llm', 'hybrid')
+SKILL_EXTRACTION_MODE = os.getenv('SKILL_EXTRACTION_MODE', 'local')
+
+# Deterministic skill-gap scoring and job role resolution
+skill_matcher = SkillMatcher(config, skill_extractor)
+config_watcher.add_listener(skill_matcher.rebuild)
+ANALYSIS_MODES = ('full', 'fast')
+
+# Token budgets for resume text and earlier LLM output inside prompts
+prompt_budget = PromptBudget(resume_parser, skill_matcher)
+
+# Multi-turn chat memory, compacted into a running summary in the background
+chat_engine = ChatEngine(llm_query, session_store, config, background_loop)
+
+# Batch screening, run as persistent jobs so every worker can report on them
+batch_analyzer = BatchAnalyzer(resume_parser, llm_query, config, prompt_budget)
+
+# Long-running analyses as persistent jobs, polled for partial results or reported to a webhook
+job_queue = JobQueue(JobStore(), background_loop)
+MAX_QUEUED_JOBS = int(os.getenv('MAX_QUEUED_JOBS', '1000'))
+
+# Pre-synthesize fixed phrases, and again whenever the config changes
+tts_warmup = TTSWarmup(tts_generator, config)
+config_watcher.add_listener(tts_warmup.schedule)
+
+def cache_counters():
+    """(labels, hits, misses) for every cache; the LLM response cache per endpoint"""
+    counters = [({'cache': 'resume'}, resume_cache.stats()), ({'cache': 'tts'}, tts_generator.cache.stats())]
+    for endpoint, stats in llm_query.response_cache.stats()['endpoints'].items():
+        counters.append(({'cache': 'llm', 'endpoint': endpoint}, stats))
+    return [(labels, stats['hits'], stats['misses']) for labels, stats in counters]
+
+def admission_stats():
+    """(labels, stats) for every upstream's admission controller"""
+    controllers = [({'upstream': 'llm', 'provider': name}, admission)
+                   for name, admission in llm_query.provider_pool.admission.items()]
+    controllers.append(({'upstream': 'tts', 'provider': 'edge-tts'}, tts_generator.admission))
+    return [(labels, admission.stats()) for labels, admission in controllers]
+
+# Gauges and counters read from the existing stats on every /metrics scrape
+metrics.add_collector(
+    'skillmotion_cache_hit_ratio', 'gauge', 'Cache hits per lookup',
+    lambda: [(labels, hits / (hits + misses) if hits + misses else 0.0) for labels, hits, misses in cache_counters()]
+)
+metrics.add_collector(
+    'skillmotion_cache_lookups_total', 'counter', 'Cache lookups by result',
+    lambda: [(dict(labels, result=result), count) for labels, hits, misses in cache_counters()
+             for result, count in (('hit', hits), ('miss', misses))]
+)
+metrics.add_collector(
+    'skillmotion_admission_active', 'gauge', 'Upstream calls holding an admission slot',
+    lambda: [(labels, stats['active']) for labels, stats in admission_stats()]
+)
+metrics.add_collector(
+    'skillmotion_admission_queue_depth', 'gauge', 'Upstream calls waiting for an admission slot',
+    lambda: [(labels, stats['queue_depth']) for labels, stats in admission_stats()]
+)
+metrics.add_collector(
+    'skillmotion_admission_rejected_total', 'counter', 'Upstream calls turned away by admission control',
+    lambda: [(dict(labels, reason=reason), count) for labels, stats in admission_stats()
+             for reason, count in stats['rejected'].items()]
+)
+metrics.add_collector(
+    'skillmotion_jobs', 'gauge', 'Persistent jobs by status',
+    lambda: [({'status': status}, count) for status, count in job_queue.store.counts().items()]
+)
+
+def start_background_services():
+    """Start config watching, the job workers and the TTS warm-up"""
+    config_watcher.start()
+    job_queue.start()
+    if os.getenv('TTS_WARMUP', '1') != '0':
+        tts_warmup.schedule()
+
+def pending_background_work():
+    """Count running persistent jobs, webhooks and chat summaries"""
+    return job_queue.pending() + chat_engine.stats()['compacting']
+
+async def stop_background_services(drain_timeout=0):
+    """Give background work up to drain_timeout seconds, then release connections and workers"""
+    config_watcher.stop()
+    deadline = time.monotonic() + drain_timeout
+    # Unfinished persistent jobs go back to the queue and resume after the restart
+    await background_loop.run(job_queue.stop(drain_timeout))
+    while pending_background_work() and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    if pending_background_work():
+        print(f"Stopping with {pending_background_work()} background tasks unfinished")
+    await llm_query.provider_pool.aclose()
+    resume_parser.engine.shutdown()
+
+def error_payload(error):
+    """Error body; an overloaded upstream also says when to retry"""
+    busy = UpstreamBusy.find(error)
+    if busy is not None:
+        return {"error": str(busy), "retry_after": busy.retry_after}
+    return {"error": str(error)}
+
+def error_response(error, status=500):
+    """JSON error response: 429/503 with Retry-After when an upstream turned the request away, 413 for big bodies"""
+    busy = UpstreamBusy.find(error)
+    if busy is None:
+        if isinstance(error, RequestEntityTooLarge):
+            status = 413
+        return jsonify(error_payload(error)), status
+    return jsonify(error_payload(busy)), busy.status, {"Retry-After": str(busy.retry_after)}
+
+def wants_stream(data):
+    """Check whether the client asked for a server-sent event stream"""
+    if data and data.get('stream'):
+        return True
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+def sse_event(event, data):
+    """Format a single server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def wants_chunked_audio(data):
+    """Check whether the client asked for a sentence-chunked audio playlist"""
+    return bool(data) and data.get('audio_mode') == 'chunked'
+
+async def speech_payload(text, chunked=False):
+    """Synthesize text and return the audio fields of a response.
+
+    In chunked mode synthesis continues in the background and the response
+    carries an ordered playlist whose first entry is also the audio_url.
+    """
+    if chunked:
+        playlist = [f"/api/audio/{filename}" for filename in tts_generator.start_playlist(text)]
+        if playlist:
+            return {"audio_url": playlist[0], "audio_playlist": playlist}
+    
+    audio_path = await tts_generator.generate_speech(text)
+    return {"audio_url": f"/api/audio/{os.path.basename(audio_path)}"}
+
+def sse_response(events):
+    """Wrap an event generator in an unbuffered SSE response"""
+    return Response(events, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.after_request
+def compress_json(response):
+    """gzip/brotli-compress buffered JSON and HTML responses"""
+    return compress_response(response, request.headers.get('Accept-Encoding'))
+
+@app.before_request
+def start_timing():
+    metrics.begin_request()
+
+@app.after_request
+def record_timing(response):
+    """Report the request's spans in Server-Timing and observe its duration"""
+    timings = metrics.current_request()
+    if timings is None:
+        return response
+    response.headers['Server-Timing'] = timings.header()
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    labels = (route, request.method, response.status_code)
+    
+    def observe():
+        metrics.observe_request(*labels, timings.elapsed())
+    
+    # Streamed bodies are timed until they are closed; file bodies bypass close hooks
+    if response.direct_passthrough:
+        observe()
+    else:
+        response.call_on_close(observe)
+    return response
+
+@app.teardown_request
+def end_timing(error=None):
+    metrics.end_request()
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Latency histograms, cache hit ratios and admission queues in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def health_check():
@@ -44,21 +283,80 @@ async def get_welcome_message():
             "audio_url": f"/api/audio/{os.path.basename(audio_path)}"
         })
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @app.route('/api/audio/<filename>')
 def serve_audio(filename):
     """Serve generated audio files"""
     try:
-        audio_path = os.path.join('temp_audio', filename)
-        return send_file(audio_path, mimetype='audio/mpeg')
+        # Chunks of a playlist may still be synthesizing
+        tts_generator.wait_for_audio(filename)
+        
+        # Pin the file so cache eviction cannot remove it mid-download
+        if not tts_generator.cache.pin(filename):
+            return jsonify({"error": "Audio file not found"}), 404
+        try:
+            # Audio files are content-addressed: the name is a strong ETag and never changes
+            response = send_file(
+                os.path.abspath(tts_generator.cache.path_for(filename)), mimetype='audio/mpeg',
+                conditional=True, etag=os.path.splitext(filename)[0], max_age=AUDIO_MAX_AGE
+            )
+        except Exception:
+            tts_generator.cache.unpin(filename)
+            raise
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+
+        # File bodies are handed to the server directly, bypassing call_on_close,
+        # so closing the body also releases the pin (once)
+        released = []
+        def release():
+            if not released:
+                released.append(True)
+                tts_generator.cache.unpin(filename)
+        response.response = ClosingIterator(response.response, release)
+        response.call_on_close(release)
+        return response
+    except RequestedRangeNotSatisfiable as e:
+        return e
     except Exception as e:
         return jsonify({"error": str(e)}), 404
 
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Report cache statistics"""
+    return jsonify({
+        "tts_cache": tts_generator.cache.stats(),
+        "tts_warmup": tts_warmup.stats(),
+        "resume_cache": resume_cache.stats(),
+        "llm_cache": llm_query.response_cache.stats(),
+        "llm_inflight": llm_query.inflight.stats(),
+        "llm_router": llm_query.router.stats(),
+        "llm_admission": llm_query.provider_pool.admission_stats(),
+        "tts_inflight": tts_generator.inflight.stats(),
+        "tts_admission": tts_generator.admission.stats(),
+        "skill_extractor": skill_extractor.stats(),
+        "prompt_sizes": llm_query.prompt_sizes.stats(),
+        "prompt_budget": prompt_budget.stats(),
+        "sessions": session_store.stats(),
+        "chat_memory": chat_engine.stats(),
+        "jobs": job_queue.stats()
+    })
+
+def resume_cache_variant(extraction_mode, job_role=None):
+    """Cache variant for an upload; LLM modes pack the resume for the role, so it is part of the key"""
+    variant = f"{extraction_mode}:{skill_extractor.version}"
+    if extraction_mode != 'local' and job_role:
+        role = ' '.join(job_role.lower().split())
+        variant += f":{hashlib.sha256(role.encode('utf-8')).hexdigest()[:16]}"
+    return variant
+
 @app.route('/api/upload-resume', methods=['POST'])
 async def upload_resume():
     """Handle resume upload and initial processing"""
     try:
+        # The body is capped at MAX_CONTENT_LENGTH, so the PDF never needs to touch disk
+        request.files_in_memory = True
         if 'resume' not in request.files:
             return jsonify({"error": "No resume file provided"}), 400
         
@@ -66,81 +364,309 @@ async def upload_resume():
         if file.filename == '':
             return jsonify({"error": "No file selected"}), 400
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            file.save(tmp_file.name)
-            
-            # Parse resume
-            resume_text = resume_parser.extract_text_from_pdf(tmp_file.name)
+        # Read the upload into memory, refusing anything over the cap
+        file_bytes = file.read(MAX_UPLOAD_BYTES + 1)
+        try:
+            resume_parser.validate_bytes(file_bytes, MAX_UPLOAD_BYTES)
+        except ValueError as e:
+            status = 413 if len(file_bytes) > MAX_UPLOAD_BYTES else 400
+            return jsonify({"error": str(e)}), status
+        
+        extraction_mode = request.form.get('extraction_mode', SKILL_EXTRACTION_MODE).lower()
+        if extraction_mode not in EXTRACTION_MODES:
+            return jsonify({"error": f"extraction_mode must be one of: {', '.join(EXTRACTION_MODES)}"}), 400
+        
+        # SQLite lookups and local CPU work run in threads, off the event loop
+        session_id = request.form.get('session_id')
+        if session_id and await asyncio.to_thread(session_store.get, session_id) is None:
+            return session_not_found()
+        
+        # Re-uploads of the same file reuse the parsed text and skills
+        resume_digest = await asyncio.to_thread(resume_cache.digest, file_bytes)
+        cache_variant = resume_cache_variant(extraction_mode, request.form.get('job_role'))
+        cached = await asyncio.to_thread(resume_cache.get, resume_digest, cache_variant)
+        if cached:
+            resume_text = cached['resume_text']
+            extracted_skills = cached['extracted_skills']
+            structured_skills = cached['structured_skills']
+        else:
+            # Parse resume straight from memory in the extraction process pool
+            raw_text = await resume_parser.extract_raw_text_async(file_bytes)
+            resume_text = await asyncio.to_thread(resume_parser.clean_text, raw_text)
             
-            # Extract skills using LLM
-            skills_prompt = config['prompts']['skill_extraction'].format(
-                resume_text=resume_text
+            # Match skills locally on the raw text, where C++ and C# survive
+            structured_skills = await asyncio.to_thread(skill_extractor.extract, raw_text)
+            extracted_skills = await extract_skills(
+                extraction_mode, resume_text, structured_skills, request.form.get('job_role')
             )
-            extracted_skills = await llm_query.query_llm(skills_prompt)
-            
-            # Clean up temp file
-            os.unlink(tmp_file.name)
-            
-            return jsonify({
-                "resume_text": resume_text,
-                "extracted_skills": extracted_skills,
-                "status": "success"
-            })
             
+            await asyncio.to_thread(
+                resume_cache.put, resume_digest, resume_text, extracted_skills, structured_skills, cache_variant
+            )
+        
+        # Later calls reference the parsed resume by session id
+        resume_fields = dict(
+            resume_digest=resume_digest,
+            resume_text=resume_text,
+            extracted_skills=extracted_skills,
+            structured_skills=structured_skills
+        )
+        if session_id:
+            await asyncio.to_thread(session_store.update, session_id, **resume_fields)
+        else:
+            session_id = await asyncio.to_thread(session_store.create, **resume_fields)
+        
+        result = {
+            "session_id": session_id,
+            "extracted_skills": extracted_skills,
+            "structured_skills": structured_skills,
+            "extraction_mode": extraction_mode,
+            "cached": bool(cached),
+            "status": "success"
+        }
+        if request.form.get('include_resume_text', '').lower() in ('1', 'true'):
+            result["resume_text"] = resume_text
+        return jsonify(result)
+        
+    except RequestEntityTooLarge:
+        return jsonify({"error": f"File exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit"}), 413
+    except Exception as e:
+        return error_response(e)
+
+def session_context(session):
+    """Summarize what a session knows about the user for the chat prompt"""
+    parts = []
+    if session.get('extracted_skills'):
+        parts.append(f"Resume skills: {session['extracted_skills']}")
+    if session.get('job_role'):
+        parts.append(f"Target role: {session['job_role']}")
+    if session.get('skill_match'):
+        parts.append(SkillMatcher.format_match(session['skill_match']))
+    return "\n".join(parts)
+
+def session_not_found():
+    return jsonify({"error": "Session not found or expired"}), 404
+
+def load_session(data):
+    """Return (session_id, session) for a JSON body; session is {} without an id, None if unknown"""
+    session_id = (data or {}).get('session_id')
+    if not session_id:
+        return None, {}
+    return session_id, session_store.get(session_id)
+
+async def extract_skills(extraction_mode, resume_text, structured_skills, job_role=None):
+    """Return the skills text for an upload in the requested extraction mode"""
+    local_skills = SkillExtractor.format_skills(structured_skills)
+    if extraction_mode == 'local':
+        return local_skills
+    
+    # Long resumes are packed to their most relevant sections
+    resume_text = await asyncio.to_thread(prompt_budget.pack_resume, resume_text, job_role)
+    
+    if extraction_mode == 'llm':
+        skills_prompt = config['prompts']['skill_extraction'].format(
+            resume_text=resume_text
+        )
+        return await llm_query.query_llm(skills_prompt, endpoint='skill_extraction')
+    
+    # Hybrid: the LLM only adds what the taxonomy missed
+    try:
+        enrichment_prompt = config['prompts']['skill_enrichment'].format(
+            local_skills=local_skills,
+            resume_text=resume_text
+        )
+        enrichment = await llm_query.query_llm(enrichment_prompt, endpoint='skill_enrichment')
+        return f"{local_skills}\n\nAdditional skills:\n{enrichment}"
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        print(f"Skill enrichment failed, using local skills: {e}")
+        return local_skills
 
 @app.route('/api/analyze-resume', methods=['POST'])
 async def analyze_resume():
     """Perform comprehensive resume analysis for a specific job role"""
     try:
-        data = request.get_json()
-        
-        if not data or 'job_role' not in data or 'extracted_skills' not in data:
-            return jsonify({"error": "Missing required data"}), 400
+        data = request.get_json() or {}
+        session_id, session = await asyncio.to_thread(load_session, data)
+        if session is None:
+            return session_not_found()
         
-        job_role = data['job_role'].lower().replace(' ', '_')
-        extracted_skills = data['extracted_skills']
+        try:
+            job_role, extracted_skills, analysis_mode = read_analysis_request(data, session)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        # Get required skills for the job role
-        required_skills = config['job_skills_database'].get(
-            job_role, 
-            ["General professional skills", "Communication", "Problem solving", "Teamwork"]
+        # Skill extraction and TF-IDF matching are CPU work; keep them off the event loop
+        skill_match, gap_analysis_prompt, fast_gap_analysis = await asyncio.to_thread(
+            prepare_analysis, job_role, extracted_skills, analysis_mode
         )
+        required_skills = skill_match['required_skills']
         
-        # Perform gap analysis
-        gap_analysis_prompt = config['prompts']['gap_analysis'].format(
-            job_role=data['job_role'],
-            current_skills=extracted_skills,
-            required_skills=', '.join(required_skills)
+        if wants_stream(data):
+            return sse_response(stream_analysis(
+                job_role, skill_match, gap_analysis_prompt, wants_chunked_audio(data), fast_gap_analysis,
+                session_id
+            ))
+        
+        # Learning plan and TTS both depend only on the gap analysis, so they overlap
+        pipeline = build_analysis_pipeline(
+            job_role, gap_analysis_prompt, wants_chunked_audio(data), fast_gap_analysis
         )
+        results = await pipeline.run()
+        
+        if session_id:
+            await asyncio.to_thread(
+                session_store.update,
+                session_id,
+                job_role=job_role,
+                skill_match=skill_match,
+                gap_analysis=results['gap_analysis'],
+                learning_plan=results['learning_plan']
+            )
         
-        gap_analysis = await llm_query.query_llm(gap_analysis_prompt)
+        return jsonify({
+            "gap_analysis": results['gap_analysis'],
+            "learning_plan": results['learning_plan'],
+            "required_skills": required_skills,
+            "skill_match": skill_match,
+            "analysis_summary": results['analysis_summary'],
+            **results['speech'],
+            "stage_timings": pipeline.timing_report()
+        })
         
-        # Generate learning plan
-        learning_plan_prompt = config['prompts']['learning_plan'].format(
-            skill_gaps=gap_analysis,
-            current_level="Mid-level",  # This could be enhanced with user input
-            target_role=data['job_role']
+    except Exception as e:
+        return error_response(e)
+
+def read_analysis_request(data, session):
+    """Return (job_role, extracted_skills, analysis_mode); raise ValueError if incomplete"""
+    # Fields in the body override what the session already holds
+    job_role = data.get('job_role') or session.get('job_role')
+    extracted_skills = data.get('extracted_skills') or session.get('extracted_skills')
+    if not job_role or not extracted_skills:
+        raise ValueError("Missing required data")
+    if isinstance(extracted_skills, (list, tuple)) and all(isinstance(skill, str) for skill in extracted_skills):
+        extracted_skills = skills_text(extracted_skills)
+    if not isinstance(job_role, str) or not isinstance(extracted_skills, str):
+        raise ValueError("job_role must be text and extracted_skills text or a list of strings")
+    
+    analysis_mode = data.get('analysis_mode', 'full')
+    if analysis_mode not in ANALYSIS_MODES:
+        raise ValueError(f"analysis_mode must be one of: {', '.join(ANALYSIS_MODES)}")
+    return job_role, extracted_skills, analysis_mode
+
+def prepare_analysis(job_role, extracted_skills, analysis_mode):
+    """Return (skill_match, gap_analysis_prompt, fast_gap_analysis) for an analysis"""
+    # Score the skills against the nearest known role's required skills
+    skill_match = skill_matcher.match(job_role, extracted_skills)
+    
+    # Perform gap analysis; fast mode uses the local match instead of the LLM
+    gap_analysis_prompt = config['prompts']['gap_analysis'].format(
+        job_role=job_role,
+        current_skills=prompt_budget.fit(extracted_skills),
+        required_skills=', '.join(skill_match['required_skills']),
+        skill_match=prompt_budget.fit(SkillMatcher.format_match(skill_match))
+    )
+    fast_gap_analysis = SkillMatcher.format_match(skill_match) if analysis_mode == 'fast' else None
+    return skill_match, gap_analysis_prompt, fast_gap_analysis
+
+def get_required_skills(job_role):
+    """Look up the required skills for the nearest known job role, with a generic fallback"""
+    return skill_matcher.required_skills(job_role)
+
+def build_analysis_summary(job_role, gap_analysis):
+    """Build the spoken summary for a resume analysis"""
+    return f"Based on your resume analysis for the {job_role} position, here's what I found: {gap_analysis[:200]}... I've also created a personalized learning plan for you."
+
+def build_learning_plan_prompt(job_role, gap_analysis):
+    """Format the learning plan prompt for a gap analysis"""
+    return config['prompts']['learning_plan'].format(
+        skill_gaps=prompt_budget.fit(gap_analysis),
+        current_level="Mid-level",  # This could be enhanced with user input
+        target_role=job_role
+    )
+
+def build_analysis_pipeline(job_role, gap_analysis_prompt, chunked_audio=False, fast_gap_analysis=None):
+    """Build the gap analysis -> (learning plan | summary speech) stage graph"""
+    async def summary_speech(results):
+        results['analysis_summary'] = build_analysis_summary(job_role, results['gap_analysis'])
+        return await speech_payload(results['analysis_summary'], chunked_audio)
+    
+    async def local_gap_analysis(results):
+        return fast_gap_analysis
+    
+    pipeline = Pipeline('analyze_resume')
+    if fast_gap_analysis is not None:
+        pipeline.add_stage('gap_analysis', local_gap_analysis)
+    else:
+        pipeline.add_stage(
+            'gap_analysis',
+            lambda results: llm_query.query_llm(gap_analysis_prompt, endpoint='gap_analysis')
         )
+    pipeline.add_stage(
+        'learning_plan',
+        lambda results: llm_query.query_llm(
+            build_learning_plan_prompt(job_role, results['gap_analysis']), endpoint='learning_plan'
+        ),
+        depends_on=['gap_analysis']
+    )
+    pipeline.add_stage('speech', summary_speech, depends_on=['gap_analysis'])
+    return pipeline
+
+def stream_analysis(job_role, skill_match, gap_analysis_prompt, chunked_audio=False, fast_gap_analysis=None,
+                    session_id=None):
+    """Stream gap analysis and learning plan tokens as server-sent events"""
+    try:
+        required_skills = skill_match['required_skills']
+        yield sse_event('start', {"required_skills": required_skills, "skill_match": skill_match})
         
-        learning_plan = await llm_query.query_llm(learning_plan_prompt)
+        gap_chunks = []
+        yield sse_event('stage', {"stage": "gap_analysis"})
+        if fast_gap_analysis is not None:
+            gap_tokens = [fast_gap_analysis]
+        else:
+            gap_tokens = llm_query.stream_llm(gap_analysis_prompt, endpoint='gap_analysis')
+        for token in gap_tokens:
+            gap_chunks.append(token)
+            yield sse_event('token', {"stage": "gap_analysis", "text": token})
+        gap_analysis = ''.join(gap_chunks)
         
-        # Generate TTS for the analysis
-        analysis_text = f"Based on your resume analysis for the {data['job_role']} position, here's what I found: {gap_analysis[:200]}... I've also created a personalized learning plan for you."
-        audio_path = await tts_generator.generate_speech(analysis_text)
+        # Synthesize the summary while the learning plan streams
+        analysis_text = build_analysis_summary(job_role, gap_analysis)
+        speech_future = background_loop.submit(speech_payload(analysis_text, chunked_audio))
         
-        return jsonify({
+        plan_chunks = []
+        yield sse_event('stage', {"stage": "learning_plan"})
+        try:
+            for token in llm_query.stream_llm(
+                build_learning_plan_prompt(job_role, gap_analysis), endpoint='learning_plan'
+            ):
+                plan_chunks.append(token)
+                yield sse_event('token', {"stage": "learning_plan", "text": token})
+        except BaseException:
+            speech_future.cancel()
+            raise
+        learning_plan = ''.join(plan_chunks)
+        
+        audio = speech_future.result()
+        
+        if session_id:
+            session_store.update(
+                session_id,
+                job_role=job_role,
+                skill_match=skill_match,
+                gap_analysis=gap_analysis,
+                learning_plan=learning_plan
+            )
+        
+        yield sse_event('done', {
             "gap_analysis": gap_analysis,
             "learning_plan": learning_plan,
             "required_skills": required_skills,
+            "skill_match": skill_match,
             "analysis_summary": analysis_text,
-            "audio_url": f"/api/audio/{os.path.basename(audio_path)}"
+            **audio
         })
-        
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        yield sse_event('error', error_payload(e))
 
 @app.route('/api/chat', methods=['POST'])
 async def chat():
@@ -151,41 +677,81 @@ async def chat():
         if not data or 'message' not in data:
             return jsonify({"error": "No message provided"}), 400
         
-        user_message = data['message']
-        context = data.get('context', '')
+        session_id, session = await asyncio.to_thread(load_session, data)
+        if session is None:
+            return session_not_found()
+        
+        user_message = prompt_budget.fit(data['message'])
+        context = "\n".join(part for part in (session_context(session), data.get('context', '')) if part)
         
-        # Determine intent and generate appropriate response
-        response_text = await llm_query.query_llm(
-            f"Context: {context}\nUser Query: {user_message}\n\nProvide a helpful response as an AI career development assistant."
+        # Prompt from the session's conversation summary and recent turns
+        session_id, chat_prompt = await asyncio.to_thread(
+            chat_engine.prepare, session_id, user_message, prompt_budget.fit(context)
         )
         
+        if wants_stream(data):
+            return sse_response(stream_chat(session_id, user_message, chat_prompt, wants_chunked_audio(data)))
+        
+        response_text = await llm_query.query_llm(chat_prompt, endpoint='chat')
+        await asyncio.to_thread(chat_engine.record, session_id, user_message, response_text)
+        
         # Generate TTS
-        audio_path = await tts_generator.generate_speech(response_text)
+        audio = await speech_payload(response_text, wants_chunked_audio(data))
         
         return jsonify({
+            "session_id": session_id,
             "response": response_text,
-            "audio_url": f"/api/audio/{os.path.basename(audio_path)}"
+            **audio
         })
         
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
+
+def stream_chat(session_id, user_message, chat_prompt, chunked_audio=False):
+    """Stream chat response tokens as server-sent events"""
+    try:
+        yield sse_event('start', {"session_id": session_id})
+        
+        chunks = []
+        for token in llm_query.stream_llm(chat_prompt, endpoint='chat'):
+            chunks.append(token)
+            yield sse_event('token', {"text": token})
+        response_text = ''.join(chunks)
+        chat_engine.record(session_id, user_message, response_text)
+        
+        audio = background_loop.run_sync(speech_payload(response_text, chunked_audio))
+        
+        yield sse_event('done', {
+            "session_id": session_id,
+            "response": response_text,
+            **audio
+        })
+    except Exception as e:
+        yield sse_event('error', error_payload(e))
+
+def build_skill_profile_prompt(data):
+    """Format the skill profile prompt for a request body"""
+    return config['prompts']['skill_profile'].format(
+        background=prompt_budget.fit(data.get('background', '')),
+        experience=prompt_budget.fit(data.get('experience', '')),
+        goals=prompt_budget.fit(data.get('goals', ''))
+    )
 
 @app.route('/api/skill-profile', methods=['POST'])
 async def create_skill_profile():
     """Create a comprehensive skill profile"""
     try:
-        data = request.get_json()
-        
-        profile_prompt = config['prompts']['skill_profile'].format(
-            background=data.get('background', ''),
-            experience=data.get('experience', ''),
-            goals=data.get('goals', '')
-        )
+        data = request.get_json() or {}
+        session_id, session = await asyncio.to_thread(load_session, data)
+        if session is None:
+            return session_not_found()
         
-        skill_profile = await llm_query.query_llm(profile_prompt)
+        skill_profile = await llm_query.query_llm(build_skill_profile_prompt(data), endpoint='skill_profile')
+        if session_id:
+            await asyncio.to_thread(session_store.update, session_id, skill_profile=skill_profile)
         
         # Generate TTS
-        summary_text = f"I've created your skill profile. Here's a summary of your current capabilities and development recommendations."
+        summary_text = config['skill_profile_summary']
         audio_path = await tts_generator.generate_speech(summary_text)
         
         return jsonify({
@@ -194,10 +760,266 @@ async def create_skill_profile():
         })
         
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
+
+@app.route('/api/session', methods=['POST'])
+def create_session():
+    """Start an empty session"""
+    return jsonify({"session_id": session_store.create()}), 201
+
+@app.route('/api/session/<session_id>', methods=['GET'])
+def get_session(session_id):
+    """Describe what a session holds, without the full resume text"""
+    session = session_store.get(session_id)
+    if session is None:
+        return session_not_found()
+    session.pop('resume_text', None)
+    return jsonify({"session_id": session_id, **session})
+
+@app.route('/api/session/<session_id>', methods=['DELETE'])
+def delete_session(session_id):
+    """Forget a session and everything it holds"""
+    session_store.delete(session_id)
+    return jsonify({"status": "deleted"})
+
+@app.route('/api/batch-analyze', methods=['POST'])
+def batch_analyze():
+    """Start a batch screening job for a set of uploaded resumes"""
+    try:
+        # Raise the body limit for this route only, before the form is read
+        request.max_content_length = app.config['ROUTE_MAX_CONTENT_LENGTH'][request.path]
+        job_role = request.form.get('job_role', '').strip()
+        files = [file for file in request.files.getlist('resumes') if file.filename]
+        
+        if not job_role:
+            return jsonify({"error": "No job role provided"}), 400
+        if not files:
+            return jsonify({"error": "No resume files provided"}), 400
+        
+        documents = []
+        for file in files:
+            data = file.read(MAX_UPLOAD_BYTES + 1)
+            if len(data) > MAX_UPLOAD_BYTES:
+                return jsonify({"error": f"{file.filename} exceeds the upload limit"}), 413
+            documents.append((file.filename, data))
+        
+        if job_queue_full():
+            return job_queue_full_response()
+        
+        job = job_queue.submit(
+            'batch-analyze',
+            {"job_role": job_role, "total": len(documents)},
+            files=documents,
+            result={"job_role": job_role, "total": len(documents), "completed": 0, "failed": 0}
+        )
+        return jsonify({
+            **batch_job_dict(job),
+            "status_url": f"/api/batch-analyze/{job['job_id']}",
+            "results_url": f"/api/batch-analyze/{job['job_id']}/results"
+        }), 202
+        
+    except RequestEntityTooLarge:
+        return jsonify({"error": "Batch exceeds the upload limit"}), 413
+    except Exception as e:
+        return error_response(e)
+
+@app.route('/api/batch-analyze/<job_id>', methods=['GET'])
+def batch_status(job_id):
+    """Report progress of a batch screening job"""
+    job = job_queue.store.get(job_id)
+    if not job or job['kind'] != 'batch-analyze':
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(batch_job_dict(job))
+
+@app.route('/api/batch-analyze/<job_id>/results', methods=['GET'])
+def batch_results(job_id):
+    """Stream a batch job's results and progress as JSONL until it finishes"""
+    job = job_queue.store.get(job_id)
+    if not job or job['kind'] != 'batch-analyze':
+        return jsonify({"error": "Job not found"}), 404
+    return Response(job_queue.store.follow(job_id), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def batch_job_dict(job):
+    """A stored batch-analyze job in the batch API's shape"""
+    return {
+        "job_id": job['job_id'],
+        "job_role": job['result']['job_role'],
+        "status": job['status'],
+        "total": job['result']['total'],
+        "completed": job['result']['completed'],
+        "failed": job['result']['failed'],
+        "error": job['error'],
+        "created_at": job['created_at'],
+        "finished_at": job['finished_at']
+    }
+
+async def run_analysis_job(job):
+    """Job handler: the analysis pipeline, publishing each stage's output as it finishes"""
+    payload = job.payload
+    job_role = payload['job_role']
+    skill_match, gap_analysis_prompt, fast_gap_analysis = await asyncio.to_thread(
+        prepare_analysis, job_role, payload['extracted_skills'], payload['analysis_mode']
+    )
+    if not job.done('skill_match'):
+        await job.record('skill_match', required_skills=skill_match['required_skills'], skill_match=skill_match)
+    
+    # Stages an earlier attempt finished are passed in and not run again
+    finished = {stage: job.result[stage] for stage in ('gap_analysis', 'learning_plan') if job.done(stage)}
+    if job.done('speech'):
+        finished['analysis_summary'] = job.result['analysis_summary']
+        finished['speech'] = {key: job.result[key] for key in ('audio_url', 'audio_playlist') if key in job.result}
+    
+    async def publish(stage, results):
+        if stage == 'speech':
+            await job.record(stage, analysis_summary=results['analysis_summary'], **results['speech'])
+        else:
+            await job.record(stage, **{stage: results[stage]})
+    
+    pipeline = build_analysis_pipeline(
+        job_role, gap_analysis_prompt, payload.get('audio_mode') == 'chunked', fast_gap_analysis
+    )
+    results = await pipeline.run(on_stage=publish, **finished)
+    
+    if payload.get('session_id'):
+        await asyncio.to_thread(
+            session_store.update,
+            payload['session_id'],
+            job_role=job_role,
+            skill_match=skill_match,
+            gap_analysis=results['gap_analysis'],
+            learning_plan=results['learning_plan']
+        )
+    return {"stage_timings": pipeline.timing_report()}
+
+async def run_skill_profile_job(job):
+    """Job handler: the skill profile, then its spoken summary"""
+    payload = job.payload
+    if not job.done('skill_profile'):
+        skill_profile = await llm_query.query_llm(build_skill_profile_prompt(payload), endpoint='skill_profile')
+        await job.record('skill_profile', skill_profile=skill_profile)
+        if payload.get('session_id'):
+            await asyncio.to_thread(session_store.update, payload['session_id'], skill_profile=skill_profile)
+    return await speech_payload(config['skill_profile_summary'])
+
+async def run_batch_job(job):
+    """Job handler: screen the uploaded resumes, appending each result and progress record"""
+    payload = job.payload
+    total = payload['total']
+    documents = await job.files()
+    
+    # Resumes an earlier attempt already reported are not screened again
+    reported = Counter(record['file'] for record in await job.records() if record['type'] == 'result')
+    remaining = []
+    for name, data in documents:
+        if reported[name]:
+            reported[name] -= 1
+        else:
+            remaining.append((name, data))
+    
+    completed = job.result.get('completed', 0)
+    failed = job.result.get('failed', 0)
+    required_skills = await asyncio.to_thread(get_required_skills, payload['job_role'])
+    async for record in batch_analyzer.run(remaining, payload['job_role'], required_skills):
+        if record['type'] != 'result':
+            continue
+        completed += 1
+        failed += record['status'] != 'ok'
+        progress = {'type': 'progress', 'completed': completed, 'total': total}
+        await job.append(record, progress, completed=completed, failed=failed)
+    return {"completed": completed, "failed": failed}
+
+job_queue.register('analyze-resume', run_analysis_job)
+job_queue.register('skill-profile', run_skill_profile_job)
+job_queue.register('batch-analyze', run_batch_job)
+
+def job_queue_full():
+    return job_queue.store.count('queued') >= MAX_QUEUED_JOBS
+
+def job_queue_full_response():
+    return jsonify({"error": "Too many queued jobs", "retry_after": 30}), 503, {"Retry-After": "30"}
+
+def submit_job(kind, payload, data):
+    """Persist a job and answer 202 with the URL to poll"""
+    callback_url = data.get('callback_url')
+    if callback_url:
+        try:
+            validate_callback_url(callback_url)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    if job_queue_full():
+        return job_queue_full_response()
+    
+    job = job_queue.submit(kind, payload, callback_url)
+    status_url = f"/api/jobs/{job['job_id']}"
+    return jsonify({**job, "status_url": status_url}), 202, {"Location": status_url}
+
+@app.route('/api/jobs/analyze-resume', methods=['POST'])
+def submit_analysis_job():
+    """Queue a resume analysis; same body as /api/analyze-resume plus an optional callback_url"""
+    try:
+        data = request.get_json() or {}
+        session_id, session = load_session(data)
+        if session is None:
+            return session_not_found()
+        
+        try:
+            job_role, extracted_skills, analysis_mode = read_analysis_request(data, session)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        return submit_job('analyze-resume', {
+            "session_id": session_id,
+            "job_role": job_role,
+            "extracted_skills": extracted_skills,
+            "analysis_mode": analysis_mode,
+            "audio_mode": data.get('audio_mode')
+        }, data)
+        
+    except Exception as e:
+        return error_response(e)
+
+@app.route('/api/jobs/skill-profile', methods=['POST'])
+def submit_skill_profile_job():
+    """Queue a skill profile; same body as /api/skill-profile plus an optional callback_url"""
+    try:
+        data = request.get_json() or {}
+        session_id, session = load_session(data)
+        if session is None:
+            return session_not_found()
+        
+        return submit_job('skill-profile', {
+            "session_id": session_id,
+            "background": data.get('background', ''),
+            "experience": data.get('experience', ''),
+            "goals": data.get('goals', '')
+        }, data)
+        
+    except Exception as e:
+        return error_response(e)
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Report a job's status and the results of the stages finished so far"""
+    job = job_queue.store.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    if job_queue.cancel(job_id):
+        return jsonify(job_queue.store.get(job_id))
+    if job_queue.store.get(job_id):
+        return jsonify({"error": "Job already finished"}), 409
+    return jsonify({"error": "Job not found"}), 404
 
 def run_flask_app():
     """Run Flask app in a separate thread"""
+    start_background_services()
     app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
 
 if __name__ == '__main__':
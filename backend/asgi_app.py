@@ -0,0 +1,179 @@
+import os
+import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from app import app, background_loop, start_background_services, stop_background_services
+
+
+class ASGIBridge:
+    """Serve the Flask app over ASGI with one long-lived event loop per worker.
+
+    The worker's loop is attached as the background loop and async views
+    run on it, so every request shares its connection pools, caches and
+    in-flight registries instead of getting a fresh loop from Flask. Flask's
+    routing and sync views run in a bounded thread pool, and response
+    bodies (including SSE streams) are forwarded chunk by chunk. A client
+    disconnect closes the response iterator, cancelling its producer.
+    """
+
+    def __init__(self, flask_app, background_loop, on_startup=None, on_shutdown=None, threads=None,
+                 drain_timeout=None):
+        self.flask_app = flask_app
+        self.background_loop = background_loop
+        self.on_startup = on_startup
+        self.on_shutdown = on_shutdown
+        self.threads = threads or int(os.getenv('ASGI_THREADS', '64'))
+        self.drain_timeout = drain_timeout or float(os.getenv('ASGI_DRAIN_TIMEOUT', '30'))
+        self.executor = None
+        # Async views: block the request thread on the worker loop, not a new loop
+        flask_app.async_to_sync = self._async_to_sync
+
+    def _async_to_sync(self, func):
+        def run(*args, **kwargs):
+            return self.background_loop.run_sync(func(*args, **kwargs))
+        return run
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    if not self.background_loop.attach(asyncio.get_running_loop()):
+                        print("Background loop already running in a thread; async views will use it")
+                    self.executor = ThreadPoolExecutor(self.threads, thread_name_prefix='asgi')
+                    if self.on_startup:
+                        self.on_startup()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                # The server has stopped accepting and drained in-flight requests by now
+                try:
+                    if self.on_shutdown:
+                        await self.on_shutdown(self.drain_timeout)
+                    self.executor.shutdown(wait=False, cancel_futures=True)
+                    self.background_loop.stop()
+                except Exception as e:
+                    print(f"Error during shutdown: {e}")
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        config = self.flask_app.config
+        max_length = config.get('ROUTE_MAX_CONTENT_LENGTH', {}).get(scope['path'], config.get('MAX_CONTENT_LENGTH'))
+        disconnected = asyncio.Event()
+
+        # Bodies within the global cap (single uploads) stay in memory; only batch uploads may spill
+        with SpooledTemporaryFile(max_size=config.get('MAX_CONTENT_LENGTH') or 1024 * 1024) as body:
+            length = 0
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    return
+                chunk = message.get('body', b'')
+                length += len(chunk)
+                # Past the cap Flask answers 413 itself; stop buffering
+                if not max_length or length <= max_length:
+                    body.write(chunk)
+                if not message.get('more_body'):
+                    break
+            body.seek(0)
+
+            async def watch_disconnect():
+                while (await receive())['type'] != 'http.disconnect':
+                    pass
+                disconnected.set()
+
+            watcher = asyncio.create_task(watch_disconnect())
+            try:
+                await loop.run_in_executor(
+                    self.executor, self._run_wsgi, self._environ(scope, body, length), send, loop, disconnected
+                )
+            finally:
+                watcher.cancel()
+
+    def _run_wsgi(self, environ, send, loop, disconnected):
+        """Run the Flask app in a pool thread, forwarding its response to the loop"""
+        def send_sync(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response_start = {}
+
+        def start_response(status, headers, exc_info=None):
+            response_start.update({
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers]
+            })
+
+        chunks = self.flask_app(environ, start_response)
+        try:
+            started = False
+            for chunk in chunks:
+                if disconnected.is_set():
+                    return
+                if not started:
+                    send_sync(response_start)
+                    started = True
+                if chunk:
+                    send_sync({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if not started:
+                send_sync(response_start)
+            send_sync({'type': 'http.response.body', 'body': b''})
+        except OSError:
+            # The client went away mid-response
+            pass
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    @staticmethod
+    def _environ(scope, body, length):
+        script_name = scope.get('root_path', '').encode('utf8').decode('latin1')
+        path_info = scope['path'].encode('utf8').decode('latin1')
+        if path_info.startswith(script_name):
+            path_info = path_info[len(script_name):]
+        server = scope.get('server') or ('localhost', 80)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': script_name,
+            'PATH_INFO': path_info,
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.input_terminated': True,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+            'CONTENT_LENGTH': str(length)
+        }
+        if scope.get('client'):
+            environ['REMOTE_ADDR'] = scope['client'][0]
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin1').upper().replace('-', '_')
+            if name == 'CONTENT_LENGTH':
+                continue
+            if name != 'CONTENT_TYPE':
+                name = f"HTTP_{name}"
+            value = value.decode('latin1')
+            environ[name] = f"{environ[name]},{value}" if name in environ else value
+        return environ
+
+
+# uvicorn asgi_app:application --app-dir backend (run from the repository root)
+application = ASGIBridge(app, background_loop, start_background_services, stop_background_services)
@@ -0,0 +1,200 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+
+CACHE_FILE_PATTERN = re.compile(r'^tts_[0-9a-f]{64}\.mp3$')
+STALE_PART_SECONDS = 600
+
+
+class AudioCache:
+    """Content-addressed MP3 store with a byte-bounded LRU index.
+
+    Files are named after the SHA-256 of (text, voice, rate, volume), so
+    identical utterances map to the same file. The directory is the shared
+    truth between worker processes: each keeps an in-memory index, adopts
+    files other workers wrote when a lookup misses, and rescans the
+    directory before evicting so the byte cap holds across workers. Hits
+    touch the file, so eviction follows recency in every worker. Files
+    pinned by an in-progress download here are never evicted; another
+    worker may unlink them, but an already opened file is still sent whole.
+    """
+
+    def __init__(self, directory='temp_audio', max_bytes=None):
+        self.directory = directory
+        self.max_bytes = max_bytes or int(os.getenv('TTS_CACHE_MAX_BYTES', str(200 * 1024 * 1024)))
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._index = OrderedDict()  # filename -> size in bytes, oldest first
+        self._pins = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_index()
+
+    @staticmethod
+    def make_key(text, voice, rate, volume):
+        """Return the content address for an utterance"""
+        payload = json.dumps([text, voice, rate, volume], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def filename_for(key):
+        return f"tts_{key}.mp3"
+
+    def path_for(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def partial_path_for(self, key):
+        """Return a unique temporary path to synthesize into before add()"""
+        return os.path.join(self.directory, f"tts_{key}.{uuid.uuid4().hex}.part")
+
+    def _load_index(self):
+        """Index existing cache files, oldest first, and drop stale leftovers"""
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or CACHE_FILE_PATTERN.match(entry.name):
+                continue
+            if entry.name.startswith('tts_') and entry.name.endswith('.mp3'):
+                # Legacy timestamped files are never served
+                self._unlink(entry.path)
+            elif entry.name.endswith(('.part', '.pending')) and time.time() - entry.stat().st_mtime > STALE_PART_SECONDS:
+                self._unlink(entry.path)
+
+        with self._lock:
+            self._sync_locked()
+            self._evict_locked()
+
+    def _sync_locked(self):
+        """Rebuild the index from the directory, least recently used first"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if CACHE_FILE_PATTERN.match(entry.name):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Evicted by another worker meanwhile
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        self._index = OrderedDict((filename, size) for _, filename, size in sorted(entries))
+        self.total_bytes = sum(self._index.values())
+
+    def _adopt_locked(self, filename):
+        """Index a cache file another worker wrote; False if there is none"""
+        if not CACHE_FILE_PATTERN.match(filename):
+            return False
+        try:
+            size = os.path.getsize(self.path_for(filename))
+        except OSError:
+            return False
+        self._index[filename] = size
+        self.total_bytes += size
+        return True
+
+    def _touch_locked(self, filename):
+        """Mark a file used; False (and forget it) if another worker evicted it"""
+        try:
+            os.utime(self.path_for(filename))
+        except OSError:
+            self.total_bytes -= self._index.pop(filename, 0)
+            return False
+        self._index.move_to_end(filename)
+        return True
+
+    def lookup(self, key):
+        """Return the cached file path for key, or None on a miss"""
+        filename = self.filename_for(key)
+        with self._lock:
+            if (filename in self._index or self._adopt_locked(filename)) and self._touch_locked(filename):
+                self.hits += 1
+                return self.path_for(filename)
+            self.misses += 1
+            return None
+
+    def add(self, key, source_path):
+        """Move a freshly generated file into the cache and return its path"""
+        filename = self.filename_for(key)
+        path = self.path_for(filename)
+        os.replace(source_path, path)
+        size = os.path.getsize(path)
+
+        with self._lock:
+            # Other workers add files too; count them all against the cap
+            self._sync_locked()
+            if filename in self._index:
+                self._index.move_to_end(filename)
+            self._evict_locked()
+        return path
+
+    def pin(self, filename):
+        """Protect a cached file from eviction while it is served"""
+        with self._lock:
+            if not (filename in self._index or self._adopt_locked(filename)) or not self._touch_locked(filename):
+                return False
+            self._pins[filename] = self._pins.get(filename, 0) + 1
+            return True
+
+    def unpin(self, filename):
+        with self._lock:
+            count = self._pins.get(filename, 0) - 1
+            if count > 0:
+                self._pins[filename] = count
+            else:
+                self._pins.pop(filename, None)
+            self._evict_locked()
+
+    def mark_pending(self, filename):
+        """Tell every worker that filename is being synthesized"""
+        with open(self.path_for(filename) + '.pending', 'a'):
+            pass
+
+    def clear_pending(self, filename):
+        self._unlink(self.path_for(filename) + '.pending')
+
+    def is_pending(self, filename):
+        """True while a worker is still synthesizing filename"""
+        if not CACHE_FILE_PATTERN.match(filename) or os.path.exists(self.path_for(filename)):
+            return False
+        try:
+            return time.time() - os.path.getmtime(self.path_for(filename) + '.pending') < STALE_PART_SECONDS
+        except OSError:
+            return False
+
+    def _evict_locked(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        for filename in list(self._index):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if filename in self._pins:
+                continue
+            self.total_bytes -= self._index.pop(filename)
+            self.evictions += 1
+            self._unlink(self.path_for(filename))
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass  # Ignore errors during cleanup
+
+    def stats(self):
+        """Return cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._index),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'pinned': len(self._pins),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,130 @@
+import asyncio
+import queue
+import threading
+
+
+class BackgroundLoop:
+    """Long-lived event loop running in a daemon thread.
+
+    Flask runs every async view in a fresh, short-lived event loop, so
+    anything that must outlive a single request (keep-alive connection
+    pools, in-flight task registries) is owned by this loop instead and
+    driven from request code through ``run``/``run_sync``. Under an ASGI
+    server the worker's own loop is attached instead of starting a thread.
+    """
+
+    def __init__(self, name="skillmotion-loop"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """Return the running loop, starting the thread on first use"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._start()
+        return self._loop
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+
+    def attach(self, loop):
+        """Adopt an already running loop (e.g. an ASGI worker's) instead of a thread.
+
+        Returns False if the thread loop was started first; it is kept, since
+        connection pools may already be bound to it.
+        """
+        with self._lock:
+            if self._loop is not None:
+                return self._loop is loop
+            self._loop = loop
+        return True
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop and return a concurrent future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def run(self, coro):
+        """Await a coroutine on the loop from any other event loop"""
+        if self._in_loop():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def run_sync(self, coro, timeout=None):
+        """Run a coroutine on the loop and block the calling thread for the result"""
+        if self._in_loop():
+            coro.close()
+            raise RuntimeError("run_sync called from the background loop's own thread")
+        return self.submit(coro).result(timeout)
+
+    def iterate_sync(self, agen, timeout=None):
+        """Drive an async generator on the loop and yield its items in this thread.
+
+        Closing the returned generator (e.g. a client disconnecting from a
+        streamed response) cancels the producer on the loop.
+        """
+        items = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    items.put(('item', item))
+                items.put(('done', None))
+            except Exception as e:
+                items.put(('error', e))
+            finally:
+                await agen.aclose()
+
+        future = self.submit(pump())
+        try:
+            while True:
+                kind, value = items.get(timeout=timeout)
+                if kind == 'item':
+                    yield value
+                elif kind == 'error':
+                    raise value
+                else:
+                    return
+        finally:
+            future.cancel()
+
+    def _in_loop(self):
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def stop(self):
+        """Stop the loop and wait for its thread to exit"""
+        if self._loop is None:
+            return
+        if self._thread is None:
+            # An attached loop belongs to its server
+            self._loop = None
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+
+
+_background_loop = BackgroundLoop()
+
+
+def get_background_loop():
+    """Return the process-wide background loop"""
+    return _background_loop
@@ -0,0 +1,149 @@
+import os
+import json
+import asyncio
+
+from prompt_budget import estimate_tokens
+
+# Record fields set by the analyzer; LLM output may not override them
+RESERVED_KEYS = ('id', 'type', 'file', 'status', 'error')
+
+
+def parse_json_array(text):
+    """Parse the first JSON array in an LLM response, tolerating code fences and prose"""
+    start = text.find('[')
+    end = text.rfind(']')
+    if start == -1 or end <= start:
+        raise ValueError("No JSON array in response")
+    return json.loads(text[start:end + 1])
+
+
+class BatchAnalyzer:
+    """Screen many resumes against one job role.
+
+    PDFs are parsed in parallel through the extraction process pool and
+    each resume is packed to its most role-relevant sections. As they
+    finish, they are grouped to fit the prompt token budget, and each group
+    is screened with a single LLM request. Records are yielded as soon as
+    their group completes, followed by a progress record.
+    """
+
+    def __init__(self, resume_parser, llm_query, config, prompt_budget, prompt_tokens=None,
+                 resume_tokens=None, max_per_request=None, concurrency=None):
+        self.resume_parser = resume_parser
+        self.llm_query = llm_query
+        self.config = config
+        self.prompt_budget = prompt_budget
+        self.prompt_tokens = prompt_tokens or int(os.getenv('BATCH_PROMPT_TOKENS', '6000'))
+        self.resume_tokens = resume_tokens or int(os.getenv('BATCH_RESUME_TOKENS', '1500'))
+        self.max_per_request = max_per_request or int(os.getenv('BATCH_MAX_RESUMES', '5'))
+        self.concurrency = concurrency or int(os.getenv('BATCH_LLM_CONCURRENCY', '4'))
+
+    async def run(self, documents, job_role, required_skills):
+        """Yield result and progress records for a list of (name, pdf_bytes) documents"""
+        total = len(documents)
+        records = asyncio.Queue()
+        producer = asyncio.ensure_future(self._produce(documents, job_role, required_skills, records))
+
+        completed = 0
+        try:
+            while completed < total:
+                record = await records.get()
+                if record is None:
+                    break
+                completed += 1
+                yield {**record, 'type': 'result'}
+                yield {'type': 'progress', 'completed': completed, 'total': total}
+            await producer
+        finally:
+            producer.cancel()
+
+    async def _produce(self, documents, job_role, required_skills, records):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        screenings = []
+        group, group_tokens = [], 0
+
+        def flush():
+            nonlocal group, group_tokens
+            if group:
+                screenings.append(asyncio.ensure_future(
+                    self._screen_group(group, job_role, required_skills, semaphore, records)
+                ))
+            group, group_tokens = [], 0
+
+        try:
+            parses = [self._parse(index, name, data, job_role) for index, (name, data) in enumerate(documents)]
+            for parsed in asyncio.as_completed(parses):
+                entry = await parsed
+                if 'error' in entry:
+                    await records.put({'file': entry['file'], 'status': 'error', 'error': entry['error']})
+                    continue
+
+                size = entry['tokens']
+                if group and (group_tokens + size > self.prompt_tokens or len(group) >= self.max_per_request):
+                    flush()
+                group.append(entry)
+                group_tokens += size
+            flush()
+            await asyncio.gather(*screenings)
+        finally:
+            for screening in screenings:
+                screening.cancel()
+            await records.put(None)
+
+    async def _parse(self, index, name, data, job_role):
+        try:
+            self.resume_parser.validate_bytes(data)
+            text = await self.resume_parser.extract_text_async(data)
+            if not text:
+                raise ValueError("No text could be extracted")
+            # Section scan and relevance scoring are CPU work; keep them off the event loop
+            text, tokens = await asyncio.to_thread(self._pack, text, job_role)
+            return {'id': f"R{index + 1}", 'file': name, 'text': text, 'tokens': tokens}
+        except Exception as e:
+            return {'file': name, 'error': str(e)}
+
+    def _pack(self, text, job_role):
+        text = self.prompt_budget.pack_resume(text, job_role, self.resume_tokens)
+        return text, estimate_tokens(text)
+
+    async def _screen_group(self, group, job_role, required_skills, semaphore, records):
+        """Screen a packed group with one request, retrying resumes individually on bad output"""
+        async with semaphore:
+            try:
+                results = await self._screen(group, job_role, required_skills)
+            except Exception as e:
+                if len(group) == 1:
+                    await records.put({'file': group[0]['file'], 'status': 'error', 'error': str(e)})
+                    return
+                print(f"Batch screening of {len(group)} resumes failed, retrying individually: {e}")
+                results = None
+
+        if results is None:
+            await asyncio.gather(*[
+                self._screen_group([entry], job_role, required_skills, semaphore, records)
+                for entry in group
+            ])
+            return
+
+        for entry in group:
+            await records.put(dict(results[entry['id']], file=entry['file'], status='ok'))
+
+    async def _screen(self, group, job_role, required_skills):
+        resumes = "\n\n".join(f"### Resume {entry['id']}\n{entry['text']}" for entry in group)
+        prompt = self.config['prompts']['batch_screening'].format(
+            job_role=job_role,
+            required_skills=', '.join(required_skills),
+            resumes=resumes
+        )
+        response = await self.llm_query.query_llm(
+            prompt, max_tokens=400 * len(group), temperature=0.2, endpoint='batch_screening'
+        )
+
+        results = {}
+        for item in parse_json_array(response):
+            if isinstance(item, dict) and item.get('id'):
+                results[str(item['id'])] = {key: value for key, value in item.items() if key not in RESERVED_KEYS}
+        missing = [entry['id'] for entry in group if entry['id'] not in results]
+        if missing:
+            raise ValueError(f"Response is missing resumes {', '.join(missing)}")
+        return results
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+
+class SQLiteStore:
+    """JSON key-value table in SQLite with TTL and LRU eviction by count and bytes.
+
+    A single connection is shared between threads behind a lock; the
+    database runs in WAL mode so readers in other processes are not blocked.
+    A hit only writes its access time back once it is touch_interval
+    seconds stale, so reads stay reads and the LRU order is approximate.
+    """
+
+    def __init__(self, path, table='entries', ttl=None, max_entries=None, max_bytes=None, touch_interval=None):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval if touch_interval is not None else \
+            float(os.getenv('CACHE_TOUCH_INTERVAL', '60'))
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            self._conn.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)'
+            )
+            # Tables created before the byte cap have no size column yet
+            columns = [row[1] for row in self._conn.execute(f'PRAGMA table_info({self.table})')]
+            if 'size' not in columns:
+                self._conn.execute(f'ALTER TABLE {self.table} ADD COLUMN size INTEGER NOT NULL DEFAULT 0')
+                self._conn.execute(f'UPDATE {self.table} SET size = LENGTH(CAST(value AS BLOB))')
+            self._conn.commit()
+
+    def get(self, key):
+        """Return the stored value, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT value, created_at, accessed_at FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at, accessed_at = row
+            if self.ttl and now - created_at > self.ttl:
+                self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+            if now - accessed_at >= self.touch_interval:
+                self._conn.execute(
+                    f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key)
+                )
+                self._conn.commit()
+        return json.loads(value)
+
+    def set(self, key, value):
+        """Store a JSON-serializable value and evict the least recently used overflow"""
+        now = time.time()
+        text = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at, size) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, text, now, now, len(text.encode('utf-8')))
+            )
+            if self.max_entries:
+                self._conn.execute(
+                    f'DELETE FROM {self.table} WHERE key IN ('
+                    f'SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                    (self.max_entries,)
+                )
+            if self.max_bytes:
+                self._evict_bytes()
+            self._conn.commit()
+
+    def _evict_bytes(self):
+        """Delete least recently used entries until the values fit max_bytes"""
+        excess = self._conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {self.table}').fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        doomed = []
+        for key, size in self._conn.execute(f'SELECT key, size FROM {self.table} ORDER BY accessed_at'):
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+        self._conn.executemany(f'DELETE FROM {self.table} WHERE key = ?', doomed)
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+            self._conn.commit()
+
+    def purge_expired(self):
+        """Delete every expired entry and return how many were removed"""
+        if not self.ttl:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                f'DELETE FROM {self.table} WHERE created_at < ?', (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResumeCache:
+    """Parsed resume text and extracted skills keyed by SHA-256 of the PDF bytes and extraction variant"""
+
+    def __init__(self, path=None, ttl=None, max_entries=None, max_bytes=None):
+        self.store = SQLiteStore(
+            path or os.getenv('RESUME_CACHE_PATH', 'cache/resume_cache.db'),
+            table='resumes',
+            ttl=ttl or float(os.getenv('RESUME_CACHE_TTL', str(7 * 24 * 3600))),
+            max_entries=max_entries or int(os.getenv('RESUME_CACHE_MAX_ENTRIES', '1000')),
+            max_bytes=max_bytes or int(os.getenv('RESUME_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(data):
+        """Return the cache key for uploaded file bytes"""
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, digest, variant=''):
+        """Return the cached entry for a digest and extraction variant, or None"""
+        entry = self.store.get(self._key(digest, variant))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, digest, resume_text, extracted_skills, structured_skills=None, variant=''):
+        self.store.set(self._key(digest, variant), {
+            'resume_text': resume_text,
+            'extracted_skills': extracted_skills,
+            'structured_skills': structured_skills
+        })
+
+    @staticmethod
+    def _key(digest, variant):
+        return f"{digest}:{variant}" if variant else digest
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.store),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,156 @@
+import os
+import asyncio
+import threading
+
+from background_loop import get_background_loop
+from prompt_budget import estimate_tokens, fit_text
+
+
+class ChatEngine:
+    """Multi-turn chat with rolling memory kept in the session store.
+
+    Recent turns are replayed verbatim. Once they exceed summary_trigger
+    estimated tokens, the oldest are folded into a running summary by a
+    background LLM call, keeping about recent_tokens of turns verbatim, so
+    the prompt stays roughly constant in size however long the conversation
+    gets. Until a compaction lands, only the most recent turns that fit the
+    trigger are replayed.
+    """
+
+    def __init__(self, llm_query, session_store, config, background_loop=None, recent_tokens=None,
+                 summary_trigger=None, summary_tokens=None):
+        self.llm_query = llm_query
+        self.session_store = session_store
+        self.config = config
+        self.background_loop = background_loop or get_background_loop()
+        self.recent_tokens = recent_tokens or int(os.getenv('CHAT_RECENT_TOKENS', '800'))
+        self.summary_trigger = summary_trigger or int(os.getenv('CHAT_SUMMARY_TRIGGER', '1600'))
+        self.summary_tokens = summary_tokens or int(os.getenv('CHAT_SUMMARY_TOKENS', '300'))
+        # Serializes read-modify-write of chat memory between turns and compactions
+        self._lock = threading.Lock()
+        self._compacting = set()
+        self.compactions = 0
+        self.compaction_failures = 0
+
+    @staticmethod
+    def _memory(session):
+        # Shared with the store's copy of the session: read it, never change it in place
+        return session.get('chat') or {'summary': '', 'turns': [], 'next_index': 0}
+
+    def prepare(self, session_id, message, context=''):
+        """Return (session_id, prompt) for a new user message, starting a session if needed"""
+        session = self.session_store.get(session_id) if session_id else None
+        if session is None:
+            session_id = self.session_store.create()
+            session = {}
+        return session_id, self.build_prompt(self._memory(session), message, context)
+
+    def build_prompt(self, memory, message, context=''):
+        history = []
+        if memory['summary']:
+            history.append(f"Conversation summary: {memory['summary']}")
+
+        # Newest turns that fit the trigger budget, in order
+        recent, used = [], 0
+        for turn in reversed(memory['turns']):
+            used += estimate_tokens(turn['content'])
+            if recent and used > self.summary_trigger:
+                break
+            recent.append(turn)
+        # Start at a user turn, not halfway through an exchange
+        if len(recent) > 1 and recent[-1]['role'] != 'user':
+            recent.pop()
+        if recent:
+            history.append("Recent messages:\n" + self._render(reversed(recent)))
+
+        return self.config['prompts']['chat'].format(
+            context=context or 'None',
+            history="\n\n".join(history) or 'None',
+            message=message
+        )
+
+    @staticmethod
+    def _render(turns):
+        return "\n".join(
+            f"{'User' if turn['role'] == 'user' else 'Assistant'}: {turn['content']}" for turn in turns
+        )
+
+    def record(self, session_id, message, response):
+        """Append a finished exchange and schedule compaction if memory grew past the trigger"""
+        with self._lock:
+            session = self.session_store.get(session_id)
+            if session is None:
+                return
+            memory = self._memory(session)
+            turns, next_index = list(memory['turns']), memory['next_index']
+            for role, content in (('user', message), ('assistant', response)):
+                # No single message may take the whole replay window
+                content = fit_text(content, self.summary_trigger // 2)
+                turns.append({'index': next_index, 'role': role, 'content': content})
+                next_index += 1
+            memory = dict(memory, turns=turns, next_index=next_index)
+            self.session_store.update(session_id, chat=memory)
+
+            turn_tokens = sum(estimate_tokens(turn['content']) for turn in memory['turns'])
+            if turn_tokens <= self.summary_trigger or session_id in self._compacting:
+                return
+            self._compacting.add(session_id)
+
+        self.background_loop.submit(self._compact(session_id))
+
+    async def _compact(self, session_id):
+        try:
+            session = await asyncio.to_thread(self.session_store.get, session_id)
+            if session is None:
+                return
+            memory = self._memory(session)
+
+            # Keep the newest whole exchanges within recent_tokens (at least one) verbatim
+            keep, used = 0, 0
+            for turn in reversed(memory['turns']):
+                used += estimate_tokens(turn['content'])
+                if keep >= 2 and keep % 2 == 0 and used > self.recent_tokens:
+                    break
+                keep += 1
+            old_turns = memory['turns'][:len(memory['turns']) - keep]
+            if not old_turns:
+                return
+
+            prompt = self.config['prompts']['conversation_summary'].format(
+                summary=memory['summary'] or 'None',
+                messages=self._render(old_turns),
+                max_words=int(self.summary_tokens * 0.75)
+            )
+            summary = await self.llm_query.query_llm(
+                prompt, max_tokens=self.summary_tokens, temperature=0.3, endpoint='chat_summary'
+            )
+
+            await asyncio.to_thread(self._apply_summary, session_id, old_turns[-1]['index'], summary.strip())
+        except Exception as e:
+            print(f"Chat summarization failed for session {session_id}: {e}")
+            self.compaction_failures += 1
+        finally:
+            with self._lock:
+                self._compacting.discard(session_id)
+
+    def _apply_summary(self, session_id, cutoff, summary):
+        # Turns may have been added meanwhile; drop only the ones summarized
+        with self._lock:
+            session = self.session_store.get(session_id)
+            if session is None:
+                return
+            memory = self._memory(session)
+            self.session_store.update(session_id, chat=dict(
+                memory,
+                turns=[turn for turn in memory['turns'] if turn['index'] > cutoff],
+                summary=summary
+            ))
+            self.compactions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'compacting': len(self._compacting),
+                'compactions': self.compactions,
+                'compaction_failures': self.compaction_failures
+            }
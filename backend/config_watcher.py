@@ -0,0 +1,74 @@
+import os
+import json
+import threading
+
+
+def load_config(path):
+    """Load the JSON configuration file"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class ConfigWatcher:
+    """Reload a JSON config file in place when it changes on disk.
+
+    The shared config dict is updated rather than replaced so modules
+    holding a reference see the new values. Listeners are called with the
+    config after every successful reload.
+    """
+
+    def __init__(self, path, config, poll_interval=None):
+        self.path = path
+        self.config = config
+        self.poll_interval = poll_interval or float(os.getenv('CONFIG_POLL_INTERVAL', '2'))
+        self.listeners = []
+        self._mtime = self._current_mtime()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def start(self):
+        """Start polling the config file from a daemon thread"""
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._watch, name='ConfigWatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            mtime = self._current_mtime()
+            if mtime is not None and mtime != self._mtime:
+                self._mtime = mtime
+                self.reload()
+
+    def reload(self):
+        """Re-read the file and notify listeners; keep the old config on errors"""
+        try:
+            new_config = load_config(self.path)
+        except Exception as e:
+            print(f"Config reload failed: {e}")
+            return False
+
+        for key in list(self.config):
+            if key not in new_config:
+                del self.config[key]
+        self.config.update(new_config)
+        print(f"🔄 Reloaded configuration from {self.path}")
+
+        for callback in self.listeners:
+            try:
+                callback(self.config)
+            except Exception as e:
+                print(f"Config listener error: {e}")
+        return True
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Fake OpenAI-compatible chat completion server.
+
+Serves ``POST .../chat/completions`` for both the Groq (``/openai/v1``) and
+OpenAI (``/v1``) path layouts with configurable latency and token rate, so
+the LLM layer can be exercised and benchmarked without network access:
+
+    python fake_llm_server.py --port 8090 --latency 0.5
+    GROQ_API_KEY=fake GROQ_BASE_URL=http://127.0.0.1:8090 python app.py
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "skill gap analysis learning plan python sql communication leadership "
+    "project roadmap testing cloud data career growth mentoring practice"
+).split()
+
+
+class FakeLLMState:
+    """Server-wide behaviour settings and request counters"""
+
+    def __init__(self, latency=0.2, tokens_per_second=0, reply_tokens=64, error_rate=0.0,
+                 slow_rate=0.0, slow_latency=5.0, max_concurrency=0):
+        self.latency = latency
+        self.max_concurrency = max_concurrency
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.tokens_per_second = tokens_per_second
+        self.reply_tokens = reply_tokens
+        self.error_rate = error_rate
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        """Count a request; False if it is over the concurrency limit"""
+        with self._lock:
+            self.requests += 1
+            if self.max_concurrency and self.in_flight >= self.max_concurrency:
+                self.rate_limited += 1
+                return False
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'rate_limited': self.rate_limited,
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight
+            }
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.rate_limited = 0
+            self.max_in_flight = self.in_flight
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send_json(200, self.state.stats())
+        else:
+            self._send_json(404, {'error': {'message': 'Not found'}})
+
+    def do_DELETE(self):
+        if self.path.rstrip('/') == '/stats':
+            self.state.reset()
+            self._send_json(200, self.state.stats())
+        else:
+            self._send_json(404, {'error': {'message': 'Not found'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Not found'}})
+            return
+
+        if not self.state.enter():
+            # Like a provider's rate limit: refuse at once and ask for a retry
+            self._send_json(429, {'error': {'message': 'Rate limit exceeded'}}, {'Retry-After': '1'})
+            return
+        try:
+            latency = float(self.headers.get('X-Fake-Latency', self.state.latency))
+            if self.state.slow_rate and random.random() < self.state.slow_rate:
+                # Tail latency: a slow-but-alive upstream
+                latency = self.state.slow_latency
+            time.sleep(latency)
+
+            if self.state.error_rate and random.random() < self.state.error_rate:
+                self._send_json(500, {'error': {'message': 'Injected failure'}})
+                return
+
+            tokens = self._reply_tokens(body)
+            if body.get('stream'):
+                self._send_stream(body, tokens)
+            else:
+                self._pace(len(tokens))
+                self._send_json(200, self._completion(body, ''.join(tokens)))
+        finally:
+            self.state.leave()
+
+    def _reply_tokens(self, body):
+        count = min(int(body.get('max_tokens') or self.state.reply_tokens), self.state.reply_tokens)
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        rng = random.Random(prompt)
+        return [(' ' if i else '') + rng.choice(WORDS) for i in range(count)]
+
+    def _pace(self, token_count):
+        if self.state.tokens_per_second:
+            time.sleep(token_count / self.state.tokens_per_second)
+
+    def _completion(self, body, text):
+        return {
+            'id': f"chatcmpl-{uuid.uuid4().hex}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': text},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+        }
+
+    def _send_stream(self, body, tokens):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+        for i, token in enumerate(tokens + [None]):
+            delta = {'content': token} if token is not None else {}
+            if i == 0:
+                delta['role'] = 'assistant'
+            event = {
+                'id': chunk_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': body.get('model', 'fake'),
+                'choices': [{
+                    'index': 0,
+                    'delta': delta,
+                    'finish_reason': None if token is not None else 'stop'
+                }]
+            }
+            self._write_chunk(f"data: {json.dumps(event)}\n\n")
+            if token is not None:
+                self._pace(1)
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, **behaviour):
+        super().__init__((host, port), FakeLLMHandler)
+        self.state = FakeLLMState(**behaviour)
+
+    def handle_error(self, request, client_address):
+        # Clients that give up (timeouts, cancelled hedges) are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a daemon thread and return self"""
+        thread = threading.Thread(target=self.serve_forever, name='FakeLLMServer', daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument('--tokens-per-second', type=float, default=0, help="Token rate (0 = instant)")
+    parser.add_argument('--reply-tokens', type=int, default=64, help="Tokens per reply")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument('--slow-rate', type=float, default=0.0, help="Fraction of requests that take --slow-latency")
+    parser.add_argument('--slow-latency', type=float, default=5.0, help="Seconds before the first token of a slow request")
+    parser.add_argument('--max-concurrency', type=int, default=0, help="Answer 429 beyond this many requests (0 = no limit)")
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        args.host, args.port,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        reply_tokens=args.reply_tokens,
+        error_rate=args.error_rate,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        max_concurrency=args.max_concurrency
+    )
+    print(f"🤖 Fake LLM server running at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Offline stand-in for edge-tts.
+
+Mirrors the parts of the edge-tts API the backend uses (``Communicate``
+and ``list_voices``) and writes silent MP3 audio after a configurable
+delay, so TTS-heavy routes can be load-tested without network access:
+
+    TTS_BACKEND=fake FAKE_TTS_LATENCY=0.3 python app.py
+
+``FAKE_TTS_LATENCY`` is the fixed delay before audio is ready (seconds) and
+``FAKE_TTS_CHARS_PER_SECOND`` the synthesis speed on top of it (0 = instant).
+"""
+
+import os
+import asyncio
+
+# One silent MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, mono, about 26 ms
+SILENT_FRAME = b'\xff\xfb\x90\xc4' + bytes(413)
+FRAME_SECONDS = 1152 / 44100
+
+# Speaking rate used to size the audio, in characters per second
+SPOKEN_CHARS_PER_SECOND = 15
+
+VOICES = [
+    {'Name': 'Microsoft Server Speech Text to Speech Voice (en-US, AriaNeural)',
+     'ShortName': 'en-US-AriaNeural', 'Gender': 'Female', 'Locale': 'en-US'},
+    {'Name': 'Microsoft Server Speech Text to Speech Voice (en-US, JennyNeural)',
+     'ShortName': 'en-US-JennyNeural', 'Gender': 'Female', 'Locale': 'en-US'},
+    {'Name': 'Microsoft Server Speech Text to Speech Voice (en-US, GuyNeural)',
+     'ShortName': 'en-US-GuyNeural', 'Gender': 'Male', 'Locale': 'en-US'}
+]
+
+
+class Communicate:
+    """Same constructor and ``save`` coroutine as edge_tts.Communicate"""
+
+    def __init__(self, text, voice=None, rate='+0%', volume='+0%', latency=None, chars_per_second=None):
+        self.text = text
+        self.voice = voice
+        self.rate = rate
+        self.volume = volume
+        self.latency = latency if latency is not None else float(os.getenv('FAKE_TTS_LATENCY', '0.2'))
+        self.chars_per_second = chars_per_second if chars_per_second is not None else \
+            float(os.getenv('FAKE_TTS_CHARS_PER_SECOND', '0'))
+
+    async def save(self, path):
+        delay = self.latency
+        if self.chars_per_second:
+            delay += len(self.text) / self.chars_per_second
+        await asyncio.sleep(delay)
+
+        frames = max(1, int(len(self.text) / SPOKEN_CHARS_PER_SECOND / FRAME_SECONDS))
+        with open(path, 'wb') as f:
+            f.write(SILENT_FRAME * frames)
+
+
+async def list_voices():
+    return [dict(voice) for voice in VOICES]
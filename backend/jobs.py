@@ -0,0 +1,601 @@
+import os
+import hmac
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import asyncio
+import hashlib
+import threading
+import ipaddress
+from urllib.parse import urlparse
+
+import httpx
+
+from admission import UpstreamBusy
+from metrics import get_metrics
+
+FINISHED = ('completed', 'failed', 'cancelled')
+
+
+def validate_callback_url(url):
+    """Check a webhook URL and return the address to deliver it to.
+
+    The host must resolve to public addresses only, so a client cannot aim
+    the server at loopback, private, link-local or cloud metadata
+    endpoints; JOB_WEBHOOK_ALLOW_PRIVATE=1 lifts this for local setups.
+    JOB_WEBHOOK_HOSTS (comma-separated) further restricts the hostnames.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        raise ValueError("callback_url must be an http(s) URL")
+    allowed = [host.strip() for host in os.getenv('JOB_WEBHOOK_HOSTS', '').split(',') if host.strip()]
+    if allowed and parsed.hostname not in allowed:
+        raise ValueError(f"callback_url host {parsed.hostname} is not allowed")
+
+    try:
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        infos = socket.getaddrinfo(parsed.hostname, port, type=socket.SOCK_STREAM)
+    except (OSError, ValueError):
+        raise ValueError(f"callback_url host {parsed.hostname} cannot be resolved")
+    addresses = [ipaddress.ip_address(info[4][0]) for info in infos]
+    if os.getenv('JOB_WEBHOOK_ALLOW_PRIVATE', '0') != '1':
+        if any(not address.is_global or address.is_multicast for address in addresses):
+            raise ValueError(f"callback_url host {parsed.hostname} resolves to a non-public address")
+    return str(addresses[0])
+
+
+def pinned_request(url, address):
+    """Return (url, headers, extensions) that send a request for url to a checked address"""
+    parsed = urlparse(url)
+    host = f"[{address}]" if ':' in address else address
+    port = f":{parsed.port}" if parsed.port else ''
+    target = parsed._replace(netloc=f"{host}{port}").geturl()
+    hostname = f"[{parsed.hostname}]" if ':' in parsed.hostname else parsed.hostname
+    # TLS still verifies the certificate against the hostname
+    extensions = {'sni_hostname': parsed.hostname} if parsed.scheme == 'https' else {}
+    return target, {'Host': f"{hostname}{port}"}, extensions
+
+
+class JobStore:
+    """Jobs and their partial results in SQLite, shared by every worker process.
+
+    A worker claims a queued job by taking a lease on it and renews the
+    lease while the job runs. A job whose lease runs out (its process died
+    or was restarted) is claimed again, up to max_attempts times. Jobs can
+    carry input files, kept until they finish, and an append-only list of
+    output records that readers in any process can follow.
+    """
+
+    def __init__(self, path=None, ttl=None, max_attempts=None):
+        self.path = path or os.getenv('JOB_STORE_PATH', 'cache/jobs.db')
+        self.ttl = ttl or float(os.getenv('JOB_TTL', str(7 * 24 * 3600)))
+        self.max_attempts = max_attempts or int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, payload TEXT NOT NULL, '
+                'result TEXT NOT NULL, stages TEXT NOT NULL, error TEXT, '
+                'callback_url TEXT, callback_status TEXT, attempts INTEGER NOT NULL DEFAULT 0, '
+                'owner TEXT, lease_expires REAL, run_after REAL NOT NULL, '
+                'created_at REAL NOT NULL, started_at REAL, finished_at REAL, updated_at REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, run_after)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS job_files ('
+                'job_id TEXT NOT NULL, position INTEGER NOT NULL, name TEXT NOT NULL, data BLOB NOT NULL, '
+                'PRIMARY KEY (job_id, position))'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS job_records ('
+                'job_id TEXT NOT NULL, seq INTEGER NOT NULL, record TEXT NOT NULL, PRIMARY KEY (job_id, seq))'
+            )
+            self._conn.commit()
+
+    def submit(self, kind, payload, callback_url=None, files=None, result=None):
+        """Queue a job with optional (name, bytes) input files and initial result; return it"""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            try:
+                self._conn.execute(
+                    'INSERT INTO jobs (job_id, kind, status, payload, result, stages, callback_url, callback_status, '
+                    'run_after, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (job_id, kind, 'queued', json.dumps(payload), json.dumps(result or {}), '[]', callback_url,
+                     'pending' if callback_url else None, now, now, now)
+                )
+                self._conn.executemany(
+                    'INSERT INTO job_files (job_id, position, name, data) VALUES (?, ?, ?, ?)',
+                    [(job_id, position, name, data) for position, (name, data) in enumerate(files or [])]
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return self.get(job_id)
+
+    def files(self, job_id):
+        """Return a job's input files as (name, bytes) in submission order"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT name, data FROM job_files WHERE job_id = ? ORDER BY position', (job_id,)
+            ).fetchall()
+        return [(row['name'], bytes(row['data'])) for row in rows]
+
+    def records(self, job_id, after=0):
+        """Return (seq, JSON text) output records after seq"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT seq, record FROM job_records WHERE job_id = ? AND seq > ? ORDER BY seq', (job_id, after)
+            ).fetchall()
+        return [(row['seq'], row['record']) for row in rows]
+
+    def follow(self, job_id, poll_interval=0.25):
+        """Yield a job's records as JSON lines from the start, polling until it finishes"""
+        position = 0
+        while True:
+            # Status first: once it reads finished, every record is already written
+            job = self.get(job_id)
+            for seq, record in self.records(job_id, position):
+                position = seq
+                yield record + "\n"
+            if job is None or job['status'] in FINISHED:
+                return
+            time.sleep(poll_interval)
+
+    def get(self, job_id, payload=False):
+        """Return a job as a dict (with its payload if asked), or None"""
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return self._to_dict(row, payload) if row else None
+
+    def claim(self, owner, lease):
+        """Take the oldest runnable job (queued, or with an expired lease) and return it, or None"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                while True:
+                    row = self._conn.execute(
+                        "SELECT * FROM jobs WHERE (status = 'queued' AND run_after <= ?) "
+                        "OR (status = 'running' AND lease_expires < ?) ORDER BY run_after LIMIT 1",
+                        (now, now)
+                    ).fetchone()
+                    if row is None:
+                        self._conn.commit()
+                        return None
+                    if row['attempts'] >= self.max_attempts:
+                        self._conn.execute(
+                            "UPDATE jobs SET status = 'failed', error = ?, owner = NULL, finished_at = ?, "
+                            "updated_at = ? WHERE job_id = ?",
+                            (f"Abandoned after {row['attempts']} attempts", now, now, row['job_id'])
+                        )
+                        continue
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                        "started_at = COALESCE(started_at, ?), updated_at = ? WHERE job_id = ?",
+                        (owner, now + lease, now, now, row['job_id'])
+                    )
+                    self._conn.commit()
+                    break
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return self.get(row['job_id'], payload=True)
+
+    def record_stage(self, job_id, owner, stage, values, lease):
+        """Merge a finished stage's output into the partial result; False if the job is no longer ours"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    "SELECT result, stages FROM jobs WHERE job_id = ? AND owner = ? AND status = 'running'",
+                    (job_id, owner)
+                ).fetchone()
+                if row is None:
+                    self._conn.commit()
+                    return False
+                result = dict(json.loads(row['result']), **values)
+                stages = json.loads(row['stages']) + [stage]
+                self._conn.execute(
+                    'UPDATE jobs SET result = ?, stages = ?, lease_expires = ?, updated_at = ? WHERE job_id = ?',
+                    (json.dumps(result), json.dumps(stages), now + lease, now, job_id)
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return True
+
+    def append_records(self, job_id, owner, records, values, lease):
+        """Append output records and merge values into the result; False if the job is no longer ours"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    "SELECT result FROM jobs WHERE job_id = ? AND owner = ? AND status = 'running'", (job_id, owner)
+                ).fetchone()
+                if row is None:
+                    self._conn.commit()
+                    return False
+                last = self._conn.execute(
+                    'SELECT COALESCE(MAX(seq), 0) FROM job_records WHERE job_id = ?', (job_id,)
+                ).fetchone()[0]
+                self._conn.executemany(
+                    'INSERT INTO job_records (job_id, seq, record) VALUES (?, ?, ?)',
+                    [(job_id, last + offset, json.dumps(record)) for offset, record in enumerate(records, 1)]
+                )
+                result = dict(json.loads(row['result']), **values)
+                self._conn.execute(
+                    'UPDATE jobs SET result = ?, lease_expires = ?, updated_at = ? WHERE job_id = ?',
+                    (json.dumps(result), now + lease, now, job_id)
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return True
+
+    def renew(self, job_id, owner, lease):
+        """Extend a running job's lease; False if it was cancelled or claimed by someone else"""
+        return self._update(
+            "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND owner = ? AND status = 'running'",
+            (time.time() + lease, job_id, owner)
+        )
+
+    def finish(self, job_id, owner, status, values=None, error=None):
+        """Mark an owned job completed or failed, merging in its final values; return it or None"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    "SELECT result FROM jobs WHERE job_id = ? AND owner = ? AND status = 'running'", (job_id, owner)
+                ).fetchone()
+                if row is None:
+                    self._conn.commit()
+                    return None
+                result = dict(json.loads(row['result']), **(values or {}))
+                self._conn.execute(
+                    'UPDATE jobs SET status = ?, result = ?, error = ?, owner = NULL, lease_expires = NULL, '
+                    'finished_at = ?, updated_at = ? WHERE job_id = ?',
+                    (status, json.dumps(result), error, now, now, job_id)
+                )
+                self._conn.execute('DELETE FROM job_files WHERE job_id = ?', (job_id,))
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return self.get(job_id)
+
+    def requeue(self, job_id, owner, delay=0, error=None, count_attempt=True):
+        """Put an owned running job back in the queue, to run again after delay seconds"""
+        now = time.time()
+        return self._update(
+            "UPDATE jobs SET status = 'queued', owner = NULL, lease_expires = NULL, run_after = ?, error = ?, "
+            "attempts = attempts - ?, updated_at = ? WHERE job_id = ? AND owner = ? AND status = 'running'",
+            (now + delay, error, 0 if count_attempt else 1, now, job_id, owner)
+        )
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; return True if it was not finished yet"""
+        now = time.time()
+        cancelled = self._update(
+            "UPDATE jobs SET status = 'cancelled', owner = NULL, lease_expires = NULL, finished_at = ?, "
+            "updated_at = ? WHERE job_id = ? AND status IN ('queued', 'running')",
+            (now, now, job_id)
+        )
+        if cancelled:
+            self._update('DELETE FROM job_files WHERE job_id = ?', (job_id,))
+        return cancelled
+
+    def set_callback_status(self, job_id, status):
+        self._update('UPDATE jobs SET callback_status = ? WHERE job_id = ?', (status, job_id))
+
+    def count(self, status):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM jobs WHERE status = ?', (status,)).fetchone()[0]
+
+    def counts(self):
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self._conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        return {status: 0 for status in ('queued', 'running') + FINISHED} | {row[0]: row[1] for row in rows}
+
+    def purge_finished(self):
+        """Delete jobs that finished more than ttl seconds ago and return how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('completed', 'failed', 'cancelled') AND finished_at < ?",
+                (time.time() - self.ttl,)
+            )
+            if cursor.rowcount:
+                for table in ('job_files', 'job_records'):
+                    self._conn.execute(f'DELETE FROM {table} WHERE job_id NOT IN (SELECT job_id FROM jobs)')
+            self._conn.commit()
+            return cursor.rowcount
+
+    def _update(self, sql, params):
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def _to_dict(row, payload=False):
+        job = {
+            'job_id': row['job_id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'stages': json.loads(row['stages']),
+            'result': json.loads(row['result']),
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'callback_url': row['callback_url'],
+            'callback_status': row['callback_status'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at']
+        }
+        if payload:
+            job['payload'] = json.loads(row['payload'])
+        return job
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobContext:
+    """What a job handler sees: its payload, the stages an earlier attempt finished, and record()"""
+
+    def __init__(self, queue, job):
+        self.queue = queue
+        self.job_id = job['job_id']
+        self.kind = job['kind']
+        self.payload = job['payload']
+        self.result = job['result']
+        self.stages = job['stages']
+        self.task = asyncio.current_task()
+
+    def done(self, stage):
+        return stage in self.stages
+
+    async def files(self):
+        return await self.queue.call(self.queue.store.files, self.job_id)
+
+    async def records(self):
+        """Output records appended so far, including by earlier attempts"""
+        return [json.loads(record) for _, record in await self.queue.call(self.queue.store.records, self.job_id)]
+
+    async def append(self, *records, **values):
+        """Append output records and update result values; cancels the job if it is no longer ours"""
+        self.result.update(values)
+        queue = self.queue
+        if not await queue.call(queue.store.append_records, self.job_id, queue.owner, records, values, queue.lease):
+            self.task.cancel()
+
+    async def record(self, stage, **values):
+        """Publish a finished stage's output; cancels the job if it is no longer ours"""
+        self.result.update(values)
+        self.stages.append(stage)
+        queue = self.queue
+        if not await queue.call(queue.store.record_stage, self.job_id, queue.owner, stage, values, queue.lease):
+            self.task.cancel()
+
+
+class JobQueue:
+    """Worker pool running persistent jobs on the background loop.
+
+    Each process claims up to ``workers`` jobs at a time from the shared
+    store, polling every ``poll_interval`` seconds (at once when a job is
+    submitted here). Handlers are ``async handler(context)`` coroutines
+    that record partial results per stage and return the final values.
+    A job turned away by a busy upstream is retried after its Retry-After;
+    when it finishes, its callback URL (if any) receives the job as JSON.
+    Store calls from the loop run on a worker thread, so SQLite lock waits
+    between processes never stall the requests sharing the loop.
+    """
+
+    def __init__(self, store, background_loop, workers=None, poll_interval=None, lease=None,
+                 webhook_timeout=None, webhook_retries=None, webhook_secret=None):
+        self.store = store
+        self.background_loop = background_loop
+        self.workers = workers or int(os.getenv('JOB_WORKERS', '4'))
+        self.poll_interval = poll_interval or float(os.getenv('JOB_POLL_INTERVAL', '1.0'))
+        self.lease = lease or float(os.getenv('JOB_LEASE', '60'))
+        self.webhook_timeout = webhook_timeout or float(os.getenv('JOB_WEBHOOK_TIMEOUT', '10'))
+        self.webhook_retries = webhook_retries if webhook_retries is not None else \
+            int(os.getenv('JOB_WEBHOOK_RETRIES', '3'))
+        self.webhook_secret = webhook_secret or os.getenv('JOB_WEBHOOK_SECRET', '')
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.handlers = {}
+        self.metrics = get_metrics()
+
+        self._tasks = {}  # job_id -> task, for jobs running in this process
+        self._deliveries = set()
+        self._wakeup = None
+        self._runner = None
+        self._stopping = False
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.webhooks = {'delivered': 0, 'failed': 0}
+
+    def register(self, kind, handler):
+        self.handlers[kind] = handler
+
+    def start(self):
+        """Start claiming jobs, including those left over from before a restart"""
+        if self._runner is None:
+            self._stopping = False
+            self._runner = self.background_loop.submit(self._run())
+
+    def submit(self, kind, payload, callback_url=None, files=None, result=None):
+        """Persist a job and wake the worker pool; return the job"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = self.store.submit(kind, payload, callback_url, files, result)
+        self.background_loop.loop.call_soon_threadsafe(self._wake)
+        return job
+
+    def cancel(self, job_id):
+        """Cancel a job; a running one stops here or at its owner's next lease renewal"""
+        if not self.store.cancel(job_id):
+            return False
+        task = self._tasks.get(job_id)
+        if task is not None:
+            self.background_loop.loop.call_soon_threadsafe(task.cancel)
+        return True
+
+    def pending(self):
+        """Jobs and webhook deliveries running in this process"""
+        return len(self._tasks) + len(self._deliveries)
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def call(self, func, *args, **kwargs):
+        """Run a blocking store call off the event loop"""
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def _run(self):
+        self._wakeup = asyncio.Event()
+        renewed = purged = time.monotonic()
+        while not self._stopping:
+            while len(self._tasks) < self.workers:
+                try:
+                    job = await self.call(self.store.claim, self.owner, self.lease)
+                except sqlite3.Error as e:
+                    print(f"Error claiming a job: {e}")
+                    break
+                if job is None:
+                    break
+                self._tasks[job['job_id']] = asyncio.ensure_future(self._execute(job))
+
+            now = time.monotonic()
+            if now - renewed >= self.lease / 3:
+                renewed = now
+                for job_id, task in list(self._tasks.items()):
+                    if not await self.call(self.store.renew, job_id, self.owner, self.lease):
+                        task.cancel()
+            if now - purged >= 600:
+                purged = now
+                await self.call(self.store.purge_finished)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, job):
+        job_id = job['job_id']
+        context = JobContext(self, job)
+        try:
+            handler = self.handlers.get(job['kind'])
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            with self.metrics.span(f"job.{job['kind']}"):
+                values = await handler(context)
+            finished = await self.call(self.store.finish, job_id, self.owner, 'completed', values)
+            if finished:
+                self.completed += 1
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Shutting down: leave the job (and its finished stages) for the next worker
+                await self.call(self.store.requeue, job_id, self.owner, count_attempt=False)
+                return
+            finished = await self.call(self.store.get, job_id)
+        except Exception as e:
+            busy = UpstreamBusy.find(e)
+            if busy is not None and job['attempts'] < self.store.max_attempts:
+                await self.call(self.store.requeue, job_id, self.owner, busy.retry_after, str(busy))
+                self.retried += 1
+                return
+            print(f"Job {job_id} ({job['kind']}) failed: {e}")
+            finished = await self.call(self.store.finish, job_id, self.owner, 'failed', error=str(e))
+            if finished:
+                self.failed += 1
+        finally:
+            self._tasks.pop(job_id, None)
+            self._wake()
+
+        if finished and finished['callback_url'] and finished['status'] in FINISHED:
+            delivery = asyncio.ensure_future(self._deliver(finished))
+            self._deliveries.add(delivery)
+            delivery.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, job):
+        """POST the finished job to its callback URL, retrying with backoff"""
+        body = json.dumps(job).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'X-Skillmotion-Job': job['job_id']}
+        if self.webhook_secret:
+            signature = hmac.new(self.webhook_secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+            headers['X-Skillmotion-Signature'] = f"sha256={signature}"
+
+        error = None
+        async with httpx.AsyncClient(timeout=self.webhook_timeout) as client:
+            for attempt in range(self.webhook_retries + 1):
+                if attempt:
+                    await asyncio.sleep(2 ** (attempt - 1))
+                # DNS may have changed since submission: check again and connect to the checked address
+                try:
+                    address = await asyncio.to_thread(validate_callback_url, job['callback_url'])
+                except ValueError as e:
+                    error = str(e)
+                    break
+                target, host_header, extensions = pinned_request(job['callback_url'], address)
+                try:
+                    response = await client.post(
+                        target, content=body, headers={**headers, **host_header}, extensions=extensions
+                    )
+                    if response.status_code < 300:
+                        await self.call(self.store.set_callback_status, job['job_id'], 'delivered')
+                        self.webhooks['delivered'] += 1
+                        return
+                    error = f"HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    error = str(e) or type(e).__name__
+        print(f"Webhook for job {job['job_id']} failed: {error}")
+        await self.call(self.store.set_callback_status, job['job_id'], 'failed')
+        self.webhooks['failed'] += 1
+
+    async def stop(self, timeout=0):
+        """Stop claiming, give running jobs up to timeout seconds, then requeue the rest"""
+        self._stopping = True
+        self._wake()
+        deadline = time.monotonic() + timeout
+        while self.pending() and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        tasks = list(self._tasks.values()) + list(self._deliveries)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'running_here': len(self._tasks),
+            'jobs': self.store.counts(),
+            'completed': self.completed,
+            'failed': self.failed,
+            'retried': self.retried,
+            'webhooks': dict(self.webhooks)
+        }
@@ -0,0 +1,116 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from cache_store import SQLiteStore
+
+WHITESPACE = re.compile(r'\s+')
+
+
+class LLMResponseCache:
+    """Prompt-level cache of LLM completions.
+
+    An in-memory LRU tier sits in front of a SQLite tier; both honour the
+    same TTL. Calls above max_temperature are meant to be creative and
+    bypass the cache. Hits, misses and bypasses are counted per endpoint.
+    """
+
+    def __init__(self, path=None, ttl=None, memory_entries=None, disk_entries=None,
+                 max_temperature=None, enabled=None):
+        self.enabled = enabled if enabled is not None else os.getenv('LLM_CACHE', '1') != '0'
+        self.ttl = ttl or float(os.getenv('LLM_CACHE_TTL', str(24 * 3600)))
+        self.memory_entries = memory_entries or int(os.getenv('LLM_CACHE_MEMORY_ENTRIES', '512'))
+        self.max_temperature = (
+            max_temperature if max_temperature is not None
+            else float(os.getenv('LLM_CACHE_MAX_TEMPERATURE', '0.7'))
+        )
+
+        self.disk = None
+        if self.enabled:
+            self.disk = SQLiteStore(
+                path or os.getenv('LLM_CACHE_PATH', 'cache/llm_cache.db'),
+                table='responses',
+                ttl=self.ttl,
+                max_entries=disk_entries or int(os.getenv('LLM_CACHE_MAX_ENTRIES', '10000')),
+                max_bytes=int(os.getenv('LLM_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+            )
+
+        self._memory = OrderedDict()  # key -> (expires_at, text)
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    @staticmethod
+    def normalize_prompt(prompt):
+        """Collapse whitespace so formatting-only differences share an entry"""
+        return WHITESPACE.sub(' ', prompt).strip()
+
+    def make_key(self, provider, model, prompt, max_tokens, temperature):
+        payload = json.dumps([provider, model, self.normalize_prompt(prompt), max_tokens, temperature])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def should_bypass(self, temperature):
+        return not self.enabled or temperature > self.max_temperature
+
+    def _count(self, endpoint, outcome):
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {'hits': 0, 'misses': 0, 'bypassed': 0})
+            counters[outcome] += 1
+
+    def record_bypass(self, endpoint):
+        self._count(endpoint, 'bypassed')
+
+    def lookup(self, keys, endpoint):
+        """Return the first cached completion among keys, or None"""
+        now = time.time()
+        for key in keys:
+            with self._lock:
+                entry = self._memory.get(key)
+                if entry and entry[0] > now:
+                    self._memory.move_to_end(key)
+                    text = entry[1]
+                else:
+                    text = None
+                    if entry:
+                        del self._memory[key]
+            if text is None:
+                text = self.disk.get(key)
+                if text is not None:
+                    self._remember(key, text)
+            if text is not None:
+                self._count(endpoint, 'hits')
+                return text
+        self._count(endpoint, 'misses')
+        return None
+
+    def put(self, key, text):
+        if not self.enabled or not text:
+            return
+        self._remember(key, text)
+        self.disk.set(key, text)
+
+    def _remember(self, key, text):
+        with self._lock:
+            self._memory[key] = (time.time() + self.ttl, text)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            endpoints = {}
+            for endpoint, counters in self._counters.items():
+                lookups = counters['hits'] + counters['misses']
+                endpoints[endpoint] = dict(
+                    counters,
+                    hit_rate=round(counters['hits'] / lookups, 4) if lookups else 0.0
+                )
+            return {
+                'enabled': self.enabled,
+                'memory_entries': len(self._memory),
+                'disk_entries': len(self.disk) if self.disk else 0,
+                'endpoints': endpoints
+            }
@@ -0,0 +1,140 @@
+import os
+import httpx
+from groq import AsyncGroq
+import openai
+
+from background_loop import get_background_loop
+from admission import AdmissionController
+from metrics import get_metrics
+
+
+class ChatProvider:
+    """A single OpenAI-compatible chat completion backend"""
+
+    def __init__(self, name, client, model):
+        self.name = name
+        self.client = client
+        self.model = model
+
+    async def complete(self, messages, max_tokens, temperature):
+        """Run a chat completion and return the message text"""
+        response = await self.client.chat.completions.create(
+            messages=messages,
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    async def stream(self, messages, max_tokens, temperature):
+        """Run a streamed chat completion, yielding text deltas as they arrive"""
+        response = await self.client.chat.completions.create(
+            messages=messages,
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+class ProviderPool:
+    """Async LLM clients sharing one keep-alive HTTP connection pool.
+
+    All requests are executed on the background loop so the pooled
+    connections stay bound to a single event loop across Flask requests.
+    Each provider has its own admission controller (LLM_CONCURRENCY,
+    LLM_RATE_LIMIT, LLM_QUEUE_SIZE, ...), so a burst queues briefly or is
+    turned away instead of tripping the provider's rate limits.
+    """
+
+    def __init__(self, pool_size=None, timeout=None, connect_timeout=None,
+                 keepalive_expiry=None, max_retries=None):
+        self.pool_size = pool_size or int(os.getenv('LLM_POOL_SIZE', '20'))
+        self.timeout = timeout or float(os.getenv('LLM_TIMEOUT', '60'))
+        self.connect_timeout = connect_timeout or float(os.getenv('LLM_CONNECT_TIMEOUT', '5'))
+        self.keepalive_expiry = keepalive_expiry or float(os.getenv('LLM_KEEPALIVE_EXPIRY', '30'))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('LLM_MAX_RETRIES', '2'))
+
+        self.background_loop = get_background_loop()
+        self.metrics = get_metrics()
+        self.http_timeout = httpx.Timeout(self.timeout, connect=self.connect_timeout)
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=self.http_timeout
+        )
+
+        self.providers = {}
+        self._register_providers()
+        self.admission = {
+            name: AdmissionController(f"LLM provider {name}", 'LLM', default_concurrency=self.pool_size)
+            for name in self.providers
+        }
+
+    def _register_providers(self):
+        groq_api_key = os.getenv('GROQ_API_KEY')
+        if groq_api_key:
+            client = AsyncGroq(
+                api_key=groq_api_key,
+                base_url=os.getenv('GROQ_BASE_URL') or None,
+                timeout=self.http_timeout,
+                max_retries=self.max_retries,
+                http_client=self.http_client
+            )
+            self.providers['groq'] = ChatProvider(
+                'groq', client, os.getenv('GROQ_MODEL', 'mixtral-8x7b-32768')
+            )
+
+        openai_api_key = os.getenv('OPENAI_API_KEY')
+        if openai_api_key:
+            client = openai.AsyncOpenAI(
+                api_key=openai_api_key,
+                base_url=os.getenv('OPENAI_BASE_URL') or None,
+                timeout=self.http_timeout,
+                max_retries=self.max_retries,
+                http_client=self.http_client
+            )
+            self.providers['openai'] = ChatProvider(
+                'openai', client, os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+            )
+
+    def get(self, name):
+        """Return the provider registered under name, or None"""
+        return self.providers.get(name)
+
+    async def complete(self, name, messages, max_tokens, temperature):
+        """Run a completion on the named provider via the background loop"""
+        return await self.background_loop.run(
+            self._complete(name, messages, max_tokens, temperature)
+        )
+
+    async def _complete(self, name, messages, max_tokens, temperature):
+        async with self.admission[name].slot():
+            with self.metrics.upstream('llm', name):
+                return await self.providers[name].complete(messages, max_tokens, temperature)
+
+    async def stream(self, name, messages, max_tokens, temperature):
+        """Yield the named provider's tokens; consume on the background loop.
+
+        The admission slot is held until the stream ends.
+        """
+        async with self.admission[name].slot():
+            with self.metrics.upstream('llm', name):
+                async for token in self.providers[name].stream(messages, max_tokens, temperature):
+                    yield token
+
+    def admission_stats(self):
+        return {name: admission.stats() for name, admission in self.admission.items()}
+
+    async def aclose(self):
+        """Close the shared HTTP connection pool"""
+        await self.background_loop.run(self.http_client.aclose())
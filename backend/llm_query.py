@@ -1,101 +1,185 @@
 import os
 import asyncio
-from groq import Groq
-import openai
 from dotenv import load_dotenv
 import json
+from llm_providers import ProviderPool
+from provider_router import ProviderRouter
+from admission import UpstreamBusy
+from metrics import get_metrics
+from llm_cache import LLMResponseCache
+from singleflight import SingleFlight
+from prompt_budget import PromptSizeStats
 
 load_dotenv()
 
+SYSTEM_PROMPT = "You are Skillmotion AI Assistant, an expert career development and skill analysis AI. Provide detailed, actionable insights for professional development."
+
 class LLMQuery:
-    def __init__(self):
+    def __init__(self, provider_pool=None, response_cache=None, router=None):
         self.groq_api_key = os.getenv('GROQ_API_KEY')
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         
-        # Initialize clients
-        if self.groq_api_key:
-            self.groq_client = Groq(api_key=self.groq_api_key)
-        else:
-            self.groq_client = None
-            
-        if self.openai_api_key:
-            openai.api_key = self.openai_api_key
-            self.openai_client = openai.OpenAI(api_key=self.openai_api_key)
-        else:
-            self.openai_client = None
+        # Initialize async clients over a shared connection pool
+        self.provider_pool = provider_pool or ProviderPool()
+        groq_provider = self.provider_pool.get('groq')
+        openai_provider = self.provider_pool.get('openai')
+        self.groq_client = groq_provider.client if groq_provider else None
+        self.openai_client = openai_provider.client if openai_provider else None
         
         # Default to Groq, fallback to OpenAI
         self.primary_provider = 'groq' if self.groq_client else 'openai'
+        
+        # Health-based provider order, circuit breakers and hedged requests
+        self.router = router or ProviderRouter(self.provider_pool, self._provider_order())
+        
+        # Prompt-level response cache (memory LRU in front of SQLite)
+        self.response_cache = response_cache or LLMResponseCache()
+        
+        # Identical concurrent cacheable queries share one upstream call
+        self.inflight = SingleFlight('llm', enabled=os.getenv('LLM_SINGLEFLIGHT', '1') != '0')
+        
+        # Estimated prompt size of every call, per endpoint
+        self.prompt_sizes = PromptSizeStats()
+        
+        # Per-endpoint latency spans (cache hits included)
+        self.metrics = get_metrics()
     
-    async def query_llm(self, prompt, max_tokens=1000, temperature=0.7):
-        """Query LLM with fallback mechanism"""
-        try:
-            if self.primary_provider == 'groq' and self.groq_client:
-                return await self._query_groq(prompt, max_tokens, temperature)
-            elif self.openai_client:
-                return await self._query_openai(prompt, max_tokens, temperature)
-            else:
-                raise Exception("No LLM provider configured")
-        except Exception as e:
-            print(f"Primary provider failed: {e}")
-            # Try fallback
-            try:
-                if self.primary_provider == 'groq' and self.openai_client:
-                    return await self._query_openai(prompt, max_tokens, temperature)
-                elif self.primary_provider == 'openai' and self.groq_client:
-                    return await self._query_groq(prompt, max_tokens, temperature)
-                else:
-                    raise Exception("No fallback provider available")
-            except Exception as e2:
-                raise Exception(f"All LLM providers failed: {str(e2)}")
+    async def query_llm(self, prompt, max_tokens=1000, temperature=0.7, endpoint='default'):
+        """Query LLM with response caching, request coalescing and fallback mechanism"""
+        self.prompt_sizes.record(endpoint, prompt, max_tokens)
+        with self.metrics.span(f"llm.{endpoint}"):
+            return await self._query_cached(prompt, max_tokens, temperature, endpoint)
     
-    async def _query_groq(self, prompt, max_tokens, temperature):
-        """Query Groq API"""
-        try:
-            response = self.groq_client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are Skillmotion AI Assistant, an expert career development and skill analysis AI. Provide detailed, actionable insights for professional development."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="mixtral-8x7b-32768",  # Groq's Mixtral model
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            raise Exception(f"Groq API error: {str(e)}")
+    async def _query_cached(self, prompt, max_tokens, temperature, endpoint):
+        """Serve from the response cache or a coalesced upstream call"""
+        if self.response_cache.should_bypass(temperature):
+            self.response_cache.record_bypass(endpoint)
+            _, response_text = await self._query_with_fallback(prompt, max_tokens, temperature)
+            return response_text
+        
+        # The cache may read SQLite; keep that off the event loop
+        cache_keys = self._cache_keys(prompt, max_tokens, temperature)
+        cached = await asyncio.to_thread(self.response_cache.lookup, cache_keys, endpoint)
+        if cached is not None:
+            return cached
+        
+        # Concurrent misses for the same prompt wait on a single upstream call
+        flight_key = cache_keys[0] if cache_keys else prompt
+        return await self.inflight.do(
+            flight_key, lambda: self._query_and_store(prompt, max_tokens, temperature)
+        )
     
-    async def _query_openai(self, prompt, max_tokens, temperature):
-        """Query OpenAI API"""
-        try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are Skillmotion AI Assistant, an expert career development and skill analysis AI. Provide detailed, actionable insights for professional development."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature
+    async def _query_and_store(self, prompt, max_tokens, temperature):
+        """Query with fallback and cache the completion under the answering provider"""
+        provider, response_text = await self._query_with_fallback(prompt, max_tokens, temperature)
+        await asyncio.to_thread(
+            self.response_cache.put, self._cache_key(provider, prompt, max_tokens, temperature), response_text
+        )
+        return response_text
+    
+    async def _query_with_fallback(self, prompt, max_tokens, temperature):
+        """Query the healthiest provider, hedging and falling back; return (provider, text)"""
+        return await self.router.complete(self._build_messages(prompt), max_tokens, temperature)
+    
+    def _cache_key(self, provider, prompt, max_tokens, temperature):
+        model = self.provider_pool.get(provider).model
+        return self.response_cache.make_key(provider, model, prompt, max_tokens, temperature)
+    
+    def _cache_keys(self, prompt, max_tokens, temperature):
+        """Cache keys for every configured provider, preferred first"""
+        return [
+            self._cache_key(name, prompt, max_tokens, temperature)
+            for name in self.router.ranked()
+        ]
+    
+    def stream_llm(self, prompt, max_tokens=1000, temperature=0.7, endpoint='default'):
+        """Stream LLM tokens synchronously, with the same routing as query_llm.
+
+        Streams are not hedged. Fallback only happens if a provider fails
+        before the first token; a failure mid-stream is raised to the caller.
+        """
+        self.prompt_sizes.record(endpoint, prompt, max_tokens)
+        return self.metrics.iterate(f"llm.{endpoint}", self.provider_pool.background_loop.iterate_sync(
+            self._stream_with_fallback(prompt, max_tokens, temperature, endpoint)
+        ))
+    
+    async def _stream_with_fallback(self, prompt, max_tokens, temperature, endpoint='default'):
+        """Yield tokens from the healthiest provider, falling back before the first token"""
+        providers = self.router.ranked()
+        if not providers:
+            raise Exception("No LLM provider configured")
+        
+        # A cached completion is replayed as a single token
+        cacheable = not self.response_cache.should_bypass(temperature)
+        if cacheable:
+            cached = await asyncio.to_thread(
+                self.response_cache.lookup, self._cache_keys(prompt, max_tokens, temperature), endpoint
             )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            raise Exception(f"OpenAI API error: {str(e)}")
+            if cached is not None:
+                yield cached
+                return
+        else:
+            self.response_cache.record_bypass(endpoint)
+        
+        last_error = None
+        for name in providers:
+            if not self.router.allow(name):
+                continue
+            started = False
+            chunks = []
+            try:
+                async for token in self.provider_pool.stream(
+                    name, self._build_messages(prompt), max_tokens, temperature
+                ):
+                    started = True
+                    chunks.append(token)
+                    yield token
+                self.router.record_success(name)
+                if cacheable:
+                    await asyncio.to_thread(
+                        self.response_cache.put,
+                        self._cache_key(name, prompt, max_tokens, temperature),
+                        ''.join(chunks)
+                    )
+                return
+            except (asyncio.CancelledError, GeneratorExit):
+                # The client went away; that says nothing about the provider
+                self.router.record_cancel(name)
+                raise
+            except UpstreamBusy as e:
+                # Raised before the first token: try the next provider
+                self.router.record_rejected(name)
+                last_error = e
+            except Exception as e:
+                self.router.record_failure(name)
+                if started:
+                    raise Exception(f"{name} stream interrupted: {str(e)}")
+                print(f"Streaming provider {name} failed: {e}")
+                last_error = e
+        if last_error is None:
+            raise self.router.unavailable()
+        if isinstance(last_error, UpstreamBusy):
+            raise last_error
+        raise Exception(f"All LLM providers failed: {str(last_error)}")
+    
+    def _provider_order(self):
+        """Return provider names, primary first"""
+        if self.primary_provider == 'groq':
+            return ['groq', 'openai']
+        return ['openai', 'groq']
+    
+    def _build_messages(self, prompt):
+        """Build the chat messages for a single-turn prompt"""
+        return [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
     
     def create_chain_prompt(self, base_prompt, context=None, examples=None):
         """Create a chained prompt with context and examples"""
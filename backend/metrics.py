@@ -0,0 +1,181 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Seconds; LLM calls and PDF parsing span several orders of magnitude
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered as Prometheus text"""
+
+    def __init__(self, name, help_text, label_names, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        for key, values in series:
+            labels = list(zip(self.label_names, key))
+            for bound, count in zip(self.buckets, values):
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', bound)])} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {values[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {values[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {values[-1]}")
+        return lines
+
+
+class RequestTimings:
+    """Spans finished while serving one request, for the Server-Timing header"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+
+    def add(self, name, duration):
+        self.spans.append((name, duration))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def header(self):
+        entries = [f"{name};dur={duration * 1000:.1f}" for name, duration in list(self.spans)]
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ', '.join(entries)
+
+
+# The current request's timings; copied contexts share the same object, so
+# spans on the background loop still land in the request that started them
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+class Metrics:
+    """Process-wide latency histograms plus gauges and counters read at scrape time.
+
+    ``span(stage)`` times resume parsing, LLM and TTS calls; inside a
+    request the span is also reported in its Server-Timing header.
+    ``upstream(kind, provider)`` times the provider call itself, without
+    queueing or caching. Collectors turn existing stats (cache hit ratios,
+    admission queues) into samples when /metrics is scraped.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.requests = Histogram(
+            'skillmotion_request_duration_seconds', 'HTTP request duration by route',
+            ('route', 'method', 'status'), buckets
+        )
+        self.stages = Histogram(
+            'skillmotion_stage_duration_seconds', 'Duration of resume parsing, LLM and TTS stages',
+            ('stage', 'outcome'), buckets
+        )
+        self.upstreams = Histogram(
+            'skillmotion_upstream_duration_seconds', 'Duration of calls to each upstream provider',
+            ('upstream', 'provider', 'outcome'), buckets
+        )
+        self._collectors = []
+
+    def begin_request(self):
+        timings = RequestTimings()
+        _request_timings.set(timings)
+        return timings
+
+    def end_request(self):
+        _request_timings.set(None)
+
+    def current_request(self):
+        return _request_timings.get()
+
+    def observe_request(self, route, method, status, duration):
+        self.requests.observe(duration, route=route, method=method, status=status)
+
+    def span(self, stage):
+        """Time a stage, recording it in the current request's Server-Timing"""
+        def record(duration, outcome):
+            self.stages.observe(duration, stage=stage, outcome=outcome)
+            timings = _request_timings.get()
+            if timings is not None:
+                timings.add(stage, duration)
+        return self._timed(record)
+
+    def upstream(self, kind, provider):
+        """Time one call to an upstream provider"""
+        def record(duration, outcome):
+            self.upstreams.observe(duration, upstream=kind, provider=provider, outcome=outcome)
+        return self._timed(record)
+
+    def iterate(self, stage, iterator):
+        """Yield from iterator inside a span covering the whole iteration"""
+        with self.span(stage):
+            yield from iterator
+
+    @contextmanager
+    def _timed(self, record):
+        outcome = 'ok'
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            outcome = 'error'
+            raise
+        except BaseException:
+            # Cancelled tasks and abandoned streams
+            outcome = 'cancelled'
+            raise
+        finally:
+            record(time.perf_counter() - start, outcome)
+
+    def add_collector(self, name, metric_type, help_text, samples):
+        """Register samples(), returning [(labels dict, value)], to be read on every scrape"""
+        self._collectors.append((name, metric_type, help_text, samples))
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format"""
+        lines = []
+        for histogram in (self.requests, self.stages, self.upstreams):
+            lines.extend(histogram.render())
+        for name, metric_type, help_text, samples in self._collectors:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            try:
+                for labels, value in samples():
+                    lines.append(f"{name}{_format_labels(sorted(labels.items()))} {value}")
+            except Exception as e:
+                print(f"Metrics collector {name} failed: {e}")
+        return '\n'.join(lines) + '\n'
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    """Return the process-wide metrics registry"""
+    return _metrics
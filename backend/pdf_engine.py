@@ -0,0 +1,151 @@
+import io
+import os
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz  # PyMuPDF
+from pdfminer.high_level import extract_text
+from pdfminer.layout import LAParams
+
+PDFMINER_LAPARAMS = dict(
+    line_margin=0.5,
+    word_margin=0.1,
+    char_margin=2.0,
+    boxes_flow=0.5,
+    all_texts=False
+)
+
+
+def extract_pages_with_fitz(data, start, end):
+    """Extract raw text of pages [start, end) from PDF bytes using PyMuPDF"""
+    doc = fitz.open(stream=data, filetype='pdf')
+    try:
+        return "".join(doc[page_num].get_text() for page_num in range(start, min(end, doc.page_count)))
+    finally:
+        doc.close()
+
+
+def extract_pages_with_pdfminer(data, start, end):
+    """Extract raw text of pages [start, end) from PDF bytes using pdfminer.six"""
+    return extract_text(
+        io.BytesIO(data),
+        page_numbers=list(range(start, end)),
+        laparams=LAParams(**PDFMINER_LAPARAMS)
+    )
+
+
+def count_pages(data):
+    """Return the page count of PDF bytes, or None if PyMuPDF cannot open them"""
+    try:
+        doc = fitz.open(stream=data, filetype='pdf')
+    except Exception:
+        return None
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+class PDFExtractionEngine:
+    """Extract PDF text in a process pool, outside the GIL and the event loop.
+
+    Large documents are split into page ranges that are extracted in
+    parallel and joined in page order. Documents are capped at max_pages
+    and each extraction, page counting included, must finish within
+    timeout seconds. A worker stuck past the deadline cannot be
+    interrupted, so the whole pool is killed and replaced.
+    """
+
+    def __init__(self, max_workers=None, pages_per_task=None, max_pages=None, timeout=None):
+        self.max_workers = max_workers or int(os.getenv('PDF_WORKERS', str(min(4, os.cpu_count() or 1))))
+        self.pages_per_task = pages_per_task or int(os.getenv('PDF_PAGES_PER_TASK', '8'))
+        self.max_pages = max_pages or int(os.getenv('PDF_MAX_PAGES', '100'))
+        self.timeout = timeout or float(os.getenv('PDF_TIMEOUT', '30'))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def page_ranges(self, page_count):
+        """Split the first max_pages pages into [start, end) ranges"""
+        page_count = min(page_count, self.max_pages)
+        return [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+
+    async def extract(self, data):
+        """Return the raw text of a PDF, trying PyMuPDF then pdfminer"""
+        deadline = asyncio.get_running_loop().time() + self.timeout
+        try:
+            page_count, = await self._run([(count_pages, data)], deadline)
+        except asyncio.TimeoutError:
+            raise Exception(f"PDF extraction timed out after {self.timeout:.0f}s")
+        if page_count is not None and page_count > self.max_pages:
+            print(f"PDF has {page_count} pages; extracting the first {self.max_pages}")
+
+        # pdfminer opens documents PyMuPDF rejects, so fall back to one capped range
+        ranges = self.page_ranges(page_count) if page_count is not None else [(0, self.max_pages)]
+
+        try:
+            if page_count is None:
+                raise Exception("PyMuPDF could not open the document")
+            return await self._extract_ranges(extract_pages_with_fitz, data, ranges, deadline)
+        except asyncio.TimeoutError:
+            raise Exception(f"PDF extraction timed out after {self.timeout:.0f}s")
+        except Exception as e:
+            print(f"PyMuPDF failed: {e}")
+            try:
+                return await self._extract_ranges(extract_pages_with_pdfminer, data, ranges, deadline)
+            except asyncio.TimeoutError:
+                raise Exception(f"PDF extraction timed out after {self.timeout:.0f}s")
+            except Exception as e2:
+                print(f"pdfminer failed: {e2}")
+                raise Exception(f"Failed to extract text from PDF: {str(e2)}")
+
+    async def _extract_ranges(self, extract_pages, data, ranges, deadline):
+        parts = await self._run([(extract_pages, data, start, end) for start, end in ranges], deadline)
+        return "".join(parts)
+
+    async def _run(self, calls, deadline):
+        """Run (func, *args) calls in the pool and return their results once all finish before deadline"""
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self.executor
+            try:
+                futures = [asyncio.wrap_future(executor.submit(*call)) for call in calls]
+                return await asyncio.wait_for(asyncio.gather(*futures), max(0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                self._recycle_executor(executor)
+                raise
+            except BrokenProcessPool:
+                # A worker crashed, or another extraction timed out and killed the pool;
+                # replace it (once per broken pool) and retry once on the new one
+                self._recycle_executor(executor)
+                if attempt:
+                    raise
+
+    def _recycle_executor(self, executor=None):
+        """Kill the pool's workers (or the given pool's, if still current) and start afresh on next use"""
+        with self._lock:
+            if executor is not None and executor is not self._executor:
+                return
+            executor, self._executor = self._executor, None
+        if executor:
+            # ProcessPoolExecutor cannot kill busy workers itself before Python 3.14
+            processes = list((executor._processes or {}).values())
+            executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+    def shutdown(self):
+        self._recycle_executor()
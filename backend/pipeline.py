@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+
+class PipelineError(Exception):
+    """Raised when a pipeline stage fails"""
+
+    def __init__(self, stage, error):
+        super().__init__(f"Stage '{stage}' failed: {str(error)}")
+        self.stage = stage
+        self.error = error
+
+
+class Pipeline:
+    """Small async DAG executor.
+
+    Each stage is an async callable receiving the dict of results so far
+    and runs as soon as the stages it depends on have finished, so
+    independent stages overlap and the total latency follows the critical
+    path. Per-stage start offsets and durations are recorded in timings.
+    A stage whose result is passed in as an input is not run again, so a
+    resumed run only does the work that is left.
+    """
+
+    def __init__(self, name='pipeline'):
+        self.name = name
+        self.stages = {}
+        self.timings = {}
+        self.total_ms = None
+
+    def add_stage(self, name, func, depends_on=()):
+        """Register a stage; dependencies must be added first"""
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        for dependency in depends_on:
+            if dependency not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+        self.stages[name] = (func, tuple(depends_on))
+        return self
+
+    async def run(self, on_stage=None, **inputs):
+        """Run all stages and return the results dict (inputs included).
+
+        on_stage(name, results) is awaited as each stage finishes.
+        """
+        results = dict(inputs)
+        tasks = {}
+        start = time.perf_counter()
+
+        async def run_stage(name, func, depends_on):
+            if name in inputs:
+                return results[name]
+            if depends_on:
+                await asyncio.gather(*[tasks[dependency] for dependency in depends_on])
+            stage_start = time.perf_counter()
+            try:
+                results[name] = await func(results)
+            except Exception as e:
+                raise PipelineError(name, e)
+            finally:
+                self.timings[name] = {
+                    'start_ms': round((stage_start - start) * 1000, 1),
+                    'duration_ms': round((time.perf_counter() - stage_start) * 1000, 1)
+                }
+            if on_stage:
+                await on_stage(name, results)
+            return results[name]
+
+        # Stages were added in dependency order, so every dependency task exists
+        for name, (func, depends_on) in self.stages.items():
+            tasks[name] = asyncio.ensure_future(run_stage(name, func, depends_on))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            self.total_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        return results
+
+    def timing_report(self):
+        """Return stage timings plus the end-to-end total"""
+        return {
+            'stages': dict(self.timings),
+            'total_ms': self.total_ms
+        }
@@ -0,0 +1,173 @@
+import os
+import re
+import threading
+
+# Words and punctuation, the units BPE tokenizers mostly split on
+WORD_PIECES = re.compile(r'\w+|[^\w\s]')
+
+# How much a section matters for career analysis before role relevance
+SECTION_PRIORITY = {
+    'skills': 1.0,
+    'experience': 0.8,
+    'projects': 0.6,
+    'certifications': 0.5,
+    'education': 0.4
+}
+
+TRUNCATION_MARKER = " [...]"
+
+
+def estimate_tokens(text):
+    """Estimate the token count of text without a tokenizer.
+
+    Each word or punctuation mark counts as one token, plus one more per
+    six characters beyond the first for long or rare words.
+    """
+    if not text:
+        return 0
+    return sum(1 + (len(piece) - 1) // 6 for piece in WORD_PIECES.findall(text))
+
+
+def fit_text(text, max_tokens):
+    """Return text cut at a word boundary to at most max_tokens estimated tokens"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    budget = max(0, max_tokens - estimate_tokens(TRUNCATION_MARKER))
+    used = 0
+    end = 0
+    for match in WORD_PIECES.finditer(text):
+        used += 1 + (len(match.group()) - 1) // 6
+        if used > budget:
+            break
+        end = match.end()
+    return text[:end].rstrip() + TRUNCATION_MARKER
+
+
+class PromptSizeStats:
+    """Estimated prompt sizes per endpoint, for /api/stats"""
+
+    def __init__(self, context_tokens=None):
+        self.context_tokens = context_tokens or int(os.getenv('LLM_CONTEXT_TOKENS', '32768'))
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, prompt, max_tokens):
+        """Record a call and return its estimated prompt tokens"""
+        tokens = estimate_tokens(prompt)
+        over_context = tokens + max_tokens > self.context_tokens
+        if over_context:
+            print(f"Prompt for {endpoint} (~{tokens} tokens + {max_tokens} completion) exceeds the {self.context_tokens}-token context")
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {
+                'calls': 0, 'total_tokens': 0, 'max_tokens': 0, 'last_tokens': 0, 'over_context': 0
+            })
+            stats['calls'] += 1
+            stats['total_tokens'] += tokens
+            stats['max_tokens'] = max(stats['max_tokens'], tokens)
+            stats['last_tokens'] = tokens
+            stats['over_context'] += over_context
+        return tokens
+
+    def stats(self):
+        with self._lock:
+            return {
+                endpoint: dict(stats, avg_tokens=round(stats['total_tokens'] / stats['calls']))
+                for endpoint, stats in self._endpoints.items()
+            }
+
+
+class PromptBudget:
+    """Pack resume text and earlier LLM output into token budgets.
+
+    Resumes over budget are split into the sections ResumeParser.scan
+    finds. Sections are ranked by a fixed priority plus their similarity
+    to the target role's required skills; the opening summary always comes
+    first, capped to a sixth of the budget. The best ones are packed whole,
+    the next one is truncated to fill the remaining budget, and the result
+    keeps document order. Text fed back from earlier LLM calls is cut at a
+    word boundary.
+    """
+
+    def __init__(self, resume_parser, skill_matcher=None, resume_tokens=None, context_tokens=None):
+        self.resume_parser = resume_parser
+        self.skill_matcher = skill_matcher
+        self.resume_tokens = resume_tokens or int(os.getenv('PROMPT_RESUME_TOKENS', '3000'))
+        self.context_tokens = context_tokens or int(os.getenv('PROMPT_CONTEXT_TOKENS', '1500'))
+        self._lock = threading.Lock()
+        self.packed = 0
+        self.truncated = 0
+
+    def fit(self, text, max_tokens=None):
+        """Cut LLM output or user context (text, or a list of lines) to the context budget"""
+        if isinstance(text, (list, tuple)):
+            text = "\n".join(str(line) for line in text if line)
+        text = text or ''
+        if not isinstance(text, str):
+            raise ValueError(f"Cannot fit {type(text).__name__} into a prompt")
+        fitted = fit_text(text, max_tokens or self.context_tokens)
+        if fitted != text:
+            with self._lock:
+                self.truncated += 1
+        return fitted
+
+    def pack_resume(self, resume_text, job_role=None, max_tokens=None):
+        """Return the most relevant resume content within max_tokens"""
+        max_tokens = max_tokens or self.resume_tokens
+        original_tokens = estimate_tokens(resume_text)
+        if original_tokens <= max_tokens:
+            return resume_text
+
+        spans = self.resume_parser.scan(resume_text)['sections']
+        if not spans:
+            packed = fit_text(resume_text, max_tokens)
+        else:
+            packed = self._pack_sections(resume_text, spans, job_role, max_tokens)
+
+        with self._lock:
+            self.packed += 1
+        print(f"Packed resume for {job_role or 'upload'}: ~{original_tokens} -> ~{estimate_tokens(packed)} tokens")
+        return packed
+
+    def _pack_sections(self, text, spans, job_role, max_tokens):
+        # Text before the first section holds the name, contact details and summary
+        first_start = min(start for start, _ in spans.values())
+        parts = [('summary', (0, first_start))] + sorted(spans.items(), key=lambda item: item[1][0])
+        parts = [(name, span) for name, span in parts if span[1] > span[0]]
+
+        ranking = self._rank(text, parts, job_role)
+        budget = max_tokens
+        chosen = {}
+        for index in ranking:
+            name, (start, end) = parts[index]
+            label = 'Summary' if name == 'summary' else name.title()
+            overhead = estimate_tokens(f"{label}: ") + 1
+            if budget <= overhead:
+                break
+            limit = budget - overhead
+            if name == 'summary':
+                limit = min(limit, max_tokens // 6)
+            content = fit_text(text[start:end], limit)
+            chosen[index] = f"{label}: {content}"
+            budget -= estimate_tokens(chosen[index]) + 1
+
+        return "\n".join(chosen[index] for index in sorted(chosen))
+
+    def _rank(self, text, parts, job_role):
+        """Return part indexes, most relevant first; the summary is always kept first"""
+        relevance = [0.0] * len(parts)
+        if job_role and self.skill_matcher:
+            relevance = self.skill_matcher.relevance(job_role, [text[start:end] for _, (start, end) in parts])
+        scores = [
+            (2.0 if name == 'summary' else SECTION_PRIORITY.get(name, 0.0)) + float(relevance[index])
+            for index, (name, _) in enumerate(parts)
+        ]
+        return sorted(range(len(parts)), key=lambda index: -scores[index])
+
+    def stats(self):
+        with self._lock:
+            return {
+                'resume_tokens': self.resume_tokens,
+                'context_tokens': self.context_tokens,
+                'packed_resumes': self.packed,
+                'truncated_contexts': self.truncated
+            }
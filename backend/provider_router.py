@@ -0,0 +1,285 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+
+from admission import UpstreamBusy
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class ProviderHealth:
+    """Latency and error tracking plus a circuit breaker for one provider.
+
+    Latency and error rate are exponentially weighted moving averages; a
+    window of recent latencies gives the percentile used as the hedge
+    delay. failure_threshold consecutive failures open the circuit; after
+    reset_timeout one probe request is let through (half-open) and its
+    outcome closes or re-opens it.
+    """
+
+    def __init__(self, name, alpha, window, failure_threshold, reset_timeout):
+        self.name = name
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latencies = deque(maxlen=window)
+        self.ewma_latency = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.requests = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def allow(self, now):
+        """Whether a request may be sent now; claims the half-open probe"""
+        if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self.probing:
+                return False
+            self.probing = True
+        return self.state != OPEN
+
+    def rank(self, now):
+        """0 if due for a half-open probe, 2 if the circuit is open, else 1"""
+        if self.state == OPEN:
+            return 2 if now - self.opened_at < self.reset_timeout else 0
+        if self.state == HALF_OPEN and not self.probing:
+            return 0
+        return 1
+
+    def record_success(self, latency=None):
+        self.requests += 1
+        if latency is not None:
+            self.latencies.append(latency)
+            self.ewma_latency = latency if self.ewma_latency is None else \
+                self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+        self.error_rate *= 1 - self.alpha
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.probing = False
+
+    def record_failure(self, now):
+        self.requests += 1
+        self.failures += 1
+        self.error_rate = self.alpha + (1 - self.alpha) * self.error_rate
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+                print(f"Circuit for LLM provider {self.name} opened after {self.consecutive_failures} failures")
+            self.state = OPEN
+            self.opened_at = now
+        self.probing = False
+
+    def record_cancel(self):
+        # A hedging loser says nothing about health, but frees the probe
+        self.cancelled += 1
+        self.probing = False
+
+    def record_rejected(self):
+        # Turned away by our own admission control, not by the provider
+        self.rejected += 1
+        self.probing = False
+
+    def reopens_in(self, now):
+        """Seconds until an open circuit lets a probe through"""
+        return max(0.0, self.reset_timeout - (now - self.opened_at)) if self.state == OPEN else 0.0
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def stats(self):
+        return {
+            'state': self.state,
+            'ewma_latency': round(self.ewma_latency, 3) if self.ewma_latency is not None else None,
+            'p95_latency': round(self.percentile(0.95), 3) if self.latencies else None,
+            'error_rate': round(self.error_rate, 3),
+            'requests': self.requests,
+            'failures': self.failures,
+            'cancelled': self.cancelled,
+            'rejected': self.rejected,
+            'times_opened': self.times_opened
+        }
+
+
+class ProviderRouter:
+    """Latency-aware provider selection with circuit breakers and hedging.
+
+    Providers with an open circuit are skipped until they are due for a
+    probe, which then goes first so a recovered provider is noticed; the
+    rest are tried fastest EWMA latency (inflated by error rate) first,
+    with the configured order breaking ties and ranking providers without
+    samples last. With hedging on, if the first provider has not
+    answered within its p95 latency (hedge_delay until min_samples are
+    known), the next one is started too; the first success wins and the
+    other request is cancelled. Failures fall through to the next provider;
+    a provider whose admission queue turns the request away is skipped
+    without counting against its health.
+    """
+
+    def __init__(self, provider_pool, order, hedge=None, hedge_delay=None, hedge_percentile=None,
+                 min_samples=None, failure_threshold=None, reset_timeout=None, alpha=None, window=None):
+        self.provider_pool = provider_pool
+        self.order = [name for name in order if provider_pool.get(name)]
+        self.hedge = hedge if hedge is not None else os.getenv('LLM_HEDGE', '0') == '1'
+        self.hedge_delay = hedge_delay or float(os.getenv('LLM_HEDGE_DELAY', '2.0'))
+        self.hedge_percentile = hedge_percentile or float(os.getenv('LLM_HEDGE_PERCENTILE', '0.95'))
+        self.min_samples = min_samples or int(os.getenv('LLM_HEDGE_MIN_SAMPLES', '20'))
+        failure_threshold = failure_threshold or int(os.getenv('LLM_BREAKER_FAILURES', '5'))
+        reset_timeout = reset_timeout or float(os.getenv('LLM_BREAKER_RESET', '30'))
+        alpha = alpha or float(os.getenv('LLM_EWMA_ALPHA', '0.2'))
+        window = window or int(os.getenv('LLM_LATENCY_WINDOW', '200'))
+
+        self.health = {
+            name: ProviderHealth(name, alpha, window, failure_threshold, reset_timeout)
+            for name in self.order
+        }
+        self._lock = threading.Lock()
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def ranked(self):
+        """Return provider names in the order they should be tried"""
+        now = time.monotonic()
+        with self._lock:
+            def key(index_name):
+                index, name = index_name
+                health = self.health[name]
+                latency = health.ewma_latency if health.ewma_latency is not None else float('inf')
+                return (health.rank(now), latency / max(0.05, 1 - health.error_rate), index)
+            return [name for _, name in sorted(enumerate(self.order), key=key)]
+
+    def allow(self, name):
+        """Whether a request may go to name now (claims a half-open probe)"""
+        with self._lock:
+            return self.health[name].allow(time.monotonic())
+
+    def record_success(self, name, latency=None):
+        with self._lock:
+            self.health[name].record_success(latency)
+
+    def record_failure(self, name):
+        with self._lock:
+            self.health[name].record_failure(time.monotonic())
+
+    def record_cancel(self, name):
+        with self._lock:
+            self.health[name].record_cancel()
+
+    def record_rejected(self, name):
+        with self._lock:
+            self.health[name].record_rejected()
+
+    def unavailable(self):
+        """UpstreamBusy for when every circuit is open, retrying when the first reopens"""
+        now = time.monotonic()
+        with self._lock:
+            retry_after = min(health.reopens_in(now) for health in self.health.values())
+        return UpstreamBusy("LLM providers", "circuit open", retry_after)
+
+    def delay_for(self, name):
+        """How long to wait on name before hedging"""
+        with self._lock:
+            health = self.health[name]
+            if len(health.latencies) < self.min_samples:
+                return self.hedge_delay
+            return health.percentile(self.hedge_percentile)
+
+    async def _attempt(self, name, messages, max_tokens, temperature):
+        started = time.monotonic()
+        try:
+            text = await self.provider_pool.complete(name, messages, max_tokens, temperature)
+        except asyncio.CancelledError:
+            self.record_cancel(name)
+            raise
+        except UpstreamBusy:
+            self.record_rejected(name)
+            raise
+        except Exception:
+            self.record_failure(name)
+            raise
+        self.record_success(name, time.monotonic() - started)
+        return text
+
+    async def complete(self, messages, max_tokens, temperature):
+        """Run a completion on the best provider; return (provider, text)"""
+        if not self.order:
+            raise Exception("No LLM provider configured")
+        remaining = self.ranked()
+        pending = {}
+        hedged = False
+        last_error = None
+
+        def launch():
+            while remaining:
+                name = remaining.pop(0)
+                if self.allow(name):
+                    task = asyncio.ensure_future(self._attempt(name, messages, max_tokens, temperature))
+                    pending[task] = name
+                    return name
+            return None
+
+        first = launch()
+        if first is None:
+            raise self.unavailable()
+        busy = []
+        try:
+            while pending:
+                timeout = None
+                if self.hedge and not hedged and remaining and len(pending) == 1:
+                    timeout = self.delay_for(first)
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # The first provider is slower than usual: race the next one
+                    hedged = True
+                    with self._lock:
+                        self.hedged += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is None:
+                        if hedged and name != first:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        return name, task.result()
+                    last_error = task.exception()
+                    if isinstance(last_error, UpstreamBusy):
+                        busy.append(last_error)
+                    else:
+                        print(f"LLM provider {name} failed: {last_error}")
+
+                if not pending and remaining:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if busy and last_error is busy[-1]:
+            # Overloaded rather than broken: let the caller retry when the queue drains
+            raise min(busy, key=lambda error: error.retry_after)
+        raise Exception(f"All LLM providers failed: {str(last_error)}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hedging': self.hedge,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'providers': {name: health.stats() for name, health in self.health.items()}
+            }
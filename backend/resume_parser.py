@@ -4,10 +4,58 @@ from pdfminer.high_level import extract_text
 from pdfminer.layout import LAParams
 import re
 import os
+import io
+from pdf_engine import PDFExtractionEngine, PDFMINER_LAPARAMS
+from metrics import get_metrics
+
+# Common section headers, longest alternative first
+SECTION_PATTERNS = {
+    'experience': r'work experience|professional experience|employment|experience',
+    'education': r'academic background|qualifications|education',
+    'skills': r'technical skills|competencies|expertise|skills',
+    'projects': r'personal projects|notable projects|projects',
+    'certifications': r'certifications|certificates|licenses'
+}
+
+# Contact entities that start at a word boundary
+WORD_CONTACT_PATTERNS = {
+    'email': r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b',
+    'linkedin': r'linkedin\.com/in/[\w-]+'
+}
+
+PHONE_PATTERN = r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+
+CONTACT_NAMES = set(WORD_CONTACT_PATTERNS) | {'phone'}
+
+# One alternation of named groups, tried only at word starts (or where a
+# phone number can begin) so most positions fail on a single check;
+# match.lastgroup tells which token was found
+TOKEN_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(
+        f'(?P<{name}>{pattern})'
+        for name, pattern in {**WORD_CONTACT_PATTERNS, **SECTION_PATTERNS}.items()
+    ) + r')|(?=[\d+(])(?P<phone>' + PHONE_PATTERN + ')',
+    re.IGNORECASE
+)
+
+# Whitespace and characters that might interfere with processing
+CLEAN_PATTERN = re.compile(r'[^\w@.,()-]+')
 
 class ResumeParser:
-    def __init__(self):
+    def __init__(self, engine=None):
         self.supported_formats = ['.pdf']
+        # Process-pool extraction engine for the async path
+        self.engine = engine or PDFExtractionEngine()
+        self.metrics = get_metrics()
+    
+    async def extract_text_async(self, data):
+        """Extract text from PDF bytes in the process pool, off the event loop"""
+        return self.clean_text(await self.extract_raw_text_async(data))
+    
+    async def extract_raw_text_async(self, data):
+        """Extract uncleaned text, keeping symbols such as C++ and C#"""
+        with self.metrics.span('resume_parse'):
+            return await self.engine.extract(data)
     
     def extract_text_from_pdf(self, file_path):
         """Extract text from PDF using multiple methods for robustness"""
@@ -23,107 +71,106 @@ class ResumeParser:
                 print(f"pdfminer failed: {e2}")
                 raise Exception(f"Failed to extract text from PDF: {str(e2)}")
     
-    def _extract_with_fitz(self, file_path):
-        """Extract text using PyMuPDF/fitz"""
-        doc = fitz.open(file_path)
-        text = ""
-        
-        for page_num in range(doc.page_count):
-            page = doc[page_num]
-            text += page.get_text()
-        
-        doc.close()
-        return self._clean_text(text)
+    def extract_text_from_bytes(self, data):
+        """Extract text from an in-memory PDF without writing it to disk"""
+        try:
+            # Method 1: Try PyMuPDF's stream open first (faster)
+            return self._extract_with_fitz(data)
+        except Exception as e:
+            print(f"PyMuPDF failed: {e}")
+            try:
+                # Method 2: Fall back to pdfminer over a file-like buffer
+                return self._extract_with_pdfminer(io.BytesIO(data))
+            except Exception as e2:
+                print(f"pdfminer failed: {e2}")
+                raise Exception(f"Failed to extract text from PDF: {str(e2)}")
+    
+    def _extract_with_fitz(self, source):
+        """Extract text using PyMuPDF/fitz from a path or PDF bytes"""
+        if isinstance(source, (bytes, bytearray)):
+            doc = fitz.open(stream=source, filetype='pdf')
+        else:
+            doc = fitz.open(source)
+        try:
+            text = "".join(page.get_text() for page in doc)
+        finally:
+            doc.close()
+        return self.clean_text(text)
     
     def _extract_with_pdfminer(self, file_path):
-        """Extract text using pdfminer.six"""
-        laparams = LAParams(
-            line_margin=0.5,
-            word_margin=0.1,
-            char_margin=2.0,
-            boxes_flow=0.5,
-            all_texts=False
-        )
-        
-        text = extract_text(file_path, laparams=laparams)
-        return self._clean_text(text)
+        """Extract text using pdfminer.six from a path or binary file object"""
+        text = extract_text(file_path, laparams=LAParams(**PDFMINER_LAPARAMS))
+        return self.clean_text(text)
     
-    def _clean_text(self, text):
+    def clean_text(self, text):
         """Clean and normalize extracted text"""
         if not text:
             return ""
         
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters that might interfere with processing
-        text = re.sub(r'[^\w\s@.,()-]', ' ', text)
-        
-        # Normalize line breaks
-        text = text.replace('\n', ' ').replace('\r', ' ')
-        
-        # Remove multiple spaces
-        text = re.sub(r' +', ' ', text)
-        
-        return text.strip()
+        # Replace runs of whitespace and special characters with one space
+        return CLEAN_PATTERN.sub(' ', text).strip()
+    
+    def scan(self, text):
+        """Locate section headers and contact entities in one pass.
+        
+        Returns {'sections': {name: (start, end)}, 'contacts': {name: (start, end)}}
+        with offsets into text. A section runs from the end of its first
+        header to the next header of a different section, trimmed of
+        surrounding whitespace; contacts are their first occurrence.
+        """
+        contacts = {}
+        headers = []  # (name, start, end) in text order
+        for match in TOKEN_PATTERN.finditer(text):
+            name = match.lastgroup
+            if name in CONTACT_NAMES:
+                contacts.setdefault(name, match.span())
+            else:
+                headers.append((name, match.start(), match.end()))
+        
+        # Walk backwards so each header knows where the next different section starts
+        sections = {}
+        next_other = len(text)
+        for index in range(len(headers) - 1, -1, -1):
+            name, start, end = headers[index]
+            if index + 1 < len(headers) and headers[index + 1][0] != name:
+                next_other = headers[index + 1][1]
+            sections[name] = self._trim_span(text, end, next_other)
+        
+        return {'sections': sections, 'contacts': contacts}
+    
+    def _trim_span(self, text, start, end):
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return start, end
     
     def extract_contact_info(self, text):
         """Extract contact information from resume text"""
-        contact_info = {}
-        
-        # Email extraction
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact_info['email'] = emails[0]
-        
-        # Phone number extraction
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            contact_info['phone'] = ''.join(phones[0]) if isinstance(phones[0], tuple) else phones[0]
-        
-        # LinkedIn extraction
-        linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-        linkedin = re.findall(linkedin_pattern, text, re.IGNORECASE)
-        if linkedin:
-            contact_info['linkedin'] = linkedin[0]
-        
-        return contact_info
+        return {
+            name: text[start:end]
+            for name, (start, end) in self.scan(text)['contacts'].items()
+        }
     
     def extract_sections(self, text):
         """Extract common resume sections"""
-        sections = {}
-        
-        # Common section headers
-        section_patterns = {
-            'experience': r'(work experience|professional experience|employment|experience)',
-            'education': r'(education|academic background|qualifications)',
-            'skills': r'(skills|technical skills|competencies|expertise)',
-            'projects': r'(projects|personal projects|notable projects)',
-            'certifications': r'(certifications|certificates|licenses)'
+        return {
+            name: text[start:end]
+            for name, (start, end) in self.scan(text)['sections'].items()
         }
+    
+    def validate_bytes(self, data, max_bytes=None):
+        """Validate an in-memory upload before parsing"""
+        if not data:
+            raise ValueError("Uploaded file is empty")
+        
+        if max_bytes and len(data) > max_bytes:
+            raise ValueError(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
         
-        for section_name, pattern in section_patterns.items():
-            # Find the section header
-            matches = list(re.finditer(pattern, text, re.IGNORECASE))
-            if matches:
-                start_pos = matches[0].end()
-                
-                # Find the next section or end of text
-                remaining_patterns = [p for name, p in section_patterns.items() if name != section_name]
-                end_pos = len(text)
-                
-                for other_pattern in remaining_patterns:
-                    other_matches = list(re.finditer(other_pattern, text[start_pos:], re.IGNORECASE))
-                    if other_matches:
-                        potential_end = start_pos + other_matches[0].start()
-                        if potential_end < end_pos:
-                            end_pos = potential_end
-                
-                sections[section_name] = text[start_pos:end_pos].strip()
+        if not data.lstrip()[:5] == b'%PDF-':
+            raise ValueError("Unsupported file format: not a PDF document")
         
-        return sections
+        return True
     
     def validate_file(self, file_path):
         """Validate if the file is a supported format and readable"""
@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import secrets
+import threading
+from collections import OrderedDict
+
+from cache_store import SQLiteStore
+
+
+class SessionStore:
+    """Server-side per-user state, so clients send a session id instead of artifacts.
+
+    Sessions live in an in-memory LRU bounded by count and by the JSON size
+    of their data, and expire after ttl seconds without use. With a path,
+    every update is also written to SQLite, so sessions evicted from memory
+    or held before a restart are reloaded on their next use. With shared,
+    SQLite is read on every use so several worker processes see each
+    other's updates.
+    """
+
+    def __init__(self, path=None, ttl=None, max_sessions=None, max_bytes=None, shared=None):
+        self.ttl = ttl or float(os.getenv('SESSION_TTL', str(2 * 3600)))
+        self.max_sessions = max_sessions or int(os.getenv('SESSION_MAX_SESSIONS', '1000'))
+        self.max_bytes = max_bytes or int(os.getenv('SESSION_MAX_BYTES', str(64 * 1024 * 1024)))
+        path = path or os.getenv('SESSION_STORE_PATH')
+        self.disk = SQLiteStore(path, table='sessions', ttl=self.ttl) if path else None
+        if shared is None:
+            shared = os.getenv('SESSION_SHARED', '0') == '1'
+        self.shared = shared and self.disk is not None
+
+        self._sessions = OrderedDict()  # session_id -> (expires_at, data, size)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def create(self, **data):
+        """Start a session and return its id"""
+        session_id = secrets.token_urlsafe(16)
+        data['created_at'] = time.time()
+        self._store(session_id, data)
+        with self._lock:
+            self.created += 1
+        return session_id
+
+    def get(self, session_id):
+        """Return a copy of the session data, or None if unknown or expired"""
+        if not session_id:
+            return None
+        if self.shared:
+            return self._load(session_id)
+        now = time.time()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry and entry[0] <= now:
+                self._remove_locked(session_id)
+                self.expired += 1
+                entry = None
+            if entry:
+                # Sliding expiry: every use extends the session
+                self._sessions[session_id] = (now + self.ttl, entry[1], entry[2])
+                self._sessions.move_to_end(session_id)
+                return dict(entry[1])
+
+        return self._load(session_id)
+
+    def _load(self, session_id):
+        data = self.disk.get(session_id) if self.disk is not None else None
+        if data is None:
+            with self._lock:
+                self._remove_locked(session_id)
+            return None
+        self._remember(session_id, data)
+        return dict(data)
+
+    def update(self, session_id, **fields):
+        """Merge fields into a session; return the new data, or None if it is gone"""
+        data = self.get(session_id)
+        if data is None:
+            return None
+        data.update(fields)
+        self._store(session_id, data)
+        return data
+
+    def delete(self, session_id):
+        with self._lock:
+            self._remove_locked(session_id)
+        if self.disk is not None:
+            self.disk.delete(session_id)
+
+    def _store(self, session_id, data):
+        data['updated_at'] = time.time()
+        self._remember(session_id, data)
+        if self.disk is not None:
+            self.disk.set(session_id, data)
+
+    def _remember(self, session_id, data):
+        size = len(json.dumps(data))
+        with self._lock:
+            self._remove_locked(session_id)
+            self._sessions[session_id] = (time.time() + self.ttl, data, size)
+            self.total_bytes += size
+            self._evict_locked()
+
+    def _remove_locked(self, session_id):
+        entry = self._sessions.pop(session_id, None)
+        if entry:
+            self.total_bytes -= entry[2]
+
+    def _evict_locked(self):
+        # Least recently used first, so expired sessions are all at the front
+        now = time.time()
+        while self._sessions and next(iter(self._sessions.values()))[0] <= now:
+            self._remove_locked(next(iter(self._sessions)))
+            self.expired += 1
+        while self._sessions and (
+            len(self._sessions) > self.max_sessions or self.total_bytes > self.max_bytes
+        ):
+            session_id = next(iter(self._sessions))
+            self._remove_locked(session_id)
+            self.evicted += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'bytes': self.total_bytes,
+                'created': self.created,
+                'expired': self.expired,
+                'evicted': self.evicted,
+                'persistent': self.disk is not None,
+                'shared': self.shared
+            }
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+from background_loop import get_background_loop
+
+
+class _Call:
+    def __init__(self, future):
+        self.future = future
+        self.waiters = 0
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one in-flight execution.
+
+    The first caller for a key starts the work on the background loop;
+    callers arriving while it runs await the same future, from any event
+    loop, and share its result or exception. A caller being cancelled
+    does not cancel the work for the others; the work is only cancelled
+    once every waiter has gone.
+    """
+
+    def __init__(self, name, background_loop=None, enabled=True):
+        self.name = name
+        self.background_loop = background_loop or get_background_loop()
+        self.enabled = enabled
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, coro_factory):
+        """Return the result of coro_factory(), sharing it with concurrent callers of key"""
+        if not self.enabled:
+            return await self.background_loop.run(coro_factory())
+
+        started = False
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None or call.abandoned:
+                call = _Call(self.background_loop.submit(coro_factory()))
+                self._calls[key] = call
+                self.executions += 1
+                started = True
+            else:
+                self.coalesced += 1
+            call.waiters += 1
+        if started:
+            # Registered outside the lock: the callback runs inline if already done
+            call.future.add_done_callback(lambda _: self._forget(key, call))
+
+        try:
+            return await asyncio.shield(asyncio.wrap_future(call.future))
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                if call.waiters == 0 and not call.future.done():
+                    call.abandoned = True
+            if call.abandoned:
+                # Everyone waiting has been cancelled; stop the work too
+                call.future.cancel()
+
+    def _forget(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executions': self.executions,
+                'coalesced': self.coalesced
+            }
@@ -0,0 +1,178 @@
+import re
+import json
+import hashlib
+import threading
+from collections import deque
+
+# Lowercase word tokens, keeping the symbols in names like C++, C# and Node.js
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+
+# "Category (Skill, Skill)" entries in the job skills database
+GROUPED_ENTRY = re.compile(r'^(?P<category>[^(]+)\((?P<skills>[^)]+)\)\s*$')
+
+DEFAULT_CATEGORY = 'Professional Skills'
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TokenAutomaton:
+    """Aho-Corasick automaton over word tokens.
+
+    Phrases are matched on whole tokens, so "java" never matches inside
+    "javascript". Searching is a single pass over the tokens however many
+    phrases are indexed.
+    """
+
+    def __init__(self, phrases):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # node -> [(phrase length, value)]
+
+        for tokens, value in phrases:
+            node = 0
+            for token in tokens:
+                if token not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][token] = len(self.goto) - 1
+                node = self.goto[node][token]
+            self.output[node].append((len(tokens), value))
+
+        # Breadth-first failure links; outputs inherit their fallback's outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def search(self, tokens):
+        """Yield (first token index, last token index + 1, value) for every match"""
+        node = 0
+        for index, token in enumerate(tokens):
+            while node and token not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(token, 0)
+            for length, value in self.output[node]:
+                yield index + 1 - length, index + 1, value
+
+
+class SkillExtractor:
+    """Deterministic skill extraction against a configurable taxonomy.
+
+    The taxonomy maps categories to canonical skills and their aliases. It
+    is read from config['skill_taxonomy'] and seeded with every skill in
+    config['job_skills_database']. Aliases resolve to the canonical name,
+    overlapping mentions keep the longest phrase, and results are grouped
+    by category.
+    """
+
+    def __init__(self, config):
+        self._lock = threading.Lock()
+        self.rebuild(config)
+
+    def rebuild(self, config):
+        """Re-index the taxonomy, e.g. after a config reload"""
+        taxonomy = self.build_taxonomy(config)
+        phrases = []
+        for category, skills in taxonomy.items():
+            for skill, aliases in skills.items():
+                for phrase in [skill] + aliases:
+                    tokens = tuple(tokenize(phrase))
+                    if tokens:
+                        phrases.append((tokens, (category, skill)))
+
+        automaton = TokenAutomaton(phrases)
+        version = hashlib.sha256(json.dumps(taxonomy, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        with self._lock:
+            self.taxonomy = taxonomy
+            self.automaton = automaton
+            self.version = version
+            self.phrase_count = len(phrases)
+
+    @staticmethod
+    def build_taxonomy(config):
+        """Merge config['skill_taxonomy'] with the skills of every job role"""
+        taxonomy = {}
+        known = set()
+        for category, skills in config.get('skill_taxonomy', {}).items():
+            taxonomy[category] = {skill: list(aliases) for skill, aliases in skills.items()}
+            for skill, aliases in skills.items():
+                known.update(name.lower() for name in [skill] + list(aliases))
+
+        def add(category, skill, aliases=()):
+            if skill.lower() in known:
+                return
+            taxonomy.setdefault(category, {})[skill] = [alias for alias in aliases if alias.lower() not in known]
+            known.update(name.lower() for name in [skill] + list(aliases))
+
+        for required_skills in config.get('job_skills_database', {}).values():
+            for entry in required_skills:
+                grouped = GROUPED_ENTRY.match(entry)
+                if grouped:
+                    category = grouped.group('category').strip()
+                    for skill in grouped.group('skills').split(','):
+                        add(category, skill.strip())
+                    continue
+
+                # "SEO/SEM" also matches either half; "A/B Testing" only as a whole
+                parts = [part.strip() for part in entry.split('/')]
+                aliases = parts if len(parts) > 1 and all(len(part) > 1 and ' ' not in part for part in parts) else []
+                add(DEFAULT_CATEGORY, entry, aliases)
+
+        return taxonomy
+
+    def extract(self, text):
+        """Return {'categories': {category: [skill]}, 'mentions': {skill: count}}"""
+        with self._lock:
+            automaton = self.automaton
+            taxonomy = self.taxonomy
+
+        tokens = tokenize(text)
+
+        # Leftmost-longest: drop matches that overlap an earlier or longer one
+        matches = sorted(automaton.search(tokens), key=lambda match: (match[0], match[0] - match[1]))
+        mentions = {}
+        covered_until = 0
+        for start, end, (category, skill) in matches:
+            if start < covered_until:
+                continue
+            covered_until = end
+            mentions[(category, skill)] = mentions.get((category, skill), 0) + 1
+
+        categories = {}
+        for category in taxonomy:
+            found = [skill for (skill_category, skill) in mentions if skill_category == category]
+            if found:
+                categories[category] = sorted(found, key=lambda skill: -mentions[(category, skill)])
+
+        return {
+            'categories': categories,
+            'mentions': {skill: count for (_, skill), count in mentions.items()}
+        }
+
+    @staticmethod
+    def format_skills(structured):
+        """Render structured skills as the plain-text list the prompts expect"""
+        if not structured['categories']:
+            return "No skills from the skill taxonomy were found."
+        return "\n".join(
+            f"{category}: {', '.join(skills)}"
+            for category, skills in structured['categories'].items()
+        )
+
+    def stats(self):
+        return {
+            'version': self.version,
+            'categories': len(self.taxonomy),
+            'skills': sum(len(skills) for skills in self.taxonomy.values()),
+            'phrases': self.phrase_count
+        }
@@ -0,0 +1,259 @@
+import os
+import re
+import math
+import threading
+
+import numpy as np
+
+from skill_extractor import GROUPED_ENTRY
+
+# Lowercase words, keeping the symbols in names like C++ and C#
+NORMALIZE = re.compile(r'[^a-z0-9+#]+')
+
+# Candidate skill lists are split on line breaks, list separators and brackets
+SPLIT_SKILLS = re.compile(r'[\n,;•|()\[\]]+|\s+and\s+')
+LIST_MARKER = re.compile(r'^[\s\-*#\d.)]+')
+
+# Longest candidate phrase echoed back as the evidence for a matched skill
+MAX_EVIDENCE_CHARS = 60
+
+GENERIC_SKILLS = ["General professional skills", "Communication", "Problem solving", "Teamwork"]
+
+
+def char_ngrams(text, n=3):
+    """Return the character n-grams of each word, padded at word boundaries"""
+    grams = []
+    for word in NORMALIZE.sub(' ', text.lower()).split():
+        padded = f" {word} "
+        grams.extend(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+    return grams
+
+
+def skill_facets(entry):
+    """Return the phrases a required skill entry can be satisfied by.
+
+    "Programming Languages (Python, Java)" is covered by any listed
+    language, "SEO/SEM" by either half, and every entry by its own text.
+    """
+    facets = [entry]
+    grouped = GROUPED_ENTRY.match(entry)
+    if grouped:
+        facets.extend(skill.strip() for skill in grouped.group('skills').split(',') if skill.strip())
+    elif '/' in entry:
+        facets.extend(part.strip() for part in entry.split('/') if len(part.strip()) > 1)
+    return facets
+
+
+def skills_text(skills):
+    """Return skills given as text or as a list of phrases as newline-separated text"""
+    if isinstance(skills, (list, tuple)):
+        return "\n".join(str(skill) for skill in skills if skill)
+    return skills or ''
+
+
+def split_candidate_skills(text):
+    """Split a free-text skills list (or a list of phrases) into individual skill phrases"""
+    items = []
+    for line in skills_text(text).splitlines():
+        # Drop "Category:" labels so they do not match required skill names
+        if ':' in line:
+            line = line.split(':', 1)[1]
+        for item in SPLIT_SKILLS.split(line):
+            item = LIST_MARKER.sub('', item).strip()
+            if item:
+                items.append(item)
+    return items
+
+
+class CharNgramVectorizer:
+    """TF-IDF over character trigrams, fitted on a fixed corpus.
+
+    Rows are L2-normalized, so a matrix product of two transforms is the
+    cosine similarity of every pair. N-grams outside the corpus are ignored.
+    """
+
+    def __init__(self, documents, n=3):
+        self.n = n
+        self.vocabulary = {}
+        document_frequency = []
+        for document in documents:
+            for gram in set(char_ngrams(document, n)):
+                if gram not in self.vocabulary:
+                    self.vocabulary[gram] = len(self.vocabulary)
+                    document_frequency.append(0)
+                document_frequency[self.vocabulary[gram]] += 1
+
+        count = len(documents)
+        self.idf = np.array(
+            [math.log((1 + count) / (1 + frequency)) + 1 for frequency in document_frequency],
+            dtype=np.float32
+        )
+
+    def transform(self, texts):
+        matrix = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for gram in char_ngrams(text, self.n):
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    matrix[row, column] += 1
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class SkillMatcher:
+    """Deterministic skill-gap scoring against the job skills database.
+
+    Every required skill facet and role name is vectorized once. A gap
+    check vectorizes the candidate's skills and scores all facets against
+    all of them with one matrix product; each required skill takes its best
+    facet. Free-text job roles resolve to the nearest known role, or to a
+    generic skill list below role_threshold.
+    """
+
+    def __init__(self, config, skill_extractor=None, threshold=None, role_threshold=None):
+        self.skill_extractor = skill_extractor
+        self.threshold = threshold or float(os.getenv('SKILL_MATCH_THRESHOLD', '0.6'))
+        self.role_threshold = role_threshold or float(os.getenv('ROLE_MATCH_THRESHOLD', '0.4'))
+        self._lock = threading.Lock()
+        self.rebuild(config)
+
+    def rebuild(self, config):
+        """Re-vectorize roles and required skills, e.g. after a config reload"""
+        database = dict(config.get('job_skills_database', {}))
+        role_names = []  # (name, role)
+        for role in database:
+            role_names.append((role.replace('_', ' '), role))
+        for role, aliases in config.get('job_role_aliases', {}).items():
+            if role in database:
+                role_names.extend((alias, role) for alias in aliases)
+
+        skill_sets = {**database, None: GENERIC_SKILLS}
+        facets = {
+            role: [skill_facets(entry) for entry in skills]
+            for role, skills in skill_sets.items()
+        }
+        corpus = [name for name, _ in role_names] + [
+            facet for role_facets in facets.values() for entry_facets in role_facets for facet in entry_facets
+        ]
+        vectorizer = CharNgramVectorizer(corpus)
+
+        roles = {}
+        for role, role_facets in facets.items():
+            flat = [facet for entry_facets in role_facets for facet in entry_facets]
+            # Start of each skill's facets; a role without skills has none
+            offsets = np.cumsum([0] + [len(entry_facets) for entry_facets in role_facets[:-1]], dtype=int)
+            if not role_facets:
+                offsets = offsets[:0]
+            roles[role] = {
+                'skills': skill_sets[role],
+                'facets': flat,
+                'matrix': vectorizer.transform(flat),
+                'offsets': offsets
+            }
+
+        with self._lock:
+            self.vectorizer = vectorizer
+            self.roles = roles
+            self.role_labels = [role for _, role in role_names]
+            self.role_matrix = vectorizer.transform([name for name, _ in role_names])
+
+    def resolve_role(self, job_role):
+        """Return (role key or None, similarity) for a free-text job role"""
+        key = job_role.lower().replace(' ', '_')
+        with self._lock:
+            vectorizer, roles = self.vectorizer, self.roles
+            role_labels, role_matrix = self.role_labels, self.role_matrix
+        if key in roles:
+            return key, 1.0
+        if not role_labels:
+            return None, 0.0
+
+        scores = role_matrix @ vectorizer.transform([job_role])[0]
+        best = int(scores.argmax())
+        if scores[best] < self.role_threshold:
+            return None, float(scores[best])
+        return role_labels[best], float(scores[best])
+
+    def required_skills(self, job_role):
+        role, _ = self.resolve_role(job_role)
+        return self.roles[role]['skills']
+
+    def relevance(self, job_role, texts):
+        """Return each text's mean similarity to the role's required skill facets"""
+        role, _ = self.resolve_role(job_role)
+        with self._lock:
+            vectorizer, entry = self.vectorizer, self.roles[role]
+        if not texts or not entry['facets']:
+            return np.zeros(len(texts), dtype=np.float32)
+        return (entry['matrix'] @ vectorizer.transform(texts).T).mean(axis=0)
+
+    def candidate_skills(self, text):
+        """Split the candidate's skills text, adding canonical taxonomy names"""
+        text = skills_text(text)
+        items = split_candidate_skills(text)
+        if self.skill_extractor:
+            items.extend(self.skill_extractor.extract(text)['mentions'])
+        return items
+
+    def match(self, job_role, current_skills):
+        """Score the candidate's skills against the (resolved) role's required skills"""
+        role, role_score = self.resolve_role(job_role)
+        with self._lock:
+            vectorizer, entry = self.vectorizer, self.roles[role]
+
+        items = self.candidate_skills(current_skills)
+        if items:
+            # facets x candidate items cosine similarity in one product
+            similarity = entry['matrix'] @ vectorizer.transform(items).T
+            best_item = similarity.argmax(axis=1)
+            best_score = similarity.max(axis=1)
+        else:
+            best_item = np.zeros(len(entry['facets']), dtype=int)
+            best_score = np.zeros(len(entry['facets']), dtype=np.float32)
+
+        if len(entry['offsets']):
+            scores = np.maximum.reduceat(best_score, entry['offsets'])
+        else:
+            scores = np.zeros(0, dtype=np.float32)
+        bounds = list(entry['offsets']) + [len(entry['facets'])]
+
+        matched, missing = [], []
+        for index, skill in enumerate(entry['skills']):
+            score = round(float(scores[index]), 3)
+            if score >= self.threshold:
+                facet = bounds[index] + int(best_score[bounds[index]:bounds[index + 1]].argmax())
+                evidence = items[best_item[facet]]
+                if len(evidence) > MAX_EVIDENCE_CHARS:
+                    evidence = evidence[:MAX_EVIDENCE_CHARS].rsplit(' ', 1)[0] + '...'
+                matched.append({'skill': skill, 'score': score, 'matched_with': evidence})
+            else:
+                missing.append({'skill': skill, 'score': score})
+        missing.sort(key=lambda gap: gap['score'])
+
+        return {
+            'job_role': job_role,
+            'resolved_role': role,
+            'role_score': round(role_score, 3),
+            'required_skills': entry['skills'],
+            'coverage': round(len(matched) / len(entry['skills']), 3) if entry['skills'] else 0.0,
+            'score': round(float(scores.mean()), 3) if len(scores) else 0.0,
+            'matched': matched,
+            'missing': missing
+        }
+
+    @staticmethod
+    def format_match(match):
+        """Render a match as plain text for prompts and the fast analysis mode"""
+        role = match['resolved_role'].replace('_', ' ').title() if match['resolved_role'] else match['job_role']
+        lines = [
+            f"Skill coverage for {role}: {match['coverage']:.0%} "
+            f"({len(match['matched'])} of {len(match['required_skills'])} required skills)"
+        ]
+        if match['matched']:
+            lines.append("\nStrengths:")
+            lines.extend(f"- {gap['skill']} (shown by: {gap['matched_with']})" for gap in match['matched'])
+        if match['missing']:
+            lines.append("\nMissing skills, largest gaps first:")
+            lines.extend(f"- {gap['skill']}" for gap in match['missing'])
+        return "\n".join(lines)
@@ -0,0 +1,216 @@
+import os
+import gzip
+import hashlib
+import threading
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+    'application/json', 'image/svg+xml'
+}
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+
+# Files up to this size are held in memory with their compressed variants
+STATIC_CACHE_MAX_FILE = int(os.getenv('STATIC_CACHE_MAX_FILE', str(1024 * 1024)))
+STATIC_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', '3600'))
+
+
+def choose_encoding(accept_encoding):
+    """Return 'br', 'gzip' or None for an Accept-Encoding header"""
+    accepted = set()
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def is_compressible(mimetype):
+    return (mimetype or '').split(';')[0].strip() in COMPRESSIBLE_TYPES
+
+
+def compress_response(response, accept_encoding):
+    """Compress a buffered Flask response in place when the client accepts it"""
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or 'Content-Encoding' in response.headers or not is_compressible(response.mimetype)):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(accept_encoding)
+    if encoding:
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def parse_range(header, size):
+    """Return (start, end) inclusive for a single bytes range, or None if unsatisfiable"""
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        return None
+    start, _, end = spec.strip().partition('-')
+    try:
+        if not start:
+            length = int(end)
+            if length <= 0:
+                return None
+            return max(0, size - length), size - 1
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+class StaticFileCache:
+    """Small files with their ETag and compressed variants, refreshed when they change"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # path -> (mtime_ns, size, etag, data, variants)
+
+    def get(self, path, stat):
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry
+        with open(path, 'rb') as f:
+            data = f.read()
+        entry = (stat.st_mtime_ns, stat.st_size, f'"{hashlib.sha256(data).hexdigest()[:32]}"', data, {})
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    def variant(self, entry, encoding):
+        variants = entry[4]
+        if encoding not in variants:
+            variants[encoding] = compress(entry[3], encoding)
+        return variants[encoding]
+
+
+class StaticFileHandler(SimpleHTTPRequestHandler):
+    """Static files with ETag revalidation, single byte ranges and gzip/brotli.
+
+    Meant for a ThreadingHTTPServer, so a slow client holds one thread
+    rather than the whole server. HTML is revalidated on every load
+    (``no-cache`` plus ETag, answered with 304 when unchanged); other files
+    are cached for STATIC_MAX_AGE seconds.
+    """
+
+    file_cache = StaticFileCache()
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def _serve(self, send_body):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+        mimetype = self.guess_type(path)
+
+        if stat.st_size <= STATIC_CACHE_MAX_FILE:
+            entry = self.file_cache.get(path, stat)
+            etag, data = entry[2], entry[3]
+        else:
+            entry, data = None, None
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+        headers = {
+            'ETag': etag,
+            'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+            'Cache-Control': 'no-cache' if mimetype == 'text/html' else f'public, max-age={STATIC_MAX_AGE}',
+            'Accept-Ranges': 'bytes'
+        }
+        if is_compressible(mimetype):
+            headers['Vary'] = 'Accept-Encoding'
+
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self._send(HTTPStatus.NOT_MODIFIED, headers)
+            return
+
+        byte_range = None
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range', etag) == etag:
+            byte_range = parse_range(range_header, stat.st_size)
+            if byte_range is None:
+                self._send(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                           dict(headers, **{'Content-Range': f'bytes */{stat.st_size}'}))
+                return
+
+        headers['Content-Type'] = mimetype
+        start, length = 0, stat.st_size
+        body = data
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            headers['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            status = HTTPStatus.PARTIAL_CONTENT
+            if data is not None:
+                body = data[start:end + 1]
+        else:
+            status = HTTPStatus.OK
+            encoding = None
+            if entry and is_compressible(mimetype) and stat.st_size >= COMPRESS_MIN_BYTES:
+                encoding = choose_encoding(self.headers.get('Accept-Encoding'))
+            if encoding:
+                body = self.file_cache.variant(entry, encoding)
+                headers['Content-Encoding'] = encoding
+                length = len(body)
+
+        headers['Content-Length'] = str(length)
+        self._send(status, headers)
+        if not send_body:
+            return
+        if body is not None:
+            self.wfile.write(body)
+        else:
+            self._copy(path, start, length)
+
+    def _copy(self, path, offset, length):
+        """Stream part of a large file without reading it into memory"""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            while length > 0:
+                chunk = f.read(min(length, 64 * 1024))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                length -= len(chunk)
+
+    def _send(self, status, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if 'Content-Length' not in headers and status != HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Length', '0')
+        self.end_headers()
@@ -1,16 +1,66 @@
 import edge_tts
 import asyncio
+import concurrent.futures
 import os
-import tempfile
-import hashlib
-from datetime import datetime
+import re
+import time
+from audio_cache import AudioCache
+from background_loop import get_background_loop
+from singleflight import SingleFlight
+from admission import AdmissionController, UpstreamBusy
+from metrics import get_metrics
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?;:])\s+|\n+')
+
+def split_sentences(text, max_chars=300):
+    """Split text into speakable chunks at sentence boundaries.
+
+    The first sentence is kept on its own so it can be synthesized and
+    played quickly; later sentences are grouped up to max_chars. Sentences
+    longer than max_chars are broken at the last space before the limit.
+    """
+    sentences = []
+    for sentence in SENTENCE_BOUNDARY.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            sentences.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            sentences.append(sentence)
+    
+    if not sentences:
+        return []
+    
+    chunks = [sentences[0]]
+    current = ""
+    for sentence in sentences[1:]:
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
 
 class TTSGenerator:
     def __init__(self):
         # Create temp directory for audio files
-        self.temp_dir = 'temp_audio'
+        self.temp_dir = os.getenv('TTS_AUDIO_DIR', 'temp_audio')
         os.makedirs(self.temp_dir, exist_ok=True)
         
+        # edge-tts, or the offline stand-in for benchmarks (TTS_BACKEND=fake)
+        self.backend = edge_tts
+        if os.getenv('TTS_BACKEND', 'edge') == 'fake':
+            import fake_tts
+            self.backend = fake_tts
+        
+        # Content-addressed audio cache keyed by (text, voice, rate, volume)
+        self.cache = AudioCache(self.temp_dir)
+        
         # Available voices (you can add more)
         self.voices = {
             'female': 'en-US-JennyNeural',
@@ -21,71 +71,141 @@ class TTSGenerator:
         self.default_voice = self.voices['default']
         self.default_rate = '+0%'
         self.default_volume = '+0%'
+        
+        # Chunked synthesis settings and chunks still being generated
+        self.chunk_max_chars = int(os.getenv('TTS_CHUNK_MAX_CHARS', '300'))
+        self.chunk_workers = int(os.getenv('TTS_CHUNK_WORKERS', '3'))
+        self.background_loop = get_background_loop()
+        self._pending = {}
+        
+        # Identical concurrent utterances share one edge-tts synthesis
+        self.inflight = SingleFlight('tts', enabled=os.getenv('TTS_SINGLEFLIGHT', '1') != '0')
+        
+        # Bounded concurrency and wait queue for edge-tts (TTS_CONCURRENCY, TTS_QUEUE_SIZE, ...)
+        self.admission = AdmissionController('edge-tts', 'TTS', default_concurrency=8)
+        self.metrics = get_metrics()
     
     async def generate_speech(self, text, voice=None, rate=None, volume=None):
         """Generate speech from text using edge-tts"""
+        with self.metrics.span('tts'):
+            return await self._generate_speech(text, voice, rate, volume)
+    
+    async def _generate_speech(self, text, voice, rate, volume):
+        """Serve an utterance from the audio cache or a coalesced synthesis"""
         try:
             # Use defaults if not specified
             voice = voice or self.default_voice
             rate = rate or self.default_rate
             volume = volume or self.default_volume
             
-            # Create a unique filename based on text hash
-            text_hash = hashlib.md5(text.encode()).hexdigest()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"tts_{text_hash}_{timestamp}.mp3"
-            filepath = os.path.join(self.temp_dir, filename)
-            
-            # Check if file already exists (cache)
-            if os.path.exists(filepath):
-                return filepath
+            # Serve identical utterances from the cache
+            cache_key = self.cache.make_key(text, voice, rate, volume)
+            cached_path = self.cache.lookup(cache_key)
+            if cached_path:
+                return cached_path
             
-            # Generate speech
-            communicate = edge_tts.Communicate(
-                text=text,
-                voice=voice,
-                rate=rate,
-                volume=volume
+            return await self.inflight.do(
+                cache_key, lambda: self._synthesize(cache_key, text, voice, rate, volume)
             )
             
-            await communicate.save(filepath)
-            
-            # Clean up old files (keep only last 50 files)
-            await self._cleanup_old_files()
-            
-            return filepath
-            
+        except UpstreamBusy:
+            raise
         except Exception as e:
             print(f"TTS generation error: {e}")
             raise Exception(f"Failed to generate speech: {str(e)}")
     
-    async def _cleanup_old_files(self, max_files=50):
-        """Clean up old audio files to prevent disk space issues"""
+    async def _synthesize(self, cache_key, text, voice, rate, volume):
+        """Generate speech into a private file, then publish it to the cache atomically"""
+        partial_path = self.cache.partial_path_for(cache_key)
+        communicate = self.backend.Communicate(
+            text=text,
+            voice=voice,
+            rate=rate,
+            volume=volume
+        )
+        
         try:
-            files = []
-            for filename in os.listdir(self.temp_dir):
-                if filename.endswith('.mp3'):
-                    filepath = os.path.join(self.temp_dir, filename)
-                    files.append((filepath, os.path.getctime(filepath)))
-            
-            # Sort by creation time, newest first
-            files.sort(key=lambda x: x[1], reverse=True)
-            
-            # Remove excess files
-            if len(files) > max_files:
-                for filepath, _ in files[max_files:]:
-                    try:
-                        os.unlink(filepath)
-                    except:
-                        pass  # Ignore errors during cleanup
-                        
+            async with self.admission.slot():
+                with self.metrics.upstream('tts', 'edge-tts'):
+                    await communicate.save(partial_path)
+            return self.cache.add(cache_key, partial_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.unlink(partial_path)
+    
+    def start_playlist(self, text, voice=None, rate=None, volume=None):
+        """Start chunked synthesis and return the ordered chunk filenames immediately.
+
+        Chunk files are content-addressed, so their names are known before
+        synthesis finishes; serve them through wait_for_audio().
+        """
+        voice = voice or self.default_voice
+        rate = rate or self.default_rate
+        volume = volume or self.default_volume
+        
+        chunks = split_sentences(text, self.chunk_max_chars)
+        filenames = [
+            self.cache.filename_for(self.cache.make_key(chunk, voice, rate, volume))
+            for chunk in chunks
+        ]
+        
+        chunk_futures = []
+        for filename in filenames:
+            future = concurrent.futures.Future()
+            if self._pending.setdefault(filename, future) is future:
+                # Other workers may be asked for the chunk before it exists
+                self.cache.mark_pending(filename)
+                future.add_done_callback(lambda _, name=filename, f=future: self._clear_pending(name, f))
+            chunk_futures.append(future)
+        
+        self.background_loop.submit(
+            self._synthesize_chunks(chunks, chunk_futures, voice, rate, volume)
+        )
+        return filenames
+    
+    async def _synthesize_chunks(self, chunks, chunk_futures, voice, rate, volume):
+        """Synthesize chunks in order with a bounded number of workers"""
+        semaphore = asyncio.Semaphore(self.chunk_workers)
+        
+        async def synthesize(chunk, result):
+            async with semaphore:
+                try:
+                    path = await self.generate_speech(chunk, voice=voice, rate=rate, volume=volume)
+                    if not result.done():
+                        result.set_result(path)
+                except BaseException as e:
+                    if not result.done():
+                        result.set_exception(e)
+                    if isinstance(e, asyncio.CancelledError):
+                        raise
+        
+        # Coroutines start in order, so earlier chunks acquire workers first
+        await asyncio.gather(*[
+            synthesize(chunk, result) for chunk, result in zip(chunks, chunk_futures)
+        ])
+    
+    def _clear_pending(self, filename, future):
+        if self._pending.get(filename) is future:
+            del self._pending[filename]
+            self.cache.clear_pending(filename)
+    
+    def wait_for_audio(self, filename, timeout=60):
+        """Block until a chunk started by start_playlist(), in any worker, has been synthesized"""
+        future = self._pending.get(filename)
+        if future is None:
+            deadline = time.monotonic() + timeout
+            while self.cache.is_pending(filename) and time.monotonic() < deadline:
+                time.sleep(0.1)
+            return
+        try:
+            future.result(timeout)
         except Exception as e:
-            print(f"Cleanup error: {e}")
+            print(f"Waiting for audio chunk failed: {e}")
     
     async def get_available_voices(self):
         """Get list of available voices"""
         try:
-            voices = await edge_tts.list_voices()
+            voices = await self.backend.list_voices()
             return [
                 {
                     'name': voice['Name'],
@@ -111,17 +231,19 @@ class TTSGenerator:
         if volume:
             self.default_volume = volume
     
-    async def generate_welcome_message(self, options):
-        """Generate welcome message with options"""
+    def build_welcome_text(self, options):
+        """Build the spoken welcome message listing the options"""
         welcome_text = "Welcome to Skillmotion AI Assistant. I can help you with: "
         
         option_texts = []
         for i, option in enumerate(options, 1):
             option_texts.append(f"{i}. {option['title']}")
         
-        full_text = welcome_text + ", ".join(option_texts) + ". Please say or select an option."
-        
-        return await self.generate_speech(full_text)
+        return welcome_text + ", ".join(option_texts) + ". Please say or select an option."
+    
+    async def generate_welcome_message(self, options):
+        """Generate welcome message with options"""
+        return await self.generate_speech(self.build_welcome_text(options))
     
     async def generate_response_with_emotion(self, text, emotion='neutral'):
         """Generate speech with different emotional tones"""
@@ -144,4 +266,73 @@ class TTSGenerator:
         selected_voice = voice_mapping.get(emotion, self.default_voice)
         selected_rate = rate_mapping.get(emotion, self.default_rate)
         
-        return await self.generate_speech(text, voice=selected_voice, rate=selected_rate)
\ No newline at end of file
+        return await self.generate_speech(text, voice=selected_voice, rate=selected_rate)
+
+
+class TTSWarmup:
+    """Pre-synthesize fixed phrases into the audio cache in the background"""
+    
+    def __init__(self, tts_generator, config, concurrency=None):
+        self.tts_generator = tts_generator
+        self.config = config
+        self.concurrency = concurrency or int(os.getenv('TTS_WARMUP_CONCURRENCY', '2'))
+        self.background_loop = get_background_loop()
+        
+        self.runs = 0
+        self.warmed = 0
+        self.failed = 0
+        self.last_duration = None
+        self._future = None
+    
+    def collect_phrases(self):
+        """Return the fixed utterances derived from the configuration"""
+        phrases = []
+        if self.config.get('welcome_message'):
+            phrases.append(self.config['welcome_message'])
+        if self.config.get('skill_profile_summary'):
+            phrases.append(self.config['skill_profile_summary'])
+        if self.config.get('options'):
+            phrases.append(self.tts_generator.build_welcome_text(self.config['options']))
+        phrases.extend(self.config.get('tts_warmup_phrases', []))
+        
+        # Preserve order, drop duplicates
+        return list(dict.fromkeys(phrases))
+    
+    def schedule(self, config=None):
+        """Start a warm-up run on the background loop, replacing any run in progress"""
+        if self._future and not self._future.done():
+            self._future.cancel()
+        self._future = self.background_loop.submit(self.warm())
+        return self._future
+    
+    async def warm(self):
+        """Synthesize all phrases with bounded concurrency"""
+        phrases = self.collect_phrases()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def warm_one(text):
+            async with semaphore:
+                try:
+                    await self.tts_generator.generate_speech(text)
+                    return True
+                except Exception as e:
+                    print(f"TTS warm-up failed: {e}")
+                    return False
+        
+        start = time.perf_counter()
+        results = await asyncio.gather(*[warm_one(text) for text in phrases])
+        
+        self.runs += 1
+        self.warmed = sum(results)
+        self.failed = len(results) - self.warmed
+        self.last_duration = time.perf_counter() - start
+        print(f"🔥 TTS warm-up: {self.warmed}/{len(results)} phrases cached in {self.last_duration:.1f}s")
+        return self.warmed
+    
+    def stats(self):
+        return {
+            'runs': self.runs,
+            'warmed': self.warmed,
+            'failed': self.failed,
+            'last_duration': self.last_duration
+        }
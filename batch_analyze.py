@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Skillmotion AI Assistant Batch Screening
+Screens a directory of PDF resumes against one job role and writes JSONL
+
+    python batch_analyze.py resumes/ --job-role "Data Scientist" --output results.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+
+def load_documents(directory, recursive=False):
+    """Read every PDF in a directory as (name, bytes) pairs"""
+    pattern = '**/*.pdf' if recursive else '*.pdf'
+    paths = sorted(path for path in Path(directory).glob(pattern) if path.is_file())
+    return [(str(path.relative_to(directory)), path.read_bytes()) for path in paths]
+
+
+async def screen(documents, job_role, output):
+    from app import batch_analyzer, get_required_skills
+
+    async for record in batch_analyzer.run(documents, job_role, get_required_skills(job_role)):
+        if record['type'] == 'progress':
+            print(f"[{record['completed']}/{record['total']}] screened", file=sys.stderr)
+        else:
+            if record['status'] != 'ok':
+                print(f"   {record['file']}: {record['error']}", file=sys.stderr)
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Screen a directory of PDF resumes against a job role")
+    parser.add_argument('directory', help="directory containing PDF resumes")
+    parser.add_argument('--job-role', required=True, help="job role to screen against")
+    parser.add_argument('--output', help="JSONL file to write (default: stdout)")
+    parser.add_argument('--recursive', action='store_true', help="include PDFs in subdirectories")
+    args = parser.parse_args()
+
+    directory = Path(args.directory).resolve()
+    if not directory.is_dir():
+        parser.error(f"{args.directory} is not a directory")
+    output_path = Path(args.output).resolve() if args.output else None
+
+    documents = load_documents(directory, args.recursive)
+    if not documents:
+        parser.error(f"No PDF files found in {args.directory}")
+    print(f"📄 Screening {len(documents)} resumes for {args.job_role}", file=sys.stderr)
+
+    # The backend resolves config/ and cache/ relative to the project root
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT / 'backend'))
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    output = open(output_path, 'w') if output_path else sys.stdout
+    try:
+        asyncio.run(screen(documents, args.job_role, output))
+    except KeyboardInterrupt:
+        print("\n🛑 Batch screening interrupted", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if output_path:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark for per-upstream admission control under a burst.
+
+A fake provider accepts at most ``--provider-limit`` concurrent requests
+and answers 429 beyond that, like a real provider's rate limit. A burst of
+``--requests`` uncached LLM calls is sent with admission effectively off,
+with a concurrency limit matching the provider's plus a bounded queue and
+deadline, and with the same limit queueing every request:
+
+    python benchmarks/bench_admission.py --requests 200 --provider-limit 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from fake_llm_server import FakeLLMServer
+
+
+def percentile_ms(values, fraction):
+    if not values:
+        return f"{'-':>11}"
+    ordered = sorted(values)
+    return f"{ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000:>9.0f}ms"
+
+
+async def burst(llm_query, requests):
+    from admission import UpstreamBusy
+
+    served, busy, failed = [], [], []
+
+    async def one(index):
+        start = time.perf_counter()
+        try:
+            # Above the cache temperature: every call goes upstream
+            await llm_query.query_llm(f"Burst question {index}", max_tokens=16, temperature=0.9)
+            served.append(time.perf_counter() - start)
+        except UpstreamBusy:
+            busy.append(time.perf_counter() - start)
+        except Exception:
+            failed.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(index) for index in range(requests)])
+    return served, busy, failed, time.perf_counter() - start
+
+
+def run(args, server, label, concurrency, queue_size, queue_timeout):
+    from llm_query import LLMQuery
+    from llm_cache import LLMResponseCache
+    from llm_providers import ProviderPool
+    from admission import AdmissionController
+
+    pool = ProviderPool(pool_size=args.requests)
+    pool.admission['groq'] = AdmissionController(
+        'LLM provider groq', 'LLM', concurrency=concurrency, queue_size=queue_size, queue_timeout=queue_timeout
+    )
+    llm_query = LLMQuery(
+        provider_pool=pool, response_cache=LLMResponseCache(path=os.path.join(tempfile.mkdtemp(), 'llm.db'))
+    )
+
+    server.state.reset()
+    served, busy, failed, elapsed = asyncio.run(burst(llm_query, args.requests))
+    upstream = server.state.stats()
+    print(f"{label:<12}{len(served):>7}{len(busy):>7}{len(failed):>8}"
+          f"{percentile_ms(served, 0.5)}{percentile_ms(served, 0.95)}{percentile_ms(busy, 0.5)}{elapsed:>8.2f}s"
+          f"{upstream['requests']:>10}{upstream['rate_limited']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark admission control against a rate-limited provider")
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--provider-limit', type=int, default=10, help="Provider's concurrent request limit")
+    parser.add_argument('--queue-size', type=int, default=50)
+    parser.add_argument('--queue-timeout', type=float, default=5.0)
+    parser.add_argument('--retries', type=int, default=2, help="SDK retries per request")
+    args = parser.parse_args()
+
+    server = FakeLLMServer(latency=args.latency, reply_tokens=16, max_concurrency=args.provider_limit).start()
+    os.environ.update({
+        'GROQ_API_KEY': 'fake', 'GROQ_BASE_URL': server.base_url, 'LLM_MAX_RETRIES': str(args.retries)
+    })
+    os.environ.pop('OPENAI_API_KEY', None)
+
+    print(f"{args.requests} concurrent requests, provider limit {args.provider_limit}, "
+          f"latency {args.latency:.2f}s, {args.retries} SDK retries")
+    print(f"{'mode':<12}{'served':>7}{'busy':>7}{'failed':>8}{'p50':>11}{'p95':>11}{'busy p50':>11}"
+          f"{'wall':>9}{'upstream':>10}{'429s':>8}")
+    run(args, server, 'unbounded', args.requests, 0, 60)
+    run(args, server, 'admission', args.provider_limit, args.queue_size, args.queue_timeout)
+    run(args, server, 'queue all', args.provider_limit, args.requests, 60)
+
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark for latency-aware provider routing, hedging and circuit breakers.
+
+Runs two fake providers. In the ``tail`` scenario the primary is usually
+fast but sometimes stalls, and requests run with hedging off and on. In
+the ``outage`` scenario the primary serves the first half of the requests
+and then fails every one; the second half is measured with a static
+primary-then-fallback order (the previous behaviour) and with routing:
+
+    python benchmarks/bench_hedging.py --scenario tail --requests 200
+    python benchmarks/bench_hedging.py --scenario outage --requests 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from fake_llm_server import FakeLLMServer
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def drive(llm_query, first, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(index):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                # Unique prompts above the cache temperature: every call goes upstream
+                await llm_query.query_llm(f"Career question {index}", max_tokens=16, temperature=0.9)
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(index) for index in range(first, first + requests)])
+    return latencies, errors, time.perf_counter() - start
+
+
+def run(args, servers, label, outage=False, static=False, **router_options):
+    from llm_query import LLMQuery
+    from llm_cache import LLMResponseCache
+    from provider_router import ProviderRouter
+
+    class StaticRouter(ProviderRouter):
+        """Always the configured order and no circuit breaker, like plain fallback"""
+
+        def ranked(self):
+            return list(self.order)
+
+    router_class = StaticRouter if static else ProviderRouter
+    if static:
+        router_options['failure_threshold'] = 10 ** 9
+
+    servers[0].state.error_rate = 0.0
+    llm_query = LLMQuery(response_cache=LLMResponseCache(path=os.path.join(tempfile.mkdtemp(), 'llm.db')))
+    llm_query.router = router_class(llm_query.provider_pool, ['groq', 'openai'], **router_options)
+
+    async def scenario():
+        first = 0
+        if outage:
+            # Build up a healthy latency history, then take the primary down
+            first = args.requests // 2
+            await drive(llm_query, 0, first, args.concurrency)
+            servers[0].state.error_rate = 1.0
+        for server in servers:
+            server.state.reset()
+        return await drive(llm_query, first, args.requests - first, args.concurrency)
+
+    latencies, errors, elapsed = asyncio.run(scenario())
+    stats = llm_query.router.stats()
+    if latencies:
+        timings = ''.join(
+            f"{percentile(latencies, fraction) * 1000:>9.0f}ms" for fraction in (0.5, 0.95, 0.99)
+        ) + f"{max(latencies) * 1000:>9.0f}ms"
+    else:
+        timings = f"{'-':>11}" * 4
+    print(f"{label:<16}{timings}{errors:>8}{elapsed:>9.2f}s"
+          f"{servers[0].state.stats()['requests']:>8}{servers[1].state.stats()['requests']:>8}"
+          f"{stats['hedged']:>8}{stats['hedge_wins']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark provider routing, hedging and circuit breakers")
+    parser.add_argument('--scenario', choices=['tail', 'outage'], default='tail')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.1, help="Primary's usual latency")
+    parser.add_argument('--slow-rate', type=float, default=0.1, help="Fraction of primary requests that stall")
+    parser.add_argument('--slow-latency', type=float, default=3.0)
+    parser.add_argument('--secondary-latency', type=float, default=0.3)
+    args = parser.parse_args()
+
+    slow_rate = args.slow_rate if args.scenario == 'tail' else 0.0
+    primary = FakeLLMServer(latency=args.latency, slow_rate=slow_rate,
+                            slow_latency=args.slow_latency, reply_tokens=16).start()
+    secondary = FakeLLMServer(latency=args.secondary_latency, reply_tokens=16).start()
+
+    os.environ.update({
+        'GROQ_API_KEY': 'fake', 'GROQ_BASE_URL': primary.base_url,
+        'OPENAI_API_KEY': 'fake', 'OPENAI_BASE_URL': f"{secondary.base_url}/v1",
+        'LLM_POOL_SIZE': str(args.concurrency * 2), 'LLM_MAX_RETRIES': '0'
+    })
+
+    print(f"scenario {args.scenario}: {args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'mode':<16}{'p50':>11}{'p95':>11}{'p99':>11}{'max':>11}{'errors':>8}{'wall':>10}"
+          f"{'primary':>8}{'second':>8}{'hedged':>8}{'wins':>6}")
+    if args.scenario == 'tail':
+        run(args, [primary, secondary], 'no hedging', hedge=False)
+        run(args, [primary, secondary], 'hedging', hedge=True, hedge_delay=args.latency * 3, min_samples=20)
+    else:
+        run(args, [primary, secondary], 'static order', outage=True, static=True, hedge=False)
+        run(args, [primary, secondary], 'routing', outage=True, hedge=False, failure_threshold=5, reset_timeout=30)
+
+    primary.stop()
+    secondary.stop()
+
+
+if __name__ == '__main__':
+    main()
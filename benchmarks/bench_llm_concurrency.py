@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the LLM provider layer.
+
+Starts a local fake provider with fixed latency and fires concurrent
+``LLMQuery.query_llm`` calls at it. With a non-blocking pooled client the
+wall time stays close to a single round-trip instead of growing linearly:
+
+    python benchmarks/bench_llm_concurrency.py --requests 50 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from fake_llm_server import FakeLLMServer
+
+
+async def run_burst(llm_query, count):
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        llm_query.query_llm(f"Benchmark prompt {i}", max_tokens=32)
+        for i in range(count)
+    ])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent LLM calls against a fake provider")
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--pool-size', type=int, default=20)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(latency=args.latency).start()
+    os.environ['GROQ_API_KEY'] = 'fake'
+    os.environ['GROQ_BASE_URL'] = server.base_url
+    os.environ.pop('OPENAI_API_KEY', None)
+    os.environ['LLM_POOL_SIZE'] = str(args.pool_size)
+
+    from llm_query import LLMQuery
+    llm_query = LLMQuery()
+
+    # Warm the connection pool so the measurement excludes connection setup
+    asyncio.run(run_burst(llm_query, min(args.pool_size, args.requests)))
+    server.state.reset()
+
+    elapsed = asyncio.run(run_burst(llm_query, args.requests))
+    serial = args.requests * args.latency
+    waves = -(-args.requests // args.pool_size)
+
+    print(f"requests:          {args.requests}")
+    print(f"provider latency:  {args.latency:.3f}s")
+    print(f"pool size:         {args.pool_size}")
+    print(f"wall time:         {elapsed:.3f}s")
+    print(f"serial estimate:   {serial:.3f}s")
+    print(f"pooled estimate:   {waves * args.latency:.3f}s")
+    print(f"max in flight:     {server.state.stats()['max_in_flight']}")
+    print(f"throughput:        {args.requests / elapsed:.1f} req/s")
+
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for ResumeParser on synthetic PDF resumes.
+
+Times each parser method per page count: upload validation, in-process
+PyMuPDF extraction, the pdfminer fallback, extraction through the process
+pool (what uploads use), text cleaning, the section/contact scanner and
+its two wrappers. Reports p50/p95/p99 and single-threaded operations per
+second; save a run and compare a later one against it:
+
+    python benchmarks/bench_resume_parser.py --pages 1 3 10 --repeat 30 --output parser.json
+    python benchmarks/bench_resume_parser.py --pages 1 3 10 --repeat 30 --baseline parser.json
+"""
+
+import argparse
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from resume_parser import ResumeParser
+from resume_corpus import resume_pdf
+import latency
+
+METHODS = ['validate_bytes', 'fitz', 'pdfminer', 'pool', 'clean_text', 'scan', 'extract_sections',
+           'extract_contact_info']
+
+
+def time_calls(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark ResumeParser methods")
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 3, 10])
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=METHODS)
+    parser.add_argument('--output', help="Save results as JSON")
+    parser.add_argument('--baseline', help="Compare with results saved by --output")
+    args = parser.parse_args()
+
+    resume_parser = ResumeParser()
+    loop = asyncio.new_event_loop()
+    results = {}
+    try:
+        for pages in args.pages:
+            pdf = resume_pdf(pages, seed=pages)
+            raw = loop.run_until_complete(resume_parser.extract_raw_text_async(pdf))
+            text = resume_parser.clean_text(raw)
+            calls = {
+                'validate_bytes': lambda: resume_parser.validate_bytes(pdf),
+                'fitz': lambda: resume_parser.extract_text_from_bytes(pdf),
+                'pdfminer': lambda: resume_parser._extract_with_pdfminer(io.BytesIO(pdf)),
+                'pool': lambda: loop.run_until_complete(resume_parser.extract_raw_text_async(pdf)),
+                'clean_text': lambda: resume_parser.clean_text(raw),
+                'scan': lambda: resume_parser.scan(raw),
+                'extract_sections': lambda: resume_parser.extract_sections(text),
+                'extract_contact_info': lambda: resume_parser.extract_contact_info(raw)
+            }
+            for method in args.methods:
+                # pdfminer is two orders of magnitude slower; keep its runs short
+                repeat = max(3, args.repeat // 5) if method == 'pdfminer' else args.repeat
+                calls[method]()  # warm-up (pool start-up, regex compilation)
+                results[f"{method} ({pages}p)"] = latency.summarize(time_calls(calls[method], repeat))
+    finally:
+        loop.close()
+        resume_parser.engine.shutdown()
+
+    print(f"ResumeParser on synthetic resumes, {args.repeat} runs per method")
+    latency.print_table(results, label='method', rate_label='ops/s')
+    if args.output:
+        latency.save(results, args.output, benchmark='resume_parser', repeat=args.repeat)
+    if args.baseline:
+        latency.print_comparison(results, latency.load(args.baseline))
+
+
+if __name__ == '__main__':
+    main()
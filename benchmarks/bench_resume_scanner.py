@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the single-pass resume scanner.
+
+Builds synthetic multi-page resumes and times the previous multi-pass
+``clean_text``, ``extract_sections`` and ``extract_contact_info``
+against the precompiled single-pass versions, checking that both agree:
+
+    python benchmarks/bench_resume_scanner.py --pages 1 5 20 --repeat 20
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from resume_parser import ResumeParser
+
+WORDS = (
+    "led built designed shipped python sql docker kubernetes team data pipeline "
+    "customers revenue analysis models reporting dashboards migration cloud aws "
+    "stakeholders delivered improved reduced latency by percent quarterly"
+).split()
+
+HEADERS = [
+    "PROFESSIONAL EXPERIENCE", "Education", "Technical Skills", "Projects",
+    "Certifications", "Work Experience", "Notable Projects", "Licenses"
+]
+
+
+def synthetic_resume(pages, seed=0):
+    """Return raw extracted-looking text of roughly pages * 3000 characters"""
+    rng = random.Random(seed)
+    lines = [
+        "Jane Doe",
+        "jane.doe@example.com | +1 (555) 123-4567 | linkedin.com/in/jane-doe",
+        ""
+    ]
+    for page in range(pages):
+        for header in rng.sample(HEADERS, 4):
+            lines.append(header)
+            for _ in range(6):
+                lines.append("• " + " ".join(rng.choice(WORDS) for _ in range(18)) + ";")
+            lines.append("")
+        lines.append(f"\f Page {page + 1}")
+    return "\n".join(lines)
+
+
+class LegacyParser:
+    """The multi-pass implementations the scanner replaced"""
+
+    def clean_text(self, text):
+        if not text:
+            return ""
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'[^\w\s@.,()-]', ' ', text)
+        text = text.replace('\n', ' ').replace('\r', ' ')
+        text = re.sub(r' +', ' ', text)
+        return text.strip()
+
+    def extract_contact_info(self, text):
+        contact_info = {}
+        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+        if emails:
+            contact_info['email'] = emails[0]
+        phones = re.findall(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
+        if phones:
+            contact_info['phone'] = ''.join(phones[0]) if isinstance(phones[0], tuple) else phones[0]
+        linkedin = re.findall(r'linkedin\.com/in/[\w-]+', text, re.IGNORECASE)
+        if linkedin:
+            contact_info['linkedin'] = linkedin[0]
+        return contact_info
+
+    def extract_sections(self, text):
+        sections = {}
+        section_patterns = {
+            'experience': r'(work experience|professional experience|employment|experience)',
+            'education': r'(education|academic background|qualifications)',
+            'skills': r'(skills|technical skills|competencies|expertise)',
+            'projects': r'(projects|personal projects|notable projects)',
+            'certifications': r'(certifications|certificates|licenses)'
+        }
+        for section_name, pattern in section_patterns.items():
+            matches = list(re.finditer(pattern, text, re.IGNORECASE))
+            if matches:
+                start_pos = matches[0].end()
+                remaining_patterns = [p for name, p in section_patterns.items() if name != section_name]
+                end_pos = len(text)
+                for other_pattern in remaining_patterns:
+                    other_matches = list(re.finditer(other_pattern, text[start_pos:], re.IGNORECASE))
+                    if other_matches:
+                        potential_end = start_pos + other_matches[0].start()
+                        if potential_end < end_pos:
+                            end_pos = potential_end
+                sections[section_name] = text[start_pos:end_pos].strip()
+        return sections
+
+
+def run(parser, raw):
+    text = parser.clean_text(raw)
+    return text, parser.extract_sections(text), parser.extract_contact_info(text)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass resume scanner")
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    legacy, scanner = LegacyParser(), ResumeParser(engine=object())
+
+    print(f"{'pages':>6}{'chars':>10}{'legacy':>12}{'scanner':>12}{'speedup':>10}  sections")
+    for pages in args.pages:
+        raw = synthetic_resume(pages, seed=pages)
+        old_text, old_sections, old_contacts = run(legacy, raw)
+        new_text, new_sections, new_contacts = run(scanner, raw)
+        # The legacy phone extraction returned only the country-code group
+        agrees = old_text == new_text and old_sections == new_sections \
+            and old_contacts.get('email') == new_contacts.get('email') \
+            and old_contacts.get('linkedin') == new_contacts.get('linkedin')
+
+        old = best_of(lambda: run(legacy, raw), args.repeat)
+        new = best_of(lambda: run(scanner, raw), args.repeat)
+        print(f"{pages:>6}{len(raw):>10}{old * 1000:>10.2f}ms{new * 1000:>10.2f}ms"
+              f"{old / new:>9.1f}x  {'match' if agrees else 'DIFFER'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Burst benchmark for single-flight request coalescing.
+
+Fires a burst of identical ``query_llm`` and ``generate_speech`` calls,
+as when a class submits the same role analysis at once, and counts the
+upstream calls with coalescing enabled and disabled:
+
+    python benchmarks/bench_singleflight.py --burst 100 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from fake_llm_server import FakeLLMServer
+
+
+class CountingCommunicate:
+    """edge_tts.Communicate stand-in that counts syntheses"""
+
+    calls = 0
+    latency = 0.5
+
+    def __init__(self, text, voice=None, rate=None, volume=None):
+        self.text = text
+
+    async def save(self, path):
+        CountingCommunicate.calls += 1
+        await asyncio.sleep(CountingCommunicate.latency)
+        with open(path, 'wb') as f:
+            f.write(self.text.encode())
+
+
+async def burst(call, size):
+    start = time.perf_counter()
+    results = await asyncio.gather(*[call() for _ in range(size)], return_exceptions=True)
+    errors = sum(isinstance(result, Exception) for result in results)
+    return time.perf_counter() - start, errors
+
+
+def run_llm(args, server, enabled):
+    from llm_query import LLMQuery
+    from llm_cache import LLMResponseCache
+
+    cache_dir = tempfile.mkdtemp()
+    llm_query = LLMQuery(response_cache=LLMResponseCache(path=os.path.join(cache_dir, 'llm.db')))
+    llm_query.inflight.enabled = enabled
+    server.state.reset()
+
+    elapsed, errors = asyncio.run(burst(
+        lambda: llm_query.query_llm("Gap analysis for a data scientist with Python and SQL"),
+        args.burst
+    ))
+    return elapsed, errors, server.state.stats()['requests']
+
+
+def run_tts(args, enabled):
+    import edge_tts
+    edge_tts.Communicate = CountingCommunicate
+    CountingCommunicate.latency = args.latency
+    CountingCommunicate.calls = 0
+
+    from tts import TTSGenerator
+    os.chdir(tempfile.mkdtemp())
+    tts_generator = TTSGenerator()
+    tts_generator.inflight.enabled = enabled
+
+    elapsed, errors = asyncio.run(burst(
+        lambda: tts_generator.generate_speech("Welcome to Skillmotion AI Assistant."),
+        args.burst
+    ))
+    return elapsed, errors, CountingCommunicate.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-flight coalescing under burst load")
+    parser.add_argument('--burst', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.5)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(latency=args.latency).start()
+    os.environ['GROQ_API_KEY'] = 'fake'
+    os.environ['GROQ_BASE_URL'] = server.base_url
+    os.environ.pop('OPENAI_API_KEY', None)
+    os.environ['LLM_POOL_SIZE'] = str(args.burst)
+
+    print(f"burst of {args.burst} identical calls, upstream latency {args.latency:.2f}s")
+    print(f"{'upstream':<10}{'coalescing':<12}{'calls':>8}{'errors':>8}{'wall':>10}")
+    for enabled in (False, True):
+        elapsed, errors, calls = run_llm(args, server, enabled)
+        print(f"{'llm':<10}{'on' if enabled else 'off':<12}{calls:>8}{errors:>8}{elapsed:>9.3f}s")
+    for enabled in (False, True):
+        elapsed, errors, calls = run_tts(args, enabled)
+        print(f"{'tts':<10}{'on' if enabled else 'off':<12}{calls:>8}{errors:>8}{elapsed:>9.3f}s")
+
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Latency summaries shared by the benchmark suite.
+
+``summarize`` turns raw timings into p50/p95/p99 and throughput;
+``print_table`` prints them, and ``save``/``load``/``print_comparison``
+keep a JSON baseline so a later run shows regressions as percentages:
+
+    python benchmarks/load_test.py --output before.json
+    python benchmarks/load_test.py --baseline before.json
+"""
+
+import json
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of values (fraction in 0..1)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(latencies, elapsed=None, errors=0):
+    """p50/p95/p99/mean in milliseconds and operations per second.
+
+    With elapsed (wall time of a concurrent run) the rate is completed
+    requests per second; without it, the single-threaded rate 1 / mean.
+    """
+    summary = {'count': len(latencies), 'errors': errors}
+    if not latencies:
+        return dict(summary, p50_ms=None, p95_ms=None, p99_ms=None, mean_ms=None, rps=0.0)
+    mean = sum(latencies) / len(latencies)
+    rate = len(latencies) / elapsed if elapsed else (1 / mean if mean else 0.0)
+    return dict(
+        summary,
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+        mean_ms=round(mean * 1000, 2),
+        rps=round(rate, 2)
+    )
+
+
+def _ms(value):
+    return f"{'-':>10}" if value is None else f"{value:>8.2f}ms"
+
+
+def print_table(results, label='name', rate_label='req/s'):
+    """Print {name: summary} as one row per name"""
+    width = max([len(label)] + [len(name) for name in results]) + 2
+    print(f"{label:<{width}}{'count':>7}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}{rate_label:>10}")
+    for name, summary in results.items():
+        print(f"{name:<{width}}{summary['count']:>7}{summary['errors']:>8}"
+              f"{_ms(summary['p50_ms'])}{_ms(summary['p95_ms'])}{_ms(summary['p99_ms'])}{summary['rps']:>10.1f}")
+
+
+def save(results, path, **meta):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def print_comparison(results, baseline):
+    """Print p95 and throughput changes against a saved baseline"""
+    width = max([len('vs baseline')] + [len(name) for name in results]) + 2
+    print(f"\n{'vs baseline':<{width}}{'p95':>10}{'was':>10}{'change':>9}{'rate':>10}{'was':>10}{'change':>9}")
+
+    def change(now, before):
+        if not now or not before:
+            return f"{'-':>9}"
+        return f"{(now - before) / before * 100:>+8.0f}%"
+
+    for name, summary in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        print(f"{name:<{width}}{_ms(summary['p95_ms'])}{_ms(before['p95_ms'])}"
+              f"{change(summary['p95_ms'], before['p95_ms'])}"
+              f"{summary['rps']:>10.1f}{before['rps']:>10.1f}{change(summary['rps'], before['rps'])}")
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+End-to-end load driver for the /api/* routes.
+
+Without --url it starts an offline stack: the fake LLM provider in this
+process and the backend as a subprocess (under uvicorn with --workers N
+when uvicorn is installed, otherwise the Flask development server), with
+the fake TTS backend and fresh caches in a temporary directory. Each
+selected route then gets --requests requests at --concurrency, and the
+driver reports p50/p95/p99 latency and requests per second per route:
+
+    python benchmarks/load_test.py --requests 100 --concurrency 16
+    python benchmarks/load_test.py --routes chat chat_stream --llm-latency 0.5 --tokens-per-second 50
+    python benchmarks/load_test.py --output before.json   # later: --baseline before.json
+    python benchmarks/load_test.py --url http://localhost:5000 --routes welcome stats
+
+Streaming routes are timed until the final event. The batch route times a
+whole job, from upload to the end of its results stream. analyze_job times a
+persistent analysis job from submission until polling sees it finish.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+
+from fake_llm_server import FakeLLMServer
+from resume_corpus import generate_corpus
+import latency
+
+JOB_ROLES = ["Data Scientist", "Software Developer", "ML Engineer", "Product Manager", "UX Designer"]
+
+FLASK_SERVER = (
+    "import sys; sys.path.insert(0, 'backend'); "
+    "from app import app, start_background_services; start_background_services(); "
+    "app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)"
+)
+
+
+class LocalStack:
+    """Fake LLM provider plus a backend subprocess wired to it"""
+
+    def __init__(self, args):
+        self.args = args
+        self.directory = tempfile.mkdtemp(prefix='skillmotion-load-')
+        self.fake_llm = None
+        self.process = None
+        self.log = None
+        self.url = None
+
+    def start(self):
+        args = self.args
+        self.fake_llm = FakeLLMServer(
+            latency=args.llm_latency, tokens_per_second=args.tokens_per_second, reply_tokens=args.reply_tokens
+        ).start()
+
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+        env = dict(
+            os.environ,
+            GROQ_API_KEY='fake', GROQ_BASE_URL=self.fake_llm.base_url, OPENAI_API_KEY='',
+            LLM_MAX_RETRIES='0', LLM_CACHE='1' if args.llm_cache else '0',
+            LLM_CACHE_PATH=os.path.join(self.directory, 'llm_cache.db'),
+            RESUME_CACHE_PATH=os.path.join(self.directory, 'resume_cache.db'),
+            SESSION_STORE_PATH=os.path.join(self.directory, 'sessions.db'),
+            JOB_STORE_PATH=os.path.join(self.directory, 'jobs.db'), JOB_POLL_INTERVAL='0.1',
+            TTS_BACKEND='fake', FAKE_TTS_LATENCY=str(args.tts_latency), TTS_WARMUP='0',
+            TTS_AUDIO_DIR=os.path.join(self.directory, 'audio')
+        )
+        if args.workers > 1:
+            env['SESSION_SHARED'] = '1'
+
+        if args.server == 'asgi':
+            command = [sys.executable, '-m', 'uvicorn', 'asgi_app:application', '--app-dir', 'backend',
+                       '--host', '127.0.0.1', '--port', str(port), '--workers', str(args.workers),
+                       '--log-level', 'warning']
+        else:
+            command = [sys.executable, '-c', FLASK_SERVER, str(port)]
+        self.log = open(os.path.join(self.directory, 'backend.log'), 'w')
+        self.process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=self.log, stderr=subprocess.STDOUT)
+
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                if httpx.get(f"{self.url}/", timeout=1).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.25)
+        self.stop()
+        raise Exception(f"Backend did not start; see {self.log.name}")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.log:
+            self.log.close()
+        if self.fake_llm:
+            self.fake_llm.stop()
+
+
+class Scenarios:
+    """One coroutine per route; each sends one request and returns whether it succeeded"""
+
+    def __init__(self, client, resumes, args):
+        self.client = client
+        self.resumes = resumes
+        self.args = args
+        self.session_id = None
+        self.audio_url = None
+        self.job_id = None
+        self.spare_sessions = []
+
+    async def prepare(self, routes):
+        """Create the session, audio file and batch job the read-only routes need"""
+        response = await self.client.post('/api/upload-resume', files=self._resume(0))
+        response.raise_for_status()
+        self.session_id = response.json()['session_id']
+        response = await self.client.get('/api/welcome')
+        response.raise_for_status()
+        self.audio_url = response.json()['audio_url']
+        if 'batch_status' in routes:
+            response = await self.client.post('/api/batch-analyze', data={'job_role': JOB_ROLES[0]},
+                                              files=self._batch(0))
+            response.raise_for_status()
+            self.job_id = response.json()['job_id']
+        if 'session_delete' in routes:
+            count = self.args.requests + self.args.warmup
+            responses = await asyncio.gather(*[self.client.post('/api/session') for _ in range(count)])
+            self.spare_sessions = [response.json()['session_id'] for response in responses]
+
+    def _resume(self, index):
+        path = self.resumes[index % len(self.resumes)]
+        return {'resume': (path.name, path.read_bytes(), 'application/pdf')}
+
+    def _batch(self, index):
+        return [
+            ('resumes', (path.name, path.read_bytes(), 'application/pdf'))
+            for path in (self.resumes[(index + offset) % len(self.resumes)] for offset in range(self.args.batch_size))
+        ]
+
+    async def welcome(self, index):
+        return (await self.client.get('/api/welcome')).status_code == 200
+
+    async def audio(self, index):
+        return (await self.client.get(self.audio_url)).status_code == 200
+
+    async def stats(self, index):
+        return (await self.client.get('/api/stats')).status_code == 200
+
+    async def upload(self, index):
+        response = await self.client.post('/api/upload-resume', files=self._resume(index),
+                                          data={'extraction_mode': self.args.extraction_mode})
+        return response.status_code == 200
+
+    async def analyze(self, index):
+        response = await self.client.post('/api/analyze-resume', json={
+            'session_id': self.session_id, 'job_role': JOB_ROLES[index % len(JOB_ROLES)]
+        })
+        return response.status_code == 200
+
+    async def analyze_stream(self, index):
+        return await self._stream('/api/analyze-resume', {
+            'session_id': self.session_id, 'job_role': JOB_ROLES[index % len(JOB_ROLES)], 'stream': True
+        })
+
+    async def chat(self, index):
+        response = await self.client.post('/api/chat', json={'message': f"How should I prepare for interviews? ({index})"})
+        return response.status_code == 200
+
+    async def chat_stream(self, index):
+        return await self._stream('/api/chat', {
+            'message': f"Which skills should I learn next? ({index})", 'stream': True
+        })
+
+    async def skill_profile(self, index):
+        response = await self.client.post('/api/skill-profile', json={
+            'background': "Computer science graduate", 'experience': f"{index % 10 + 1} years in analytics",
+            'goals': "Move into machine learning"
+        })
+        return response.status_code == 200
+
+    async def session_create(self, index):
+        return (await self.client.post('/api/session')).status_code == 201
+
+    async def session_get(self, index):
+        return (await self.client.get(f'/api/session/{self.session_id}')).status_code == 200
+
+    async def session_delete(self, index):
+        session_id = self.spare_sessions.pop()
+        return (await self.client.delete(f'/api/session/{session_id}')).status_code == 200
+
+    async def batch(self, index):
+        response = await self.client.post('/api/batch-analyze', data={'job_role': JOB_ROLES[index % len(JOB_ROLES)]},
+                                          files=self._batch(index))
+        if response.status_code != 202:
+            return False
+        async with self.client.stream('GET', response.json()['results_url']) as results:
+            lines = [line async for line in results.aiter_lines() if line]
+        return results.status_code == 200 and bool(lines)
+
+    async def batch_status(self, index):
+        return (await self.client.get(f'/api/batch-analyze/{self.job_id}')).status_code == 200
+
+    async def analyze_job(self, index):
+        response = await self.client.post('/api/jobs/analyze-resume', json={
+            'session_id': self.session_id, 'job_role': JOB_ROLES[index % len(JOB_ROLES)]
+        })
+        if response.status_code != 202:
+            return False
+        while True:
+            await asyncio.sleep(0.05)
+            job = (await self.client.get(response.headers['Location'])).json()
+            if job['status'] not in ('queued', 'running'):
+                return job['status'] == 'completed'
+
+    async def _stream(self, path, body):
+        async with self.client.stream('POST', path, json=body) as response:
+            text = ''.join([chunk async for chunk in response.aiter_text()])
+        return response.status_code == 200 and 'event: done' in text
+
+
+ROUTES = ['welcome', 'audio', 'stats', 'upload', 'analyze', 'analyze_stream', 'chat', 'chat_stream',
+          'skill_profile', 'session_create', 'session_get', 'session_delete', 'batch', 'batch_status', 'analyze_job']
+
+
+async def run_route(scenario, requests, concurrency, warmup):
+    """Run one route; return its latency summary"""
+    for index in range(warmup):
+        await scenario(-1 - index)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(index):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                ok = await scenario(index)
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(index) for index in range(requests)])
+    return latency.summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def drive(url, resumes, args):
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        scenarios = Scenarios(client, resumes, args)
+        await scenarios.prepare(args.routes)
+        results = {}
+        for route in args.routes:
+            results[route] = await run_route(getattr(scenarios, route), args.requests, args.concurrency, args.warmup)
+            summary = results[route]
+            print(f"  {route}: {summary['count']} ok, {summary['errors']} errors, {summary['rps']} req/s",
+                  file=sys.stderr)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the backend's /api routes offline")
+    parser.add_argument('--url', help="Test a running backend instead of starting one")
+    parser.add_argument('--routes', nargs='+', choices=ROUTES, default=ROUTES)
+    parser.add_argument('--requests', type=int, default=50, help="Requests per route")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=2, help="Unmeasured requests per route")
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--corpus', help="Directory of PDF resumes (default: generate synthetic ones)")
+    parser.add_argument('--corpus-size', type=int, default=10)
+    parser.add_argument('--extraction-mode', default='local', choices=['local', 'hybrid', 'llm'])
+    parser.add_argument('--batch-size', type=int, default=4, help="Resumes per batch job")
+    parser.add_argument('--server', choices=['asgi', 'flask'],
+                        default='asgi' if importlib.util.find_spec('uvicorn') else 'flask')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--llm-latency', type=float, default=0.2, help="Fake LLM seconds before the first token")
+    parser.add_argument('--tokens-per-second', type=float, default=200, help="Fake LLM token rate (0 = instant)")
+    parser.add_argument('--reply-tokens', type=int, default=64)
+    parser.add_argument('--tts-latency', type=float, default=0.1, help="Fake TTS seconds per utterance")
+    parser.add_argument('--llm-cache', action='store_true', help="Keep the LLM response cache on")
+    parser.add_argument('--output', help="Save results as JSON")
+    parser.add_argument('--baseline', help="Compare with results saved by --output")
+    args = parser.parse_args()
+
+    if args.corpus:
+        resumes = sorted(Path(args.corpus).glob('*.pdf'))
+    else:
+        resumes = generate_corpus(tempfile.mkdtemp(prefix='skillmotion-corpus-'), args.corpus_size, pages=(1, 2, 3))
+    if not resumes:
+        parser.error("No PDF resumes found")
+
+    stack = None
+    url = args.url
+    if not url:
+        stack = LocalStack(args).start()
+        url = stack.url
+        print(f"Backend ({args.server}, {args.workers} worker(s)) at {url}; fake LLM "
+              f"{args.llm_latency}s + {args.tokens_per_second or 'instant'} tokens/s; fake TTS {args.tts_latency}s",
+              file=sys.stderr)
+    try:
+        results = asyncio.run(drive(url, resumes, args))
+    finally:
+        if stack:
+            upstream = stack.fake_llm.state.stats()['requests']
+            stack.stop()
+            print(f"Fake LLM served {upstream} requests; backend log in {stack.log.name}", file=sys.stderr)
+
+    print(f"{args.requests} requests per route at concurrency {args.concurrency}")
+    latency.print_table(results, label='route')
+    if args.output:
+        latency.save(results, args.output, benchmark='load_test', requests=args.requests,
+                     concurrency=args.concurrency, server=args.server, workers=args.workers)
+    if args.baseline:
+        latency.print_comparison(results, latency.load(args.baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,18 +2,25 @@
 """
 Skillmotion AI Assistant Runner
 Starts both frontend and backend servers using threading
+
+    python run.py                # Flask development server
+    python run.py --workers 4    # ASGI app under uvicorn with 4 worker processes
 """
 
+import argparse
 import threading
 import time
 import os
 import sys
 import signal
 import subprocess
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-import socketserver
+from functools import partial
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / "backend"))
+
 class FrontendServer:
     def __init__(self, port=8080, directory="frontend"):
         self.port = port
@@ -23,12 +30,12 @@ class FrontendServer:
     def run(self):
         """Run the frontend server"""
         try:
-            # Change to frontend directory
-            os.chdir(self.directory)
+            from static_files import StaticFileHandler
             
-            # Create HTTP server
-            handler = SimpleHTTPRequestHandler
-            with socketserver.TCPServer(("", self.port), handler) as httpd:
+            # One thread per connection; ETag, Range and gzip/brotli support
+            handler = partial(StaticFileHandler, directory=str(ROOT / self.directory))
+            with ThreadingHTTPServer(("", self.port), handler) as httpd:
+                httpd.daemon_threads = True
                 self.server = httpd
                 print(f"🌐 Frontend server running at http://localhost:{self.port}")
                 httpd.serve_forever()
@@ -41,18 +48,18 @@ class FrontendServer:
             self.server.shutdown()
 
 class BackendServer:
-    def __init__(self):
+    def __init__(self, workers=0, port=5000):
+        self.workers = workers
+        self.port = port
         self.process = None
     
     def run(self):
         """Run the backend server"""
+        if self.workers:
+            self.run_asgi()
+            return
         try:
-            # Change to backend directory
-            backend_path = Path("backend")
-            if backend_path.exists():
-                os.chdir(backend_path)
-            
-            # Import and run Flask app
+            # Import and run Flask app (config paths are relative to the repository root)
             from backend.app import run_flask_app
             print("🚀 Backend server starting...")
             run_flask_app()
@@ -70,15 +77,42 @@ class BackendServer:
         except Exception as e:
             print(f"❌ Backend server error: {e}")
     
+    def run_asgi(self):
+        """Run the ASGI app under uvicorn with one event loop per worker process"""
+        env = dict(os.environ)
+        if self.workers > 1:
+            # Workers share sessions through SQLite instead of process memory
+            env.setdefault('SESSION_STORE_PATH', 'cache/sessions.db')
+            env.setdefault('SESSION_SHARED', '1')
+        drain_timeout = env.get('ASGI_DRAIN_TIMEOUT', '30')
+        try:
+            self.process = subprocess.Popen([
+                sys.executable, "-m", "uvicorn", "asgi_app:application",
+                "--app-dir", "backend",
+                "--host", "0.0.0.0", "--port", str(self.port),
+                "--workers", str(self.workers),
+                "--timeout-graceful-shutdown", drain_timeout
+            ], cwd=ROOT, env=env)
+            print(f"🚀 Backend server started with {self.workers} ASGI worker(s)")
+            self.process.wait()
+        except Exception as e:
+            print(f"❌ Backend server error: {e}")
+    
     def stop(self):
         """Stop the backend server"""
         if self.process:
+            # SIGTERM: uvicorn stops accepting and drains in-flight requests
             self.process.terminate()
+            try:
+                self.process.wait(timeout=float(os.getenv('ASGI_DRAIN_TIMEOUT', '30')) + 10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
 
 class SkillmotionRunner:
-    def __init__(self):
+    def __init__(self, workers=0):
+        self.workers = workers
         self.frontend_server = FrontendServer()
-        self.backend_server = BackendServer()
+        self.backend_server = BackendServer(workers)
         self.threads = []
         self.running = True
         
@@ -99,6 +133,8 @@ class SkillmotionRunner:
             'PyMuPDF', 'pdfminer.six', 'requests', 
             'edge-tts', 'groq', 'openai'
         ]
+        if self.workers:
+            required_packages.append('uvicorn')
         
         missing_packages = []
         
@@ -251,7 +287,12 @@ class SkillmotionRunner:
 
 def main():
     """Main entry point"""
-    runner = SkillmotionRunner()
+    parser = argparse.ArgumentParser(description="Run the Skillmotion AI Assistant")
+    parser.add_argument('--workers', type=int, default=int(os.getenv('BACKEND_WORKERS', '0')),
+                        help="serve the backend as ASGI with this many worker processes (0: Flask dev server)")
+    args = parser.parse_args()
+    os.chdir(ROOT)
+    runner = SkillmotionRunner(args.workers)
     runner.run()
 
 if __name__ == "__main__":
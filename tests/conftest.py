@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+# Offline: fake TTS, no LLM cache, everything written to a scratch directory
+SCRATCH = tempfile.mkdtemp()
+os.environ.update(
+    GROQ_API_KEY='test', LLM_CACHE='0', TTS_BACKEND='fake', FAKE_TTS_LATENCY='0', TTS_WARMUP='0',
+    TTS_AUDIO_DIR=os.path.join(SCRATCH, 'audio'), JOB_STORE_PATH=os.path.join(SCRATCH, 'jobs.db'),
+    RESUME_CACHE_PATH=os.path.join(SCRATCH, 'resumes.db')
+)
+os.chdir(ROOT)
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+import app as backend
+from admission import AdmissionController, UpstreamBusy
+
+
+def test_full_queue_is_rejected_at_once():
+    controller = AdmissionController('test', 'TEST', concurrency=1, queue_size=1, queue_timeout=5)
+
+    async def scenario():
+        await controller.acquire()
+        waiting = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0.01)
+        with pytest.raises(UpstreamBusy) as rejected:
+            await controller.acquire()
+        controller.release()
+        await waiting
+        controller.release()
+        return rejected.value
+
+    busy = asyncio.run(scenario())
+    assert (busy.reason, busy.status) == ('queue full', 503)
+    assert busy.retry_after >= 1
+    assert controller.stats()['rejected']['queue_full'] == 1
+    assert controller.stats()['active'] == 0
+
+
+def test_queued_request_times_out():
+    controller = AdmissionController('test', 'TEST', concurrency=1, queue_size=5, queue_timeout=0.1)
+
+    async def scenario():
+        await controller.acquire()
+        try:
+            with pytest.raises(UpstreamBusy) as rejected:
+                await controller.acquire()
+        finally:
+            controller.release()
+        return rejected.value
+
+    busy = asyncio.run(scenario())
+    assert (busy.reason, busy.status) == ('queue timeout', 503)
+    stats = controller.stats()
+    assert (stats['rejected']['timeout'], stats['queue_depth'], stats['active']) == (1, 0, 0)
+
+
+def test_rate_limit_past_the_deadline_is_a_429():
+    controller = AdmissionController('test', 'TEST', concurrency=4, rate=0.5, burst=1, queue_timeout=0.1)
+
+    async def scenario():
+        async with controller.slot():
+            pass
+        with pytest.raises(UpstreamBusy) as rejected:
+            await controller.acquire()
+        return rejected.value
+
+    busy = asyncio.run(scenario())
+    assert (busy.reason, busy.status, busy.retry_after) == ('rate limited', 429, 2)
+    assert controller.stats()['active'] == 0
+
+
+def wrapped(error):
+    try:
+        try:
+            raise error
+        except UpstreamBusy as e:
+            raise Exception("Failed to generate speech") from e
+    except Exception as e:
+        return e
+
+
+def test_busy_upstream_answers_with_retry_after():
+    # Also when the rejection is wrapped by the caller, as TTS and the pipeline do
+    busy = UpstreamBusy('edge-tts', 'queue full', 2.2)
+    with backend.app.app_context():
+        body, status, headers = backend.error_response(wrapped(busy))
+    assert status == 503
+    assert headers == {"Retry-After": "3"}
+    assert body.json == {"error": str(busy), "retry_after": 3}
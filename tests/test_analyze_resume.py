@@ -0,0 +1,30 @@
+import app as backend
+from skill_matcher import split_candidate_skills
+
+
+async def fake_query_llm(prompt, max_tokens=1000, temperature=0.7, endpoint='default'):
+    return f"Response for {endpoint}"
+
+
+backend.llm_query.query_llm = fake_query_llm
+client = backend.app.test_client()
+
+
+def test_split_candidate_skills_accepts_a_list():
+    assert split_candidate_skills(["Python", "SQL, Docker"]) == split_candidate_skills("Python\nSQL, Docker")
+
+
+def test_analyze_resume_accepts_a_skills_list():
+    response = client.post('/api/analyze-resume', json={"job_role": "dev", "extracted_skills": ["Python", "SQL"]})
+    assert response.status_code == 200
+    assert response.json['gap_analysis'] == "Response for gap_analysis"
+    assert response.json['skill_match'] == backend.skill_matcher.match("dev", "Python\nSQL")
+
+
+def test_analyze_resume_rejects_other_skill_types():
+    response = client.post('/api/analyze-resume', json={"job_role": "dev", "extracted_skills": {"Python": 5}})
+    assert response.status_code == 400
+
+
+def test_prompt_budget_fits_a_list():
+    assert backend.prompt_budget.fit(["Python", "SQL"]) == "Python\nSQL"
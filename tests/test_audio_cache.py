@@ -0,0 +1,42 @@
+import os
+import time
+
+from audio_cache import AudioCache
+
+
+def add(cache, text, size=1000):
+    key = cache.make_key(text, 'voice', '+0%', '+0%')
+    partial = cache.partial_path_for(key)
+    with open(partial, 'wb') as f:
+        f.write(b'\0' * size)
+    path = cache.add(key, partial)
+    time.sleep(0.01)  # Distinct mtimes keep the LRU order stable
+    return cache.filename_for(key), path
+
+
+def test_pinned_file_survives_eviction(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=2500)
+    pinned, pinned_path = add(cache, "first")
+    assert cache.pin(pinned)
+
+    for index in range(4):
+        add(cache, f"later {index}")
+    assert os.path.exists(pinned_path)
+    assert cache.stats()['evictions'] == 3
+
+    # Once released it is the least recently used and goes first
+    cache.unpin(pinned)
+    add(cache, "last")
+    assert not os.path.exists(pinned_path)
+    assert cache.stats()['bytes'] <= 2500
+
+
+def test_workers_share_files_and_the_byte_cap(tmp_path):
+    first, second = AudioCache(str(tmp_path), max_bytes=3000), AudioCache(str(tmp_path), max_bytes=3000)
+    names = [add(first if index % 2 else second, f"text {index}")[0] for index in range(5)]
+
+    # A file synthesized by one worker can be served by the other
+    assert second.pin(names[3])
+    second.unpin(names[3])
+    on_disk = [name for name in os.listdir(tmp_path) if name.endswith('.mp3')]
+    assert sorted(on_disk) == sorted(names[2:])
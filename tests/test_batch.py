@@ -0,0 +1,41 @@
+import re
+import json
+import asyncio
+
+import fitz
+
+import app as backend
+from batch import BatchAnalyzer
+
+
+class OverreachingLLM:
+    """Screens every resume, echoing fields the analyzer owns"""
+
+    async def query_llm(self, prompt, max_tokens=1000, temperature=0.7, endpoint='default'):
+        return json.dumps([
+            {"id": resume_id, "fit_score": 70, "type": "progress", "file": "other.pdf", "status": "error"}
+            for resume_id in re.findall(r'### Resume (R\d+)', prompt)
+        ])
+
+
+def make_pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    try:
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+
+async def collect(analyzer, documents):
+    return [record async for record in analyzer.run(documents, "Data Scientist", ["Python"])]
+
+
+def test_llm_output_cannot_override_record_fields():
+    analyzer = BatchAnalyzer(backend.resume_parser, OverreachingLLM(), backend.config, backend.prompt_budget)
+    documents = [(f"r{index}.pdf", make_pdf(f"Skills: Python, SQL {index}")) for index in range(3)]
+    records = asyncio.run(collect(analyzer, documents))
+
+    results = [record for record in records if record['type'] == 'result']
+    assert sorted(record['file'] for record in results) == ["r0.pdf", "r1.pdf", "r2.pdf"]
+    assert all(record['status'] == 'ok' and record['fit_score'] == 70 for record in results)
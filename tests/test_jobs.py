@@ -0,0 +1,61 @@
+import os
+import time
+
+from jobs import JobStore
+
+
+def make_store(tmp_path, **options):
+    return JobStore(os.path.join(tmp_path, 'jobs.db'), **options)
+
+
+def test_expired_lease_lets_another_worker_claim_the_job(tmp_path):
+    store = make_store(tmp_path)
+    job = store.submit('analyze-resume', {'job_role': 'dev'})
+    assert store.claim('worker-a', lease=0.1)['job_id'] == job['job_id']
+    assert store.record_stage(job['job_id'], 'worker-a', 'skill_match', {'skill_match': 1}, lease=0.1)
+
+    # Leased: nobody else gets it
+    assert store.claim('worker-b', lease=60) is None
+    time.sleep(0.15)
+
+    claimed = store.claim('worker-b', lease=60)
+    assert (claimed['job_id'], claimed['attempts'], claimed['stages']) == (job['job_id'], 2, ['skill_match'])
+    assert claimed['payload'] == {'job_role': 'dev'}
+
+    # The first worker lost the job and can no longer write to it
+    assert not store.record_stage(job['job_id'], 'worker-a', 'gap_analysis', {'gap_analysis': 'x'}, lease=60)
+    assert store.finish(job['job_id'], 'worker-a', 'completed') is None
+    assert store.finish(job['job_id'], 'worker-b', 'completed')['status'] == 'completed'
+
+
+def test_job_is_abandoned_after_max_attempts(tmp_path):
+    store = make_store(tmp_path, max_attempts=2)
+    job = store.submit('skill-profile', {})
+    for worker in ('a', 'b'):
+        assert store.claim(worker, lease=0.05)
+        time.sleep(0.1)
+
+    assert store.claim('c', lease=60) is None
+    failed = store.get(job['job_id'])
+    assert (failed['status'], failed['error']) == ('failed', "Abandoned after 2 attempts")
+
+
+def test_requeue(tmp_path):
+    store = make_store(tmp_path)
+    job = store.submit('skill-profile', {})
+    store.claim('a', lease=60)
+
+    # A shutdown hands the job back without spending an attempt
+    assert store.requeue(job['job_id'], 'a', count_attempt=False)
+    assert (store.get(job['job_id'])['status'], store.get(job['job_id'])['attempts']) == ('queued', 0)
+
+    # A retry after a delay is not claimable until the delay has passed
+    store.claim('b', lease=60)
+    assert store.requeue(job['job_id'], 'b', delay=0.2, error="upstream busy")
+    assert store.claim('c', lease=60) is None
+    time.sleep(0.25)
+    claimed = store.claim('c', lease=60)
+    assert (claimed['attempts'], claimed['error']) == (2, "upstream busy")
+
+    # Only the owner can requeue
+    assert not store.requeue(job['job_id'], 'a')
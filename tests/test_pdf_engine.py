@@ -0,0 +1,37 @@
+import os
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz
+import pytest
+
+from pdf_engine import PDFExtractionEngine
+
+
+def crash_worker(data):
+    os._exit(1)
+
+
+def make_pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    try:
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+
+async def run_in_pool(engine, calls):
+    return await engine._run(calls, asyncio.get_running_loop().time() + 30)
+
+
+def test_pool_is_replaced_after_a_worker_crash():
+    engine = PDFExtractionEngine(max_workers=1, timeout=30)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            asyncio.run(run_in_pool(engine, [(crash_worker, b'')]))
+        # Later uploads get a fresh pool instead of the broken one
+        for _ in range(2):
+            assert "Python developer" in asyncio.run(engine.extract(make_pdf("Python developer")))
+    finally:
+        engine.shutdown()
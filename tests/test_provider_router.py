@@ -0,0 +1,93 @@
+import time
+import asyncio
+
+import pytest
+
+from admission import UpstreamBusy
+from provider_router import ProviderRouter, CLOSED, OPEN
+
+
+class FakePool:
+    """Providers whose behaviour each test sets: a coroutine function per name"""
+
+    def __init__(self, **behaviours):
+        self.behaviours = behaviours
+        self.calls = {name: 0 for name in behaviours}
+
+    def get(self, name):
+        return name in self.behaviours
+
+    async def complete(self, name, messages, max_tokens, temperature):
+        self.calls[name] += 1
+        return await self.behaviours[name]()
+
+
+async def fail():
+    raise Exception("upstream error")
+
+
+async def answer():
+    return "ok"
+
+
+def complete(router):
+    return asyncio.run(router.complete([], 10, 0.0))
+
+
+def test_breaker_opens_and_recovers_through_a_half_open_probe():
+    pool = FakePool(primary=fail)
+    router = ProviderRouter(pool, ['primary'], hedge=False, failure_threshold=2, reset_timeout=0.2)
+
+    for _ in range(2):
+        with pytest.raises(Exception, match="All LLM providers failed"):
+            complete(router)
+    assert router.health['primary'].state == OPEN
+
+    # While open, requests are turned away without calling the provider
+    with pytest.raises(UpstreamBusy) as rejected:
+        complete(router)
+    assert (rejected.value.reason, rejected.value.retry_after) == ('circuit open', 1)
+    assert pool.calls['primary'] == 2
+
+    # After the reset timeout one probe is let through; its success closes the circuit
+    time.sleep(0.25)
+    pool.behaviours['primary'] = answer
+    assert complete(router) == ('primary', "ok")
+    assert router.health['primary'].state == CLOSED
+
+
+def test_failed_probe_reopens_the_circuit():
+    pool = FakePool(primary=fail, backup=answer)
+    router = ProviderRouter(pool, ['primary', 'backup'], hedge=False, failure_threshold=1, reset_timeout=0.2)
+    complete(router)
+    time.sleep(0.25)
+
+    # The due probe goes ahead of the healthy backup, fails, and falls through to it
+    assert complete(router) == ('backup', "ok")
+    assert pool.calls == {'primary': 2, 'backup': 2}
+    assert router.health['primary'].state == OPEN
+    assert router.health['primary'].times_opened == 2
+
+
+def test_hedge_cancels_the_slower_request():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "slow"
+
+    pool = FakePool(primary=slow, backup=answer)
+    router = ProviderRouter(pool, ['primary', 'backup'], hedge=True, hedge_delay=0.05)
+
+    started = time.monotonic()
+    assert complete(router) == ('backup', "ok")
+    assert time.monotonic() - started < 1
+    assert cancelled == [True]
+    stats = router.stats()
+    assert (stats['hedged'], stats['hedge_wins']) == (1, 1)
+    # A hedging loser counts as cancelled, not as a failure
+    assert (stats['providers']['primary']['cancelled'], stats['providers']['primary']['failures']) == (1, 0)
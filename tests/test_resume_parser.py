@@ -0,0 +1,55 @@
+import os
+import re
+import sys
+import random
+
+import pytest
+
+from resume_parser import ResumeParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from resume_corpus import load_skills, resume_text
+
+
+def previous_extract_sections(text):
+    """extract_sections as it was before the single-pass scan, kept as the reference"""
+    sections = {}
+    section_patterns = {
+        'experience': r'(work experience|professional experience|employment|experience)',
+        'education': r'(education|academic background|qualifications)',
+        'skills': r'(skills|technical skills|competencies|expertise)',
+        'projects': r'(projects|personal projects|notable projects)',
+        'certifications': r'(certifications|certificates|licenses)'
+    }
+    for section_name, pattern in section_patterns.items():
+        matches = list(re.finditer(pattern, text, re.IGNORECASE))
+        if matches:
+            start_pos = matches[0].end()
+            remaining_patterns = [p for name, p in section_patterns.items() if name != section_name]
+            end_pos = len(text)
+            for other_pattern in remaining_patterns:
+                other_matches = list(re.finditer(other_pattern, text[start_pos:], re.IGNORECASE))
+                if other_matches:
+                    potential_end = start_pos + other_matches[0].start()
+                    if potential_end < end_pos:
+                        end_pos = potential_end
+            sections[section_name] = text[start_pos:end_pos].strip()
+    return sections
+
+
+SKILLS = load_skills()
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('pages', [1, 3])
+def test_scan_matches_previous_extract_sections(seed, pages):
+    text = resume_text(random.Random(seed), pages, SKILLS)
+    assert ResumeParser().extract_sections(text) == previous_extract_sections(text)
+
+
+def test_scan_matches_previous_extract_sections_on_a_handwritten_resume():
+    text = (
+        "Jane Doe\njane@example.com\n\nEDUCATION\nB.Sc. Physics\n\nWork Experience\nAnalyst at Initech\n"
+        "Managed licenses and vendor contracts\n\nTechnical Skills\nPython, SQL\n\nPersonal Projects\nA chess engine\n"
+    )
+    assert ResumeParser().extract_sections(text) == previous_extract_sections(text)
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+
+from background_loop import BackgroundLoop
+from singleflight import SingleFlight
+
+
+def test_cancelling_one_waiter_keeps_the_call_for_the_others():
+    flight = SingleFlight('test', BackgroundLoop('test-singleflight'))
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.2)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.do('key', work))
+        second = asyncio.ensure_future(flight.do('key', work))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
+    assert runs == [1]
+    assert flight.stats()['executions'] == 1 and flight.stats()['coalesced'] == 1
+
+
+def test_work_is_cancelled_once_every_waiter_is_gone():
+    flight = SingleFlight('test', BackgroundLoop('test-singleflight'))
+    cancelled = threading.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def scenario():
+        waiters = [asyncio.ensure_future(flight.do('key', work)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert cancelled.wait(2)
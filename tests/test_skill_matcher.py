@@ -0,0 +1,22 @@
+from skill_matcher import SkillMatcher
+
+CONFIG = {
+    'job_skills_database': {
+        'data_scientist': ["Python", "Programming Languages (R, Julia)", "SQL"],
+        'intern': []
+    },
+    'job_role_aliases': {'intern': ["Trainee"]}
+}
+
+
+def test_role_without_required_skills():
+    matcher = SkillMatcher(CONFIG)
+    match = matcher.match("intern", "Python\nSQL")
+    assert match['resolved_role'] == 'intern'
+    assert (match['matched'], match['missing'], match['coverage'], match['score']) == ([], [], 0.0, 0.0)
+
+
+def test_other_roles_still_match_next_to_an_empty_one():
+    match = SkillMatcher(CONFIG).match("Data Scientist", "Python, Julia")
+    assert {gap['skill'] for gap in match['matched']} == {"Python", "Programming Languages (R, Julia)"}
+    assert [gap['skill'] for gap in match['missing']] == ["SQL"]
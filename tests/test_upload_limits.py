@@ -0,0 +1,46 @@
+import io
+
+import werkzeug.formparser
+
+import app as backend
+
+client = backend.app.test_client()
+OVER_SINGLE_LIMIT = backend.MAX_UPLOAD_BYTES + 1024 * 1024
+
+
+def test_resume_upload_keeps_the_single_file_limit():
+    response = client.post(
+        '/api/upload-resume', data={'resume': (io.BytesIO(b'%PDF' + b'0' * OVER_SINGLE_LIMIT), 'big.pdf')},
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 413
+
+
+def test_json_routes_keep_the_single_file_limit():
+    response = client.post(
+        '/api/chat', data=b'{"message": "' + b'x' * OVER_SINGLE_LIMIT + b'"}', content_type='application/json'
+    )
+    assert response.status_code == 413
+
+
+def test_batch_upload_takes_more_than_the_single_file_limit():
+    part = b'%PDF' + b'0' * (backend.MAX_UPLOAD_BYTES // 2)
+    resumes = [(io.BytesIO(part), f'r{index}.pdf') for index in range(3)]
+    response = client.post(
+        '/api/batch-analyze', data={'job_role': 'Data Scientist', 'resumes': resumes},
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 202
+    assert response.json['total'] == 3
+
+
+def test_resume_upload_is_not_spooled_to_disk(monkeypatch):
+    def no_temporary_files(*args, **kwargs):
+        raise AssertionError("upload spooled to a temporary file")
+    monkeypatch.setattr(werkzeug.formparser, 'SpooledTemporaryFile', no_temporary_files)
+    response = client.post(
+        '/api/upload-resume', data={'resume': (io.BytesIO(b'not a pdf' * 100000), 'resume.pdf')},
+        content_type='multipart/form-data'
+    )
+    # Rejected by content, not by an error while buffering the 900 KB upload
+    assert response.status_code == 400